@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Batch Course Search
+Runs the course search Lambda logic locally for a file of queries (for example one per learner profile),
+loading the catalog once and writing one JSON Lines result per query as soon as it is answered
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, 'course_search'))
+sys.path.insert(0, os.path.join(os.path.dirname(SCRIPT_DIR), 'common'))
+
+
+def read_queries(path):
+    """JSON Lines ({"id", "query"} per line), a JSON array, or plain text with one query per line"""
+    from batch import parse_queries
+
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if content.lstrip().startswith('['):
+        return parse_queries(json.loads(content))
+    items = []
+    for line in content.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        items.append(json.loads(line) if line.startswith('{') else line)
+    return parse_queries(items)
+
+
+def configure_environment(args):
+    """Lambda settings read by index.py at import time"""
+    os.environ['DYNAMODB_TABLE_NAME'] = args.table
+    os.environ['AWS_REGION'] = args.region
+    os.environ['CANDIDATE_LIMIT'] = str(args.candidate_limit)
+    os.environ['FAST_PATH'] = 'false' if args.no_fast_path else 'true'
+    os.environ['RESULT_CACHE_SIZE'] = str(args.cache_size)
+    os.environ.setdefault('LOG_LEVEL', args.log_level)
+    os.environ.pop('CATALOG_STATE_TABLE', None)
+    os.environ.pop('RESULT_CACHE_TABLE', None)
+
+
+def build_clients(args):
+    """DynamoDB resource and bedrock-runtime client, or the offline stand-ins with the fixture catalog"""
+    if args.fake:
+        sys.path.insert(0, os.path.join(SCRIPT_DIR, 'benchmarks'))
+        from bench_handler import load_fixture
+        from fake_bedrock import FakeBedrockRuntime
+        from local_dynamodb import LocalDynamoDB
+
+        dynamodb = LocalDynamoDB(request_latency=0.0, latency_per_mb=0.0)
+        with dynamodb.Table(args.table).batch_writer() as batch:
+            for item in load_fixture():
+                batch.put_item(Item=item)
+        return dynamodb, FakeBedrockRuntime(base_latency=args.fake_latency)
+
+    import boto3
+    from botocore.config import Config
+    session = boto3.Session(profile_name=args.profile) if args.profile else boto3.Session()
+    config = Config(max_pool_connections=max(10, args.concurrency), retries={'max_attempts': 4, 'mode': 'adaptive'})
+    return session.resource('dynamodb', region_name=args.region), session.client('bedrock-runtime', region_name=args.region, config=config)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search courses for a file of queries with one catalog load')
+    parser.add_argument('--input', required=True,
+                       help='Queries: JSON Lines with {"id", "query"}, a JSON array, or one query per line')
+    parser.add_argument('--output',
+                       help='JSON Lines results file (default: stdout)')
+    parser.add_argument('--table', default='Class',
+                       help='DynamoDB table holding the course catalog')
+    parser.add_argument('--region', default='us-west-2',
+                       help='AWS region')
+    parser.add_argument('--profile',
+                       help='AWS profile name')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Concurrent model re-ranking calls')
+    parser.add_argument('--rate', type=float, default=5.0,
+                       help='Model re-ranking calls per second (0 for no limit)')
+    parser.add_argument('--candidate-limit', type=int, default=10,
+                       help='Pre-ranked courses sent to the model per query')
+    parser.add_argument('--cache-size', type=int, default=256,
+                       help='Result cache entries; near-identical queries reuse a result within the run')
+    parser.add_argument('--no-fast-path', action='store_true',
+                       help='Send every query to the model instead of answering plain service/difficulty queries from the index')
+    parser.add_argument('--fake', action='store_true',
+                       help='Use script/init/Class.json and a fake model instead of AWS')
+    parser.add_argument('--fake-latency', type=float, default=0.3,
+                       help='Fake model latency in seconds')
+    parser.add_argument('--log-level', default='WARNING', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level of the search code (logs go to stderr)')
+
+    args = parser.parse_args()
+
+    configure_environment(args)
+    queries = read_queries(args.input)
+    if not queries:
+        print("❌ No queries found in the input file", file=sys.stderr)
+        sys.exit(1)
+
+    dynamodb, bedrock = build_clients(args)
+    import index
+    index.dynamodb = dynamodb
+    index.bedrock = bedrock
+    index.catalog_cache.invalidate()
+    from batch import result_lines
+
+    started_at = time.perf_counter()
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    # The search code logs to stdout; keep it on stderr so stdout carries only results
+    sys.stdout = sys.stderr
+    written = 0
+    try:
+        search, results = index.run_batch(bedrock, queries, concurrency=args.concurrency, rate=args.rate)
+        for entries, result in results:
+            for line in result_lines(entries, result):
+                output.write(line + '\n')
+                written += 1
+            output.flush()
+    finally:
+        if args.output:
+            output.close()
+
+    elapsed = time.perf_counter() - started_at
+    stats = search.stats
+    print(f"\n📊 {written} results in {elapsed:.1f}s: {stats['unique']} unique of {stats['queries']} queries, "
+          f"{stats['fast_path']} fast path, {stats['cached']} cached, {stats['model_calls']} model calls, "
+          f"{stats['errors']} errors, {stats['rate_wait_seconds']:.1f}s waiting on the rate limit", file=sys.stderr)
+    if args.output:
+        print(f"✅ Results saved to {args.output}", file=sys.stderr)
+    if stats['errors']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
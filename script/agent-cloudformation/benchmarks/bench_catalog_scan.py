@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Catalog Scan Benchmark
+Compares the old single-page scan with paginated and parallel-segment catalog loading
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(SCRIPT_DIR), 'course_search'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(SCRIPT_DIR)), 'common'))
+
+from catalog import iter_active_courses
+from ranking import CourseIndex
+from local_dynamodb import LocalTable
+
+SERVICES = ['EKS', 'ECS', 'Lambda', 'DynamoDB', 'SageMaker', 'Bedrock', 'S3', 'CloudFront',
+            'Step Functions', 'AppSync', 'Amplify', 'CodePipeline', 'VPC Lattice', 'Aurora']
+TOPICS = ['Getting Started', 'Deep Dive', 'Best Practices', 'Cost Optimization', 'Security',
+          'Observability', 'Migration', 'Serverless Patterns', 'Workshop']
+DIFFICULTIES = ['beginner', 'intermediate', 'advanced']
+WORDS = ('build deploy scale monitor secure migrate automate optimize container cluster function '
+         'pipeline model data stream event query index cache network storage workload').split()
+
+
+def make_course(number, rng):
+    """Synthetic Class item shaped like script/init/Class.json, transcript included"""
+    service = rng.choice(SERVICES)
+    return {
+        'id': str(number),
+        'courseId': str(rng.randint(1, 4)),
+        'name': f"{service}: {rng.choice(TOPICS)} #{number}",
+        'description': f"Learn how to {' '.join(rng.choices(WORDS, k=40))} with {service}.",
+        'difficulty': rng.choice(DIFFICULTIES),
+        'url': f"https://example.cloudfront.net/videos/{number}.mp4",
+        'image': f"https://example.cloudfront.net/images/{number}.png",
+        'author': f"Instructor {rng.randint(1, 200)}",
+        'class_flag': 10 if rng.random() < 0.05 else 0,
+        'transcript': ' '.join(rng.choices(WORDS, k=500)),
+        'createdAt': '2024-01-01T00:00:00Z',
+        'updatedAt': '2024-01-01T00:00:00Z'
+    }
+
+
+def build_table(args, rng):
+    """Create and fill the stand-in table, or DynamoDB Local when --endpoint-url is given"""
+    if args.endpoint_url:
+        import boto3
+        dynamodb = boto3.resource('dynamodb', endpoint_url=args.endpoint_url, region_name='us-west-2')
+        table = dynamodb.Table(args.table_name)
+        try:
+            table.load()
+        except Exception:
+            table = dynamodb.create_table(
+                TableName=args.table_name,
+                KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': 'id', 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST'
+            )
+            table.wait_until_exists()
+    else:
+        table = LocalTable(args.table_name, request_latency=args.request_latency, latency_per_mb=args.latency_per_mb)
+
+    print(f"📝 Loading {args.courses} synthetic courses...")
+    with table.batch_writer() as batch:
+        for number in range(1, args.courses + 1):
+            batch.put_item(Item=make_course(number, rng))
+    return table
+
+
+def run_first_page(table):
+    """Baseline: a single filtered scan call without pagination, as the original Lambda did"""
+    from boto3.dynamodb.conditions import Attr
+    start = time.perf_counter()
+    response = table.scan(
+        FilterExpression=Attr('class_flag').ne(10) & (Attr('class_flag').eq(0) | Attr('class_flag').not_exists())
+    )
+    return len(response.get('Items', [])), time.perf_counter() - start
+
+
+def run_loader(table, segments, with_index):
+    start = time.perf_counter()
+    if with_index:
+        index = CourseIndex()
+        index.sync(iter_active_courses(table, total_segments=segments))
+        count = len(index)
+    else:
+        count = sum(1 for _ in iter_active_courses(table, total_segments=segments))
+    return count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark catalog loading from the Class table')
+    parser.add_argument('--courses', type=int, default=10000,
+                       help='Number of synthetic courses to load')
+    parser.add_argument('--segments', default='1,2,4,8',
+                       help='Comma-separated parallel scan segment counts to compare')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per configuration (best time is reported)')
+    parser.add_argument('--request-latency', type=float, default=0.005,
+                       help='Simulated round trip per request in seconds (stand-in only)')
+    parser.add_argument('--latency-per-mb', type=float, default=0.05,
+                       help='Simulated read time per MB scanned in seconds (stand-in only)')
+    parser.add_argument('--endpoint-url',
+                       help='Use DynamoDB Local at this endpoint instead of the in-memory stand-in')
+    parser.add_argument('--table-name', default='BenchClass',
+                       help='Table name to create and scan')
+    parser.add_argument('--index', action='store_true',
+                       help='Stream scanned items into the BM25 index as the Lambda does')
+    parser.add_argument('--seed', type=int, default=7,
+                       help='Random seed for synthetic data')
+    parser.add_argument('--output',
+                       help='Write results as JSON to this file')
+
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    table = build_table(args, rng)
+
+    results = []
+    count, elapsed = run_first_page(table)
+    results.append({'mode': 'first-page', 'segments': 1, 'courses': count, 'seconds': elapsed})
+
+    for segments in [int(s) for s in args.segments.split(',')]:
+        best = None
+        for _ in range(args.repeat):
+            count, elapsed = run_loader(table, segments, args.index)
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({'mode': 'paginated' if segments == 1 else 'parallel', 'segments': segments,
+                        'courses': count, 'seconds': best})
+
+    baseline = next(r['seconds'] for r in results if r['mode'] != 'first-page')
+    print(f"\n📊 Catalog load for {args.courses} courses:")
+    print(f"   {'mode':<12}{'segments':>9}{'courses':>10}{'seconds':>10}{'items/s':>12}{'speedup':>9}")
+    for r in results:
+        r['items_per_second'] = r['courses'] / r['seconds'] if r['seconds'] else 0.0
+        r['speedup'] = baseline / r['seconds'] if r['mode'] != 'first-page' and r['seconds'] else None
+        speedup = f"{r['speedup']:.2f}x" if r['speedup'] else '-'
+        print(f"   {r['mode']:<12}{r['segments']:>9}{r['courses']:>10}{r['seconds']:>10.3f}"
+              f"{r['items_per_second']:>12.0f}{speedup:>9}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'courses': args.courses, 'index': args.index, 'results': results}, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+CourseSearch Handler Benchmark
+Runs the Lambda handler offline against the DynamoDB stand-in and a deterministic fake Bedrock,
+reporting cold start, per-stage timings and latency percentiles under concurrent invocations
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT_DIR = os.path.dirname(SCRIPT_DIR)
+FIXTURE_PATH = os.path.join(os.path.dirname(AGENT_DIR), 'init', 'Class.json')
+sys.path.insert(0, os.path.join(AGENT_DIR, 'course_search'))
+sys.path.insert(0, os.path.join(os.path.dirname(AGENT_DIR), 'common'))
+
+from bench_catalog_scan import make_course
+from bench_scale import agent_event
+from fake_bedrock import FakeBedrockRuntime
+from local_dynamodb import LocalDynamoDB
+from stats import format_summary, summarize
+
+QUERIES = [
+    'EKS 기초 강의 추천해줘', 'Lambda beginner', 'SageMaker model deployment', 'DynamoDB GraphQL',
+    'container observability', 'Bedrock 입문', 'advanced ECS', 'CodePipeline CI/CD', 'serverless patterns',
+    'migration to AWS', 'security best practices', 'Amplify hosting'
+]
+
+
+def load_fixture():
+    """Class items from script/init/Class.json as plain values"""
+    from boto3.dynamodb.types import TypeDeserializer
+    deserializer = TypeDeserializer()
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        requests = json.load(f)['Class']
+    return [{k: deserializer.deserialize(v) for k, v in r['PutRequest']['Item'].items()} for r in requests]
+
+
+def build_dynamodb(args):
+    """Stand-in resource holding either the fixture catalog or synthetic courses"""
+    dynamodb = LocalDynamoDB(request_latency=args.dynamodb_latency, latency_per_mb=args.latency_per_mb)
+    table = dynamodb.Table('Class')
+    if args.courses:
+        rng = random.Random(args.seed)
+        items = (make_course(number, rng) for number in range(1, args.courses + 1))
+    else:
+        items = load_fixture()
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+    return dynamodb
+
+
+def configure_environment(args):
+    os.environ['DYNAMODB_TABLE_NAME'] = 'Class'
+    os.environ['CATALOG_MAX_ITEMS'] = str(max(args.courses, 5000) * 2)
+    os.environ.pop('CATALOG_STATE_TABLE', None)
+    os.environ.pop('RESULT_CACHE_TABLE', None)
+    # Concurrent threads share one warm module; without this every repeated query would be a cache hit
+    os.environ['RESULT_CACHE_SIZE'] = '256' if args.result_cache else '0'
+    os.environ['MODEL_STREAMING'] = 'true' if args.model_mode == 'stream' else 'false'
+    os.environ['FAST_PATH'] = 'false' if args.no_fast_path else 'true'
+
+
+def build_bedrock(args):
+    return FakeBedrockRuntime(base_latency=args.bedrock_latency, chatty=args.chatty)
+
+
+def import_handler(dynamodb, bedrock):
+    """Import the Lambda module and point it at the offline clients"""
+    import index
+    index.dynamodb = dynamodb
+    index.bedrock = bedrock
+    return index
+
+
+def cold_start_probe(args):
+    """Run inside a fresh interpreter: time the module import and the first invocation"""
+    configure_environment(args)
+    dynamodb = build_dynamodb(args)
+    bedrock = build_bedrock(args)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        index = import_handler(dynamodb, bedrock)
+    import_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        index.lambda_handler(agent_event(QUERIES[0]), None)
+    first_call_seconds = time.perf_counter() - start
+
+    print(json.dumps({'import': import_seconds, 'first_call': first_call_seconds}))
+
+
+def measure_cold_starts(argv, runs):
+    imports, first_calls = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--cold-start-probe'] + argv,
+            check=True, capture_output=True, text=True
+        ).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        imports.append(probe['import'])
+        first_calls.append(probe['first_call'])
+    return {'import': summarize(imports), 'first_call': summarize(first_calls)}
+
+
+def measure_stages(index, bedrock, requests):
+    """Time each pipeline stage over sequential warm requests; also returns latencies per route"""
+    from tracing import StageTimer
+
+    stages = {}
+    routes = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for number in range(requests):
+            timer = StageTimer()
+            result = index.search_with_bedrock(index.dynamodb, bedrock, QUERIES[number % len(QUERIES)], timer=timer)
+            for name, seconds in timer.durations().items():
+                stages.setdefault(name, []).append(seconds)
+            route = json.loads(result['body']).get('route', 'error')
+            routes.setdefault(route, []).append(timer.elapsed())
+    return {name: summarize(values) for name, values in stages.items()}, {route: summarize(values) for route, values in routes.items()}
+
+
+def measure_concurrency(index, requests, concurrency):
+    """Invoke lambda_handler from `concurrency` threads and collect per-call latency"""
+    def invoke(number):
+        start = time.perf_counter()
+        response = index.lambda_handler(agent_event(QUERIES[number % len(QUERIES)]), None)
+        return time.perf_counter() - start, response['response']['httpStatusCode']
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(invoke, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    summary = summarize([latency for latency, _ in results])
+    summary['errors'] = sum(1 for _, status in results if status != 200)
+    summary['throughput_rps'] = round(requests / elapsed, 2) if elapsed else 0.0
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path, threshold, min_delta_ms=1.0):
+    """Print p95 changes against a previous results file; return True when any regressed beyond threshold"""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+
+    rows = []
+    for name, summary in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name)
+        if previous:
+            rows.append((f"stage {name}", previous['p95_ms'], summary['p95_ms']))
+    for level, summary in results['concurrency'].items():
+        previous = baseline.get('concurrency', {}).get(level)
+        if previous:
+            rows.append((f"concurrency {level}", previous['p95_ms'], summary['p95_ms']))
+
+    regressed = False
+    print(f"\n📈 p95 compared with {baseline_path} (commit {baseline.get('commit')}):")
+    for label, before, after in rows:
+        change = (after - before) / before * 100 if before else 0.0
+        # Sub-millisecond stages jitter by large percentages without meaning anything
+        worse = change > threshold and after - before > min_delta_ms
+        flag = '❌' if worse else '✅'
+        regressed = regressed or worse
+        print(f"   {flag} {label:<24}{before:>10.1f}ms -> {after:>8.1f}ms ({change:+.1f}%)")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the CourseSearch Lambda handler offline')
+    parser.add_argument('--courses', type=int, default=0,
+                       help='Synthetic catalog size (default: use script/init/Class.json)')
+    parser.add_argument('--requests', type=int, default=100,
+                       help='Invocations per measurement')
+    parser.add_argument('--concurrency', default='1,4,16',
+                       help='Comma-separated concurrent invocation levels')
+    parser.add_argument('--cold-starts', type=int, default=3,
+                       help='Fresh-interpreter cold start measurements')
+    parser.add_argument('--bedrock-latency', type=float, default=0.3,
+                       help='Simulated base latency of the model call in seconds')
+    parser.add_argument('--model-mode', choices=['stream', 'invoke'], default='stream',
+                       help='Read the model answer as a stream with early exit, or as one InvokeModel body')
+    parser.add_argument('--chatty', action='store_true',
+                       help='Have the fake model wrap its JSON answer in prose')
+    parser.add_argument('--no-fast-path', action='store_true',
+                       help='Send every query to the model instead of answering plain service/difficulty queries from the index')
+    parser.add_argument('--dynamodb-latency', type=float, default=0.005,
+                       help='Simulated DynamoDB request round trip in seconds')
+    parser.add_argument('--latency-per-mb', type=float, default=0.05,
+                       help='Simulated DynamoDB read time per MB in seconds')
+    parser.add_argument('--result-cache', action='store_true',
+                       help='Keep the query result cache enabled')
+    parser.add_argument('--seed', type=int, default=7,
+                       help='Random seed for synthetic courses')
+    parser.add_argument('--output',
+                       help='Write results as JSON to this file')
+    parser.add_argument('--compare',
+                       help='Previous results file to compare p95 latencies against')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                       help='Percent p95 increase reported as a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                       help='Ignore p95 increases smaller than this many milliseconds')
+    parser.add_argument('--cold-start-probe', action='store_true',
+                       help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.cold_start_probe:
+        cold_start_probe(args)
+        return
+
+    probe_argv = [
+        '--courses', str(args.courses), '--seed', str(args.seed),
+        '--bedrock-latency', str(args.bedrock_latency), '--dynamodb-latency', str(args.dynamodb_latency),
+        '--latency-per-mb', str(args.latency_per_mb), '--model-mode', args.model_mode
+    ] + (['--result-cache'] if args.result_cache else []) + (['--no-fast-path'] if args.no_fast_path else []) + (['--chatty'] if args.chatty else [])
+
+    print(f"🧊 Measuring {args.cold_starts} cold starts...")
+    cold_start = measure_cold_starts(probe_argv, args.cold_starts) if args.cold_starts else {}
+
+    configure_environment(args)
+    bedrock = build_bedrock(args)
+    index = import_handler(build_dynamodb(args), bedrock)
+    with contextlib.redirect_stdout(io.StringIO()):
+        index.lambda_handler(agent_event(QUERIES[0]), None)
+
+    print(f"⏱️ Measuring stages over {args.requests} warm requests...")
+    stages, routes = measure_stages(index, bedrock, args.requests)
+
+    concurrency = {}
+    for level in [int(c) for c in args.concurrency.split(',')]:
+        print(f"🔀 Measuring {args.requests} requests at concurrency {level}...")
+        concurrency[str(level)] = measure_concurrency(index, args.requests, level)
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'cold_start_probe')},
+        'catalog_size': len(index.course_index),
+        'cold_start': cold_start,
+        'stages': stages,
+        'routes': routes,
+        'concurrency': concurrency
+    }
+
+    print(f"\n📊 Results ({results['catalog_size']} courses):")
+    if cold_start:
+        print(f"   Cold start import:     {format_summary(cold_start['import'])}")
+        print(f"   Cold start first call: {format_summary(cold_start['first_call'])}")
+    for name, summary in stages.items():
+        print(f"   Stage {name:<16} {format_summary(summary)}")
+    for route, summary in routes.items():
+        print(f"   Route {route:<16} {format_summary(summary)}")
+    for level, summary in concurrency.items():
+        print(f"   Concurrency {level:<10} {format_summary(summary)} "
+              f"throughput={summary['throughput_rps']}rps errors={summary['errors']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold, args.min_delta_ms):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
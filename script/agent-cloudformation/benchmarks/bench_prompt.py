@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Course Selection Prompt Benchmark
+Compares the verbose "Course N" prompt with the compact, budgeted table prompt on the fixture catalog:
+estimated input tokens, prompt build time, and whether the model picks the same courses from both
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(AGENT_DIR, 'course_search'))
+sys.path.insert(0, os.path.join(os.path.dirname(AGENT_DIR), 'common'))
+
+from bench_handler import QUERIES, load_fixture
+from course_prompt import compact_prompt, verbose_prompt
+from prompt_budget import estimate_tokens
+from ranking import CourseIndex, tokenize
+from selection import parse_selection
+from stats import percentile
+
+EXTRA_QUERIES = [
+    'Kubernetes cluster autoscaling', 'generative AI application', 'database migration from Oracle',
+    'GitOps with Flux', '컨테이너 보안', 'Step Functions workflow', 'VPC Lattice service network', 'Proton templates'
+]
+
+VERBOSE_BLOCK = re.compile(r'^Course (\d+):\nTitle: (.*)\nDescription: (.*)\nDifficulty: (.*)$', re.MULTILINE)
+COMPACT_ROW = re.compile(r'^(\d+)\|([^|\n]*)\|([^|\n]*)\|([^\n]*)$', re.MULTILINE)
+
+
+class LexicalJudge:
+    def __init__(self, max_selected=3):
+        """Offline stand-in for the model: picks the listed courses whose visible text best matches the question"""
+        self.max_selected = max_selected
+        self.calls = 0
+
+    def select(self, prompt):
+        self.calls += 1
+        question = prompt.split('\n', 1)[0]
+        terms = set(tokenize(question))
+        rows = [(int(n), title, description) for n, title, description, _ in VERBOSE_BLOCK.findall(prompt)]
+        rows += [(int(n), title, description) for n, title, _, description in COMPACT_ROW.findall(prompt)]
+        scored = []
+        for short_id, title, description in rows:
+            score = 2 * len(terms & set(tokenize(title))) + len(terms & set(tokenize(description)))
+            if score:
+                scored.append((-score, short_id))
+        return [short_id for _, short_id in sorted(scored)[:self.max_selected]]
+
+
+class BedrockJudge:
+    def __init__(self, client, model_id):
+        """The real model through the Converse API, with deterministic sampling"""
+        self.client = client
+        self.model_id = model_id
+        self.calls = 0
+        self.input_tokens = 0
+
+    def select(self, prompt):
+        self.calls += 1
+        response = self.client.converse(
+            modelId=self.model_id,
+            messages=[{'role': 'user', 'content': [{'text': prompt}]}],
+            inferenceConfig={'maxTokens': 500, 'temperature': 0.0}
+        )
+        self.input_tokens += response.get('usage', {}).get('inputTokens', 0)
+        return parse_selection(response['output']['message']['content'][0]['text'])
+
+
+def grow_descriptions(courses, chars):
+    """Courses whose descriptions are padded with their transcript up to `chars` characters"""
+    if not chars:
+        return courses
+    grown = []
+    for course in courses:
+        text = f"{course.get('description', '')} {course.get('transcript', '')}"
+        grown.append(dict(course, description=' '.join(text.split())[:chars]))
+    return grown
+
+
+def run(courses, queries, judge, budget, description_tokens, candidate_limit, fallback_limit):
+    """Per-prompt token counts, build times and the selections made from each prompt"""
+    index = CourseIndex()
+    for course in courses:
+        index.upsert(course)
+
+    results = {'verbose': {'tokens': [], 'build': []}, 'compact': {'tokens': [], 'build': []}}
+    agreements = []
+    for query in queries:
+        candidates = index.search(query, limit=candidate_limit) or index.items(limit=fallback_limit)
+
+        started = time.perf_counter()
+        verbose = verbose_prompt(query, candidates)
+        results['verbose']['build'].append(time.perf_counter() - started)
+        started = time.perf_counter()
+        compact = compact_prompt(query, candidates, budget, description_tokens=description_tokens)
+        results['compact']['build'].append(time.perf_counter() - started)
+
+        results['verbose']['tokens'].append(verbose.tokens)
+        results['compact']['tokens'].append(compact.tokens)
+
+        # Compare chosen courses, not ids: both prompts are mapped back to candidate positions
+        chosen_verbose = [str(candidates[n - 1].get('id')) for n in verbose.resolve(judge.select(verbose.text))]
+        chosen_compact = [str(candidates[n - 1].get('id')) for n in compact.resolve(judge.select(compact.text))]
+        union = set(chosen_verbose) | set(chosen_compact)
+        overlap = len(set(chosen_verbose) & set(chosen_compact)) / len(union) if union else 1.0
+        agreements.append({
+            'query': query,
+            'candidates': len(candidates),
+            'verbose': chosen_verbose,
+            'compact': chosen_compact,
+            'same_set': set(chosen_verbose) == set(chosen_compact),
+            'same_top': chosen_verbose[:1] == chosen_compact[:1],
+            'overlap': overlap,
+            'dropped': compact.dropped
+        })
+    return results, agreements
+
+
+def report(label, results, agreements, budget):
+    verbose_tokens = results['verbose']['tokens']
+    compact_tokens = results['compact']['tokens']
+    saved = 1 - sum(compact_tokens) / max(sum(verbose_tokens), 1)
+    count = len(agreements)
+    summary = {
+        'verbose_mean_tokens': round(sum(verbose_tokens) / count, 1),
+        'verbose_max_tokens': max(verbose_tokens),
+        'compact_mean_tokens': round(sum(compact_tokens) / count, 1),
+        'compact_max_tokens': max(compact_tokens),
+        'tokens_saved': round(saved, 3),
+        'over_budget': sum(1 for tokens in compact_tokens if tokens > budget),
+        'same_set': round(sum(a['same_set'] for a in agreements) / count, 3),
+        'same_top': round(sum(a['same_top'] for a in agreements) / count, 3),
+        'mean_overlap': round(sum(a['overlap'] for a in agreements) / count, 3),
+        'compact_build_p50_us': round(1e6 * percentile(results['compact']['build'], 50), 1),
+        'verbose_build_p50_us': round(1e6 * percentile(results['verbose']['build'], 50), 1)
+    }
+    print(f"\n📊 {label}")
+    print(f"   Input tokens  verbose mean {summary['verbose_mean_tokens']} / max {summary['verbose_max_tokens']}, "
+          f"compact mean {summary['compact_mean_tokens']} / max {summary['compact_max_tokens']} "
+          f"({100 * saved:.0f}% fewer, budget {budget})")
+    print(f"   Agreement     same courses {100 * summary['same_set']:.0f}%, same first pick {100 * summary['same_top']:.0f}%, "
+          f"mean overlap {100 * summary['mean_overlap']:.0f}%")
+    print(f"   Build time    verbose p50 {summary['verbose_build_p50_us']}µs, compact p50 {summary['compact_build_p50_us']}µs")
+    for agreement in agreements:
+        if not agreement['same_set']:
+            print(f"   ↔️  {agreement['query']!r}: verbose {agreement['verbose']} vs compact {agreement['compact']}"
+                  + (f" ({agreement['dropped']} candidates dropped)" if agreement['dropped'] else ''))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare verbose and compact course selection prompts on the fixture catalog')
+    parser.add_argument('--budget', type=int, default=1500,
+                       help='Input token budget of the compact prompt (PROMPT_TOKEN_BUDGET)')
+    parser.add_argument('--description-tokens', type=int, default=40,
+                       help='Description tokens per candidate before the budget is applied (PROMPT_DESCRIPTION_TOKENS)')
+    parser.add_argument('--candidate-limit', type=int, default=10,
+                       help='Pre-ranked candidates per query')
+    parser.add_argument('--fallback-limit', type=int, default=50,
+                       help='Catalog slice used when a query matches nothing')
+    parser.add_argument('--description-chars', default='0,1000,4000',
+                       help='Comma-separated description lengths to test; 0 keeps the fixture descriptions, '
+                            'larger values pad them with the course transcript')
+    parser.add_argument('--bedrock', action='store_true',
+                       help='Ask the real model instead of the offline lexical judge')
+    parser.add_argument('--model-id', default='us.amazon.nova-pro-v1:0',
+                       help='Model used with --bedrock')
+    parser.add_argument('--region', default='us-west-2',
+                       help='AWS region for --bedrock')
+    parser.add_argument('--profile',
+                       help='AWS profile name for --bedrock')
+    parser.add_argument('--min-agreement', type=float, default=0.8,
+                       help='Exit with code 1 when the share of queries with the same courses is lower on the fixture descriptions')
+    parser.add_argument('--output',
+                       help='Write the summaries and per-query selections as JSON')
+
+    args = parser.parse_args()
+
+    if args.bedrock:
+        import boto3
+        session = boto3.Session(profile_name=args.profile) if args.profile else boto3.Session()
+        judge = BedrockJudge(session.client('bedrock-runtime', region_name=args.region), args.model_id)
+    else:
+        judge = LexicalJudge()
+
+    fixture = load_fixture()
+    queries = QUERIES + EXTRA_QUERIES
+    print(f"🚀 {len(queries)} queries against {len(fixture)} fixture courses "
+          f"({'Bedrock ' + args.model_id if args.bedrock else 'offline lexical judge'})")
+
+    failures = []
+    output = {}
+    for chars in [int(value) for value in args.description_chars.split(',') if value.strip()]:
+        courses = grow_descriptions(fixture, chars)
+        mean_chars = sum(len(str(course.get('description', ''))) for course in courses) / len(courses)
+        results, agreements = run(courses, queries, judge, args.budget, args.description_tokens,
+                                  args.candidate_limit, args.fallback_limit)
+        label = f"Descriptions of about {mean_chars:.0f} characters" + (' (fixture)' if not chars else '')
+        summary = report(label, results, agreements, args.budget)
+        output[str(chars)] = {'summary': summary, 'queries': agreements}
+        if summary['over_budget']:
+            failures.append(f"{summary['over_budget']} compact prompts over budget at {chars} description chars")
+        # Padded descriptions show a transcript the compact prompt cuts off, so only the fixture gates agreement
+        if not chars and summary['same_set'] < args.min_agreement:
+            failures.append(f"agreement {100 * summary['same_set']:.0f}% below {100 * args.min_agreement:.0f}%")
+
+    if args.bedrock:
+        print(f"\n🤖 {judge.calls} model calls, {judge.input_tokens} input tokens reported by Bedrock")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Results saved to {args.output}")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
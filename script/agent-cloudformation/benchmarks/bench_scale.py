@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Load-Scale Benchmark
+Generates synthetic Class/Comment data, loads it with the seed loader into the DynamoDB stand-in
+and runs the CourseSearch Lambda handler against it, recording latency percentiles
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT_DIR = os.path.dirname(SCRIPT_DIR)
+INIT_DIR = os.path.join(os.path.dirname(AGENT_DIR), 'init')
+sys.path.insert(0, os.path.join(AGENT_DIR, 'course_search'))
+sys.path.insert(0, os.path.join(os.path.dirname(AGENT_DIR), 'common'))
+sys.path.insert(0, INIT_DIR)
+
+from fake_bedrock import FakeBedrockRuntime
+from local_dynamodb import LocalDynamoDB, LocalDynamoDBClient
+from stats import format_summary, summarize
+
+import generate_data
+from load_seed_data import Checkpoint, SeedDataLoader
+
+QUERY_TEMPLATES = [
+    '{service} beginner', '{service} 기초 강의 추천해줘', 'advanced {service} course',
+    '{service} best practices', '{service} 고급 강의', 'how to scale with {service}'
+]
+
+
+def make_queries(count, rng):
+    services = [s.split(' ', 1)[-1] for s in generate_data.SERVICES]
+    return [rng.choice(QUERY_TEMPLATES).format(service=rng.choice(services)) for _ in range(count)]
+
+
+def agent_event(query):
+    """Action group event as sent by the Bedrock Agent"""
+    return {
+        'actionGroup': 'CourseSearchActionGroup',
+        'apiPath': '/search_classes',
+        'httpMethod': 'POST',
+        'requestBody': {'content': {'application/json': {'properties': [{'name': 'query', 'value': query}]}}}
+    }
+
+
+def run_loader(args, resource):
+    """Stream generated classes and comments through the seed loader"""
+    client = LocalDynamoDBClient(resource, request_latency=args.write_latency,
+                                 unprocessed_ratio=args.unprocessed_ratio, seed=args.seed)
+    loader = SeedDataLoader(client=client, max_workers=args.workers, base_delay=0.01)
+    generators = generate_data.generate_tables(args)
+    checkpoint = Checkpoint(None)
+
+    start = time.perf_counter()
+    for name, table_name in (('Class', 'Class'), ('Comment', 'Comment')):
+        loader.load_batches(f"bench-{name}", table_name, generate_data.batched(generators[name]()), checkpoint)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'items': loader.items_written,
+        'seconds': round(elapsed, 3),
+        'items_per_second': round(loader.items_written / elapsed, 1) if elapsed else 0.0,
+        'retried_batches': loader.retries,
+        'batch_latency': summarize(loader.batch_latencies)
+    }
+
+
+def run_handler(args, resource, queries):
+    """Invoke lambda_handler for each query; the first call pays the catalog load"""
+    os.environ['DYNAMODB_TABLE_NAME'] = 'Class'
+    os.environ['CATALOG_MAX_ITEMS'] = str(args.catalog_max_items)
+    os.environ.pop('CATALOG_STATE_TABLE', None)
+    os.environ.pop('RESULT_CACHE_TABLE', None)
+    if args.no_result_cache:
+        os.environ['RESULT_CACHE_SIZE'] = '0'
+
+    import index
+    bedrock = FakeBedrockRuntime(base_latency=args.bedrock_latency)
+    index.dynamodb = resource
+    index.bedrock = bedrock
+
+    latencies = []
+    errors = 0
+    for query in queries:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = index.lambda_handler(agent_event(query), None)
+        latencies.append(time.perf_counter() - start)
+        if response['response']['httpStatusCode'] != 200:
+            errors += 1
+
+    return {
+        'invocations': len(queries),
+        'errors': errors,
+        'first_invocation_ms': round(1000 * latencies[0], 3) if latencies else 0.0,
+        'warm': summarize(latencies[1:]),
+        'bedrock_calls': bedrock.calls,
+        'bedrock_input_tokens': bedrock.input_tokens
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the seed loader and CourseSearch handler at scale')
+    parser.add_argument('--classes', type=int, default=10000,
+                       help='Number of synthetic classes')
+    parser.add_argument('--comments', type=int, default=100000,
+                       help='Number of synthetic comments')
+    parser.add_argument('--skew', type=float, default=1.1,
+                       help='Zipf exponent for comments per classId')
+    parser.add_argument('--courses', type=int, default=8,
+                       help='Number of courses the classes belong to')
+    parser.add_argument('--channels', type=int, default=0,
+                       help=argparse.SUPPRESS)
+    parser.add_argument('--transcript-words', type=int, default=300,
+                       help='Words per generated class transcript')
+    parser.add_argument('--queries', type=int, default=200,
+                       help='Number of handler invocations')
+    parser.add_argument('--workers', type=int, default=8,
+                       help='Seed loader worker threads')
+    parser.add_argument('--write-latency', type=float, default=0.01,
+                       help='Simulated BatchWriteItem round trip in seconds')
+    parser.add_argument('--unprocessed-ratio', type=float, default=0.02,
+                       help='Share of written items returned as unprocessed')
+    parser.add_argument('--bedrock-latency', type=float, default=0.3,
+                       help='Simulated base latency of the model call in seconds')
+    parser.add_argument('--catalog-max-items', type=int, default=200000,
+                       help='Catalog size above which the handler keeps trimmed descriptions')
+    parser.add_argument('--no-result-cache', action='store_true',
+                       help='Disable the query result cache so every call reaches the model')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Random seed')
+    parser.add_argument('--output',
+                       help='Write results as JSON to this file')
+
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    resource = LocalDynamoDB(request_latency=0.005, latency_per_mb=0.05)
+
+    print(f"📝 Loading {args.classes} classes and {args.comments} comments (skew {args.skew})...")
+    loader_results = run_loader(args, resource)
+    print(f"✅ Loader: {loader_results['items']} items, {loader_results['items_per_second']:.0f} items/sec, "
+          f"{loader_results['retried_batches']} retried batches")
+    print(f"   Batch latency: {format_summary(loader_results['batch_latency'])}")
+
+    print(f"\n🔎 Running {args.queries} handler invocations...")
+    handler_results = run_handler(args, resource, make_queries(args.queries, rng))
+    print(f"✅ Handler: first call {handler_results['first_invocation_ms']:.1f}ms, "
+          f"{handler_results['errors']} errors, {handler_results['bedrock_calls']} model calls")
+    print(f"   Warm latency: {format_summary(handler_results['warm'])}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'config': vars(args), 'loader': loader_results, 'handler': handler_results}, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Deterministic fake of the bedrock-agent-runtime client
+Streams a canned answer for invoke_agent with configurable time to first chunk, chunk pacing
+and a concurrency limit beyond which calls are throttled, so the load test runs offline.
+Like the real service, the answer only arrives in several chunks when streamFinalResponse is requested
+"""
+
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+ANSWER = ('요청하신 내용과 가장 잘 맞는 강의를 찾았습니다. 첫 번째 강의는 기본 개념을 소개하고, '
+          '두 번째 강의는 실습 위주로 구성되어 있으며, 세 번째 강의는 운영 환경에서의 모범 사례를 다룹니다. ')
+
+
+class FakeAgentRuntime:
+    def __init__(self, first_chunk_latency=1.5, chunk_interval=0.05, chunks=8, concurrency_limit=None):
+        """Configure the simulated agent; `concurrency_limit` concurrent sessions are served, the rest throttled"""
+        self.first_chunk_latency = first_chunk_latency
+        self.chunk_interval = chunk_interval
+        self.chunks = chunks
+        self.concurrency_limit = concurrency_limit
+        self.calls = 0
+        self.throttled = 0
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+
+    def invoke_agent(self, agentId, agentAliasId, sessionId, inputText, streamingConfigurations=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            if self.concurrency_limit and self.active >= self.concurrency_limit:
+                self.throttled += 1
+                raise ClientError({'Error': {'Code': 'throttlingException', 'Message': 'Rate exceeded'}}, 'InvokeAgent')
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+        answer = f"[{inputText}] " + ANSWER
+        size = max(1, len(answer) // self.chunks + 1)
+        stream = bool((streamingConfigurations or {}).get('streamFinalResponse'))
+
+        def completion():
+            try:
+                # The agent plans and calls its action group before the first chunk
+                time.sleep(self.first_chunk_latency)
+                if not stream:
+                    # The whole answer is generated before it is sent
+                    time.sleep(self.chunk_interval * (len(range(0, len(answer), size)) - 1))
+                    yield {'chunk': {'bytes': answer.encode('utf-8')}}
+                    return
+                for offset in range(0, len(answer), size):
+                    if offset:
+                        time.sleep(self.chunk_interval)
+                    yield {'chunk': {'bytes': answer[offset:offset + size].encode('utf-8')}}
+            finally:
+                with self._lock:
+                    self.active -= 1
+
+        return {'completion': completion(), 'sessionId': sessionId, 'contentType': 'text/plain'}
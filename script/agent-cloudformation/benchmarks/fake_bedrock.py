@@ -0,0 +1,114 @@
+"""
+Deterministic fake of the bedrock-runtime client
+Answers the course selection prompt with the first candidates it lists,
+after a latency proportional to the prompt size, so benchmarks are repeatable offline
+"""
+
+import io
+import json
+import re
+import threading
+import time
+
+# "Course N:" blocks of the verbose prompt or "N|title|..." rows of the compact one
+COURSE_PATTERN = re.compile(r'^(?:Course (\d+):|(\d+)\|)', re.MULTILINE)
+
+# Prose some models wrap around the JSON despite the instructions
+CHATTY_PREFIX = 'Sure! Based on your question, here are the best matching courses:\n```json\n'
+CHATTY_SUFFIX = ('\n```\nThese courses were selected because their titles and descriptions cover the topics '
+                 'you asked about, at a difficulty level that fits the question. The first one gives a broad '
+                 'introduction, while the others go deeper into hands-on practice and operational details. '
+                 'Let me know if you would like courses at a different level.')
+
+
+def estimate_tokens(text):
+    """Rough token count: about four characters per token"""
+    return max(1, len(text) // 4)
+
+
+class StreamBody:
+    def __init__(self, events):
+        """Iterable event stream with close(), like botocore's EventStream"""
+        self._events = events
+        self.closed = False
+
+    def __iter__(self):
+        for event in self._events:
+            if self.closed:
+                return
+            yield event
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBedrockRuntime:
+    def __init__(self, base_latency=0.3, latency_per_1k_tokens=0.02, max_selected=3,
+                 output_tokens_per_second=100, chatty=False, chunk_chars=12):
+        """Configure the simulated model call latency and answer style"""
+        self.base_latency = base_latency
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.max_selected = max_selected
+        self.output_tokens_per_second = output_tokens_per_second
+        self.chatty = chatty
+        self.chunk_chars = chunk_chars
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt):
+        numbers = [int(block or row) for block, row in COURSE_PATTERN.findall(prompt)][:self.max_selected]
+        answer = json.dumps({'selected': numbers})
+        return CHATTY_PREFIX + answer + CHATTY_SUFFIX if self.chatty else answer
+
+    def _start(self, body):
+        request = json.loads(body)
+        prompt = request['messages'][0]['content'][0]['text']
+        tokens = estimate_tokens(prompt)
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += tokens
+        # Time to first token
+        time.sleep(self.base_latency + self.latency_per_1k_tokens * tokens / 1000)
+        return prompt, tokens
+
+    def _record_output(self, text):
+        tokens = estimate_tokens(text)
+        with self._lock:
+            self.output_tokens += tokens
+        return tokens
+
+    def invoke_model(self, modelId, body, **kwargs):
+        prompt, tokens = self._start(body)
+        answer = self._answer(prompt)
+        output_tokens = estimate_tokens(answer)
+        time.sleep(output_tokens / self.output_tokens_per_second)
+        self._record_output(answer)
+        payload = {
+            'output': {'message': {'role': 'assistant', 'content': [{'text': answer}]}},
+            'usage': {'inputTokens': tokens, 'outputTokens': output_tokens}
+        }
+        return {'body': io.BytesIO(json.dumps(payload).encode('utf-8'))}
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        prompt, tokens = self._start(body)
+        answer = self._answer(prompt)
+
+        def events():
+            yield _chunk({'messageStart': {'role': 'assistant'}})
+            for offset in range(0, len(answer), self.chunk_chars):
+                piece = answer[offset:offset + self.chunk_chars]
+                # Generation time is only spent for chunks the caller actually reads
+                time.sleep(estimate_tokens(piece) / self.output_tokens_per_second)
+                self._record_output(piece)
+                yield _chunk({'contentBlockDelta': {'delta': {'text': piece}, 'contentBlockIndex': 0}})
+            yield _chunk({'contentBlockStop': {'contentBlockIndex': 0}})
+            yield _chunk({'messageStop': {'stopReason': 'end_turn'},
+                          'metadata': {'usage': {'inputTokens': tokens, 'outputTokens': estimate_tokens(answer)}}})
+
+        return {'body': StreamBody(events())}
+
+
+def _chunk(payload):
+    return {'chunk': {'bytes': json.dumps(payload).encode('utf-8')}}
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Bedrock Agent Load Test
+Sends a query corpus to a deployed agent through concurrent invoke_agent sessions at a target rate,
+reporting time to first chunk, total latency and response size percentiles
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(SCRIPT_DIR)))
+
+from fake_agent_runtime import FakeAgentRuntime
+from stats import format_summary, percentile, summarize
+
+QUERIES = [
+    'EKS 기초 강의 추천해줘', 'Lambda beginner', 'SageMaker model deployment', 'DynamoDB GraphQL',
+    'container observability', 'Bedrock 입문', 'advanced ECS', 'CodePipeline CI/CD', 'serverless patterns',
+    'migration to AWS', 'security best practices', 'Amplify hosting'
+]
+
+
+def load_corpus(path):
+    """Queries from a JSON list or a text file with one query per line"""
+    if not path:
+        return list(QUERIES)
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if path.endswith('.json'):
+        return [str(query) for query in json.loads(content)]
+    return [line.strip() for line in content.splitlines() if line.strip()]
+
+
+def load_agent_env(env_file=os.path.join(PROJECT_ROOT, '.env.agent')):
+    """BEDROCK_AGENT_* values written by deploy-agent.py"""
+    values = {}
+    if os.path.exists(env_file):
+        with open(env_file, 'r') as f:
+            for line in f:
+                key, _, value = line.strip().partition('=')
+                if value:
+                    values[key] = value
+    return values
+
+
+def build_runtime(args):
+    """Fake runtime, or a bedrock-agent-runtime client sized for the requested concurrency"""
+    if args.fake:
+        return FakeAgentRuntime(first_chunk_latency=args.fake_first_chunk, chunk_interval=args.fake_chunk_interval,
+                                concurrency_limit=args.fake_concurrency_limit)
+    import boto3
+    from botocore.config import Config
+    session = boto3.Session(profile_name=args.profile) if args.profile else boto3.Session()
+    config = Config(max_pool_connections=max(10, args.concurrency), read_timeout=args.timeout,
+                    retries={'max_attempts': 1, 'mode': 'standard'})
+    return session.client('bedrock-agent-runtime', region_name=args.region,
+                          endpoint_url=args.endpoint_url, config=config)
+
+
+def error_code(error):
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code') or type(error).__name__
+
+
+def invoke_once(runtime, agent_id, alias_id, query, scheduled_at, stream=True, clock=time.perf_counter):
+    """One session: returns timings relative to the send and how long the request waited for a worker"""
+    sent_at = clock()
+    sample = {'query': query, 'queue_delay': sent_at - scheduled_at, 'first_chunk': None, 'bytes': 0, 'error': None}
+    try:
+        # Without streamFinalResponse the agent returns its answer as one chunk at the end
+        response = runtime.invoke_agent(agentId=agent_id, agentAliasId=alias_id,
+                                        sessionId=f"load-test-{uuid.uuid4().hex}", inputText=query,
+                                        streamingConfigurations={'streamFinalResponse': stream})
+        for event in response['completion']:
+            if 'chunk' in event and 'bytes' in event['chunk']:
+                if sample['first_chunk'] is None:
+                    sample['first_chunk'] = clock() - sent_at
+                sample['bytes'] += len(event['chunk']['bytes'])
+    except Exception as e:
+        sample['error'] = error_code(e)
+    sample['total'] = clock() - sent_at
+    return sample
+
+
+def run_load(runtime, agent_id, alias_id, corpus, requests, concurrency, rate, stream=True,
+             clock=time.perf_counter, sleep=time.sleep):
+    """Open-loop load: request i is due at i / rate seconds, served by at most `concurrency` sessions"""
+    started_at = clock()
+    futures = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for number in range(requests):
+            scheduled_at = started_at + (number / rate if rate else 0.0)
+            delay = scheduled_at - clock()
+            if delay > 0:
+                sleep(delay)
+            futures.append(executor.submit(invoke_once, runtime, agent_id, alias_id,
+                                           corpus[number % len(corpus)], scheduled_at, stream, clock))
+        samples = [future.result() for future in futures]
+    return samples, clock() - started_at
+
+
+def report(samples, elapsed):
+    """Latency percentiles over successful sessions plus error counts"""
+    ok = [s for s in samples if not s['error']]
+    errors = {}
+    for sample in samples:
+        if sample['error']:
+            errors[sample['error']] = errors.get(sample['error'], 0) + 1
+    sizes = [s['bytes'] for s in ok]
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(1 - len(ok) / len(samples), 4) if samples else 0.0,
+        'achieved_rps': round(len(samples) / elapsed, 3) if elapsed else 0.0,
+        'first_chunk': summarize([s['first_chunk'] for s in ok if s['first_chunk'] is not None]),
+        'total': summarize([s['total'] for s in ok]),
+        'queue_delay': summarize([max(0.0, s['queue_delay']) for s in samples]),
+        'bytes': {
+            'mean': round(sum(sizes) / len(sizes), 1) if sizes else 0.0,
+            'p50': percentile(sizes, 50),
+            'p95': percentile(sizes, 95),
+            'empty': sum(1 for size in sizes if not size)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test a deployed Bedrock Agent with concurrent invoke_agent sessions')
+    parser.add_argument('--agent-id',
+                       help='Agent ID (default: BEDROCK_AGENT_ID from .env.agent)')
+    parser.add_argument('--alias-id',
+                       help='Agent alias ID (default: BEDROCK_AGENT_ALIAS_ID from .env.agent)')
+    parser.add_argument('--region',
+                       help='AWS region (default: BEDROCK_AGENT_REGION from .env.agent or us-west-2)')
+    parser.add_argument('--profile',
+                       help='AWS profile name')
+    parser.add_argument('--endpoint-url',
+                       help='Send requests to this bedrock-agent-runtime endpoint instead of the regional one')
+    parser.add_argument('--corpus',
+                       help='Query file: JSON list or one query per line (default: built-in sample queries)')
+    parser.add_argument('--requests', type=int, default=100,
+                       help='Total invoke_agent sessions to run')
+    parser.add_argument('--concurrency', type=int, default=8,
+                       help='Maximum sessions in flight at once')
+    parser.add_argument('--rate', type=float, default=2.0,
+                       help='Target session starts per second (0 starts everything immediately)')
+    parser.add_argument('--no-stream', action='store_true',
+                       help='Do not stream the final response; the first chunk then arrives with the whole answer')
+    parser.add_argument('--timeout', type=int, default=120,
+                       help='Read timeout per session in seconds')
+    parser.add_argument('--fake', action='store_true',
+                       help='Run against an in-process fake agent runtime instead of AWS')
+    parser.add_argument('--fake-first-chunk', type=float, default=1.5,
+                       help='Fake runtime time to first chunk in seconds')
+    parser.add_argument('--fake-chunk-interval', type=float, default=0.05,
+                       help='Fake runtime delay between chunks in seconds')
+    parser.add_argument('--fake-concurrency-limit', type=int,
+                       help='Fake runtime throttles sessions beyond this many in flight')
+    parser.add_argument('--output',
+                       help='Write results as JSON to this file')
+
+    args = parser.parse_args()
+
+    env = load_agent_env()
+    agent_id = args.agent_id or env.get('BEDROCK_AGENT_ID') or ('FAKEAGENT' if args.fake else None)
+    alias_id = args.alias_id or env.get('BEDROCK_AGENT_ALIAS_ID') or ('FAKEALIAS' if args.fake else None)
+    args.region = args.region or env.get('BEDROCK_AGENT_REGION', 'us-west-2')
+    if not agent_id or not alias_id:
+        print("❌ Agent ID and alias ID are required (deploy the agent first or pass --agent-id/--alias-id)")
+        sys.exit(1)
+
+    corpus = load_corpus(args.corpus)
+    runtime = build_runtime(args)
+    target = 'fake runtime' if args.fake else f"agent {agent_id} alias {alias_id} ({args.region})"
+    print(f"🚀 {args.requests} sessions against {target}: concurrency {args.concurrency}, "
+          f"rate {args.rate or 'unlimited'}/s, {len(corpus)} queries, "
+          f"{'buffered' if args.no_stream else 'streamed'} final response")
+
+    samples, elapsed = run_load(runtime, agent_id, alias_id, corpus, args.requests, args.concurrency, args.rate,
+                                stream=not args.no_stream)
+    results = report(samples, elapsed)
+
+    print(f"\n📊 Results ({elapsed:.1f}s, {results['achieved_rps']} sessions/s):")
+    print(f"   First chunk  {format_summary(results['first_chunk'])}")
+    print(f"   Total        {format_summary(results['total'])}")
+    print(f"   Queue delay  {format_summary(results['queue_delay'])}")
+    print(f"   Bytes        mean={results['bytes']['mean']} p50={results['bytes']['p50']:.0f} "
+          f"p95={results['bytes']['p95']:.0f} empty={results['bytes']['empty']}")
+    if results['errors']:
+        print(f"   ⚠️ Errors     {results['error_rate']:.1%}: "
+              + ', '.join(f"{code}={count}" for code, count in sorted(results['errors'].items())))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'config': {k: v for k, v in vars(args).items() if k not in ('output', 'profile')},
+                'results': results
+            }, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+"""
+In-memory DynamoDB stand-in
+Implements the subset of the boto3 Table API used by the course search Lambda
+(scan with pagination and parallel segments, get_item, put_item, update_item, batch_writer)
+and the client-level batch_write_item used by the seed loader,
+with simulated per-request latency, so benchmarks run without an AWS account.
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+from decimal import Decimal
+
+# DynamoDB stops a scan page after reading 1 MB, before any filter is applied
+SCAN_PAGE_BYTES = 1024 * 1024
+
+
+def _item_size(item):
+    return len(json.dumps(item, default=str))
+
+
+def _evaluate(condition, item):
+    """Evaluate a boto3.dynamodb.conditions expression against a plain item"""
+    kind = type(condition).__name__
+    values = condition.get_expression()['values']
+
+    if kind == 'And':
+        return _evaluate(values[0], item) and _evaluate(values[1], item)
+    if kind == 'Or':
+        return _evaluate(values[0], item) or _evaluate(values[1], item)
+    if kind == 'Not':
+        return not _evaluate(values[0], item)
+    if kind == 'AttributeExists':
+        return values[0].name in item
+    if kind == 'AttributeNotExists':
+        return values[0].name not in item
+
+    name, expected = values[0].name, values[1]
+    if name not in item:
+        # Comparisons against a missing attribute are false in DynamoDB, including <>
+        return False
+    actual = item[name]
+    if kind == 'Equals':
+        return actual == expected
+    if kind == 'NotEquals':
+        return actual != expected
+    if kind == 'LessThan':
+        return actual < expected
+    if kind == 'LessThanEquals':
+        return actual <= expected
+    if kind == 'GreaterThan':
+        return actual > expected
+    if kind == 'GreaterThanEquals':
+        return actual >= expected
+    if kind == 'BeginsWith':
+        return str(actual).startswith(expected)
+    raise NotImplementedError(f"Condition {kind} is not supported by the local stand-in")
+
+
+def _project(item, projection, names):
+    if not projection:
+        return dict(item)
+    attributes = [names.get(token.strip(), token.strip()) for token in projection.split(',')]
+    return {name: item[name] for name in attributes if name in item}
+
+
+def _normalize(value):
+    """Store numbers as Decimal like the boto3 resource layer does"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class LocalTable:
+    def __init__(self, name, key='id', request_latency=0.005, latency_per_mb=0.05, page_bytes=SCAN_PAGE_BYTES):
+        """Create an empty table keyed on a single string hash key"""
+        self.name = name
+        self.table_name = name
+        self.key = key
+        self.request_latency = request_latency
+        self.latency_per_mb = latency_per_mb
+        self.page_bytes = page_bytes
+        self.request_count = 0
+        self.read_bytes = 0
+        self._items = {}
+        self._sizes = {}
+        self._segments = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _sleep(self, size):
+        time.sleep(self.request_latency + self.latency_per_mb * size / (1024 * 1024))
+
+    def _record(self, size):
+        with self._lock:
+            self.request_count += 1
+            self.read_bytes += size
+
+    def _segment_keys(self, total_segments):
+        """Keys per segment with their positions, hashed the way parallel scan splits the key space"""
+        with self._lock:
+            if total_segments not in self._segments:
+                buckets = [[] for _ in range(total_segments)]
+                for key in self._items:
+                    buckets[zlib.crc32(str(key).encode('utf-8')) % total_segments].append(key)
+                self._segments[total_segments] = [
+                    (keys, {key: position for position, key in enumerate(keys)}) for keys in buckets
+                ]
+            return self._segments[total_segments]
+
+    def put_item(self, Item, **kwargs):
+        item = _normalize(Item)
+        key = str(item[self.key])
+        with self._lock:
+            self._items[key] = item
+            self._sizes[key] = _item_size(item)
+            self._segments.clear()
+        self._record(0)
+        return {}
+
+    def delete_item(self, Key, **kwargs):
+        with self._lock:
+            self._items.pop(str(Key[self.key]), None)
+            self._sizes.pop(str(Key[self.key]), None)
+            self._segments.clear()
+        self._record(0)
+        return {}
+
+    def get_item(self, Key, ProjectionExpression=None, ExpressionAttributeNames=None, **kwargs):
+        item = self._items.get(str(Key[self.key]))
+        size = self._sizes.get(str(Key[self.key]), 0)
+        self._sleep(size)
+        self._record(size)
+        if item is None:
+            return {}
+        return {'Item': _project(item, ProjectionExpression, ExpressionAttributeNames or {})}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues=None, **kwargs):
+        """Supports the `ADD attr :value` and `SET attr = :value` forms used by the Lambda code"""
+        values = _normalize(ExpressionAttributeValues or {})
+        action, attribute, *rest = UpdateExpression.replace('=', ' ').split()
+        placeholder = rest[-1]
+
+        with self._lock:
+            item = self._items.setdefault(str(Key[self.key]), dict(_normalize(Key)))
+            if action.upper() == 'ADD':
+                item[attribute] = item.get(attribute, Decimal(0)) + values[placeholder]
+            elif action.upper() == 'SET':
+                item[attribute] = values[placeholder]
+            else:
+                raise NotImplementedError(f"Update action {action} is not supported by the local stand-in")
+            self._sizes[str(Key[self.key])] = _item_size(item)
+            self._segments.clear()
+            attributes = {attribute: item[attribute]}
+
+        self._record(0)
+        return {'Attributes': attributes}
+
+    def scan(self, FilterExpression=None, ProjectionExpression=None, ExpressionAttributeNames=None,
+             Segment=None, TotalSegments=None, ExclusiveStartKey=None, Limit=None, **kwargs):
+        if Segment is not None:
+            keys, positions = self._segment_keys(TotalSegments)[Segment]
+        else:
+            keys, positions = self._segment_keys(1)[0]
+
+        start = 0
+        if ExclusiveStartKey is not None:
+            start = positions[str(ExclusiveStartKey[self.key])] + 1
+
+        page, size, position = [], 0, start
+        while position < len(keys):
+            key = keys[position]
+            item = self._items.get(key)
+            position += 1
+            if item is None:
+                continue
+            size += self._sizes[key]
+            if FilterExpression is None or _evaluate(FilterExpression, item):
+                page.append(_project(item, ProjectionExpression, ExpressionAttributeNames or {}))
+            if size >= self.page_bytes or (Limit and position - start >= Limit):
+                break
+
+        self._sleep(size)
+        self._record(size)
+
+        response = {'Items': page, 'Count': len(page), 'ScannedCount': position - start}
+        if position < len(keys):
+            response['LastEvaluatedKey'] = {self.key: keys[position - 1]}
+        return response
+
+    def batch_writer(self, **kwargs):
+        return _BatchWriter(self)
+
+
+class _BatchWriter:
+    def __init__(self, table):
+        self.table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def put_item(self, Item):
+        self.table.put_item(Item=Item)
+
+    def delete_item(self, Key):
+        self.table.delete_item(Key=Key)
+
+
+class LocalDynamoDB:
+    def __init__(self, **table_options):
+        """Stand-in for boto3.resource('dynamodb'); tables are created on first use"""
+        self.table_options = table_options
+        self.tables = {}
+
+    def Table(self, name):
+        if name not in self.tables:
+            self.tables[name] = LocalTable(name, **self.table_options)
+        return self.tables[name]
+
+
+class LocalDynamoDBClient:
+    def __init__(self, resource, request_latency=0.01, unprocessed_ratio=0.0, seed=None):
+        """Stand-in for boto3.client('dynamodb') writing into a LocalDynamoDB resource"""
+        from boto3.dynamodb.types import TypeDeserializer
+
+        self.resource = resource
+        self.request_latency = request_latency
+        self.unprocessed_ratio = unprocessed_ratio
+        self.request_count = 0
+        self._deserializer = TypeDeserializer()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        """Apply put requests; a share of them comes back unprocessed to mimic throttling"""
+        time.sleep(self.request_latency)
+        unprocessed = {}
+        for table_name, requests in RequestItems.items():
+            table = self.resource.Table(table_name)
+            for request in requests:
+                with self._lock:
+                    throttled = self._rng.random() < self.unprocessed_ratio
+                if throttled:
+                    unprocessed.setdefault(table_name, []).append(request)
+                    continue
+                item = {k: self._deserializer.deserialize(v) for k, v in request['PutRequest']['Item'].items()}
+                table.put_item(Item=item)
+        with self._lock:
+            self.request_count += 1
+        return {'UnprocessedItems': unprocessed}
+
+    def list_tables(self, **kwargs):
+        return {'TableNames': sorted(self.resource.tables)}
@@ -0,0 +1,33 @@
+"""
+Latency statistics shared by the benchmark scripts
+"""
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values):
+    """Count, mean and p50/p95/p99 in milliseconds for a list of durations in seconds"""
+    if not values:
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    return {
+        'count': len(values),
+        'mean_ms': round(1000 * sum(values) / len(values), 3),
+        'p50_ms': round(1000 * percentile(values, 50), 3),
+        'p95_ms': round(1000 * percentile(values, 95), 3),
+        'p99_ms': round(1000 * percentile(values, 99), 3),
+        'max_ms': round(1000 * max(values), 3)
+    }
+
+
+def format_summary(summary):
+    return (f"n={summary['count']} mean={summary['mean_ms']:.1f}ms p50={summary['p50_ms']:.1f}ms "
+            f"p95={summary['p95_ms']:.1f}ms p99={summary['p99_ms']:.1f}ms")
@@ -0,0 +1,202 @@
+"""
+Batch course search
+Runs many queries against one catalog load: identical queries are searched once, all of them are
+ranked in a single index pass, and only the ones that need the model go through a bounded,
+rate-limited thread pool. Results are yielded as each query finishes; with a deadline, queries that
+cannot finish in time are left unanswered instead of running past it.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from result_cache import normalize_query
+from structured_log import get_logger
+
+logger = get_logger('course_search.batch')
+
+
+def parse_queries(value):
+    """Action group `queries` value: a JSON array of strings (or {"id", "query"} objects) or one query per line"""
+    if isinstance(value, list):
+        items = value
+    else:
+        text = str(value or '').strip()
+        try:
+            items = json.loads(text) if text.startswith('[') else text.splitlines()
+        except ValueError:
+            items = text.splitlines()
+
+    queries = []
+    for position, item in enumerate(items):
+        if isinstance(item, dict):
+            query, query_id = str(item.get('query', '')), item.get('id', position)
+        else:
+            query, query_id = str(item), position
+        if query.strip():
+            queries.append({'id': query_id, 'query': query.strip()})
+    return queries
+
+
+def group_duplicates(queries):
+    """Normalized query -> entries asking it, in first-seen order"""
+    groups = {}
+    for entry in queries:
+        groups.setdefault(normalize_query(entry['query']), []).append(entry)
+    return groups
+
+
+class RateLimiter:
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        """Token bucket shared by worker threads; `rate` calls per second (0 disables limiting)"""
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call may start; returns the seconds spent waiting"""
+        if not self.rate:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+
+class BatchSearch:
+    def __init__(self, index, select, router=None, cache=None, catalog_version=None, candidate_limit=10,
+                 fallback_limit=50, concurrency=4, rate=5.0, log=None):
+        """`select(query, candidates)` re-ranks with the model and returns 1-based candidate numbers"""
+        self.index = index
+        self.select = select
+        self.router = router
+        self.cache = cache
+        self.catalog_version = catalog_version
+        self.candidate_limit = candidate_limit
+        self.fallback_limit = fallback_limit
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate, burst=concurrency)
+        self.log = log or logger
+        self.stats = {'queries': 0, 'unique': 0, 'cached': 0, 'fast_path': 0, 'model_calls': 0, 'errors': 0,
+                      'unanswered': 0, 'rate_wait_seconds': 0.0}
+        self.unanswered = []
+        self._expired = False
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _model_search(self, query, candidates, build_result):
+        self._count('rate_wait_seconds', self.limiter.acquire())
+        if self._expired:
+            # Waited on the rate limit past the deadline; the caller has already answered without this query
+            raise RuntimeError('Batch deadline reached')
+        self._count('model_calls')
+        result = build_result(query, candidates, self.select(query, candidates))
+        result['route'] = 'llm'
+        return result
+
+    def _time_left(self, seconds_left, reserve_seconds):
+        return None if seconds_left is None else seconds_left() - reserve_seconds
+
+    def _give_up(self, groups):
+        for entries in groups:
+            self.unanswered.extend(entries)
+            self._count('unanswered', len(entries))
+
+    def run(self, queries, build_result, seconds_left=None, reserve_seconds=0.0):
+        """Yield (entries, result) per distinct query as soon as it is answered
+
+        `seconds_left()` is the time remaining before the caller must respond; no model call starts and
+        no result is awaited within `reserve_seconds` of it, and the queries left over end up in `unanswered`
+        """
+        groups = group_duplicates(queries)
+        self.stats['queries'] += len(queries)
+        self.stats['unique'] += len(groups)
+        if self.router is not None:
+            self.router.refresh(self.catalog_version, self.index.items())
+
+        pending = []
+        for key, entries in groups.items():
+            query = entries[0]['query']
+            body = self.cache.get(query, self.catalog_version) if self.cache is not None else None
+            if body is not None:
+                self._count('cached')
+                yield entries, json.loads(body)
+                continue
+            route = self.router.route(query, self.index) if self.router is not None else None
+            if route and route['path'] == 'fast_path':
+                self._count('fast_path')
+                result = build_result(query, route['courses'], range(1, len(route['courses']) + 1))
+                result['route'] = 'fast_path'
+                self._store(query, result)
+                yield entries, result
+                continue
+            pending.append(entries)
+
+        # One ranking pass for every query that still needs the model
+        ranked = self.index.search_many([entries[0]['query'] for entries in pending], limit=self.candidate_limit)
+        fallback = None
+        executor = ThreadPoolExecutor(max_workers=max(1, self.concurrency))
+        futures = {}
+        queue = deque(zip(pending, ranked))
+        try:
+            while queue or futures:
+                time_left = self._time_left(seconds_left, reserve_seconds)
+                if time_left is not None and time_left <= 0:
+                    break
+                # Only `concurrency` calls are submitted at a time; results are yielded as they finish
+                while queue and len(futures) < self.concurrency:
+                    entries, candidates = queue.popleft()
+                    if not candidates:
+                        fallback = fallback if fallback is not None else self.index.items(limit=self.fallback_limit)
+                        candidates = fallback
+                    future = executor.submit(self._model_search, entries[0]['query'], candidates, build_result)
+                    futures[future] = entries
+                done, _ = wait(futures, timeout=time_left, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entries = futures.pop(future)
+                    query = entries[0]['query']
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self._count('errors')
+                        self.log.warning("⚠️ Batch query failed", query=query, error=str(e))
+                        yield entries, {'error': str(e)}
+                        continue
+                    self._store(query, result)
+                    yield entries, result
+        finally:
+            if queue or futures:
+                self._expired = True
+                self.log.warning("⏱️ Batch deadline reached", unanswered=len(queue) + len(futures))
+                self._give_up(list(futures.values()) + [entries for entries, _ in queue])
+                futures.clear()
+                queue.clear()
+            # Calls still in flight are abandoned rather than awaited
+            executor.shutdown(wait=False)
+
+    def _store(self, query, result):
+        if self.cache is not None:
+            self.cache.put(query, self.catalog_version, json.dumps(result, ensure_ascii=False))
+
+
+def result_lines(entries, result):
+    """One JSON Lines record per requested query, duplicates included"""
+    for entry in entries:
+        yield json.dumps({'id': entry['id'], 'query': entry['query'], **result}, ensure_ascii=False, default=str)
@@ -0,0 +1,241 @@
+"""
+Course catalog loading and warm-container caching
+"""
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+from structured_log import get_logger
+
+logger = get_logger('course_search.catalog')
+
+# Key of the version item in the catalog state table
+CATALOG_VERSION_KEY = {'id': 'catalog'}
+
+# Attributes the prompt and the response need; several are DynamoDB reserved words
+CATALOG_PROJECTION = {
+    '#id': 'id',
+    '#name': 'name',
+    '#description': 'description',
+    '#difficulty': 'difficulty',
+    '#url': 'url',
+    '#image': 'image',
+    '#author': 'author',
+    '#updatedAt': 'updatedAt'
+}
+
+
+def iter_active_courses(table, total_segments=1, page_size=None):
+    """Stream active courses from the Class table, following pagination across parallel scan segments"""
+    if total_segments <= 1:
+        for page in _scan_pages(table, None, 1, page_size):
+            yield from page
+        return
+
+    pages = queue.Queue(maxsize=total_segments * 2)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry):
+        # Give up once the consumer has stopped reading, so workers never block forever
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(segment):
+        try:
+            for page in _scan_pages(table, segment, total_segments, page_size):
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(done)
+
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        for segment in range(total_segments):
+            executor.submit(worker, segment)
+
+        try:
+            remaining = total_segments
+            while remaining:
+                page = pages.get()
+                if page is done:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        finally:
+            stop.set()
+
+
+def scan_active_courses(table, total_segments=1, page_size=None):
+    """Read every active course from the Class table"""
+    return list(iter_active_courses(table, total_segments, page_size))
+
+
+def _scan_pages(table, segment, total_segments, page_size):
+    """Yield one list of items per scan page until LastEvaluatedKey runs out"""
+    scan_kwargs = {
+        'FilterExpression': Attr('class_flag').ne(10) & (Attr('class_flag').eq(0) | Attr('class_flag').not_exists()),
+        'ProjectionExpression': ', '.join(CATALOG_PROJECTION),
+        'ExpressionAttributeNames': dict(CATALOG_PROJECTION)
+    }
+    if segment is not None:
+        scan_kwargs['Segment'] = segment
+        scan_kwargs['TotalSegments'] = total_segments
+    if page_size:
+        scan_kwargs['Limit'] = page_size
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        yield response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+class CatalogFingerprint:
+    def __init__(self):
+        """Order-independent digest of course ids and update times, built while items stream past"""
+        self.count = 0
+        self._digest = 0
+
+    def track(self, items):
+        """Pass items through while folding them into the digest"""
+        for item in items:
+            entry = f"{item.get('id', '')}|{item.get('updatedAt', '')}".encode('utf-8')
+            self._digest ^= int.from_bytes(hashlib.sha1(entry).digest()[:8], 'big')
+            self.count += 1
+            yield item
+
+    def hexdigest(self):
+        return f"{self.count:x}-{self._digest:016x}"
+
+
+def make_version_probe(state_table):
+    """Build a probe that reads the catalog version item (a single consistent GetItem)"""
+    def probe():
+        response = state_table.get_item(
+            Key=CATALOG_VERSION_KEY,
+            ProjectionExpression='version',
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        return str(item['version']) if item and 'version' in item else None
+    return probe
+
+
+def bump_catalog_version(state_table):
+    """Increment the catalog version so warm containers reload on their next probe"""
+    response = state_table.update_item(
+        Key=CATALOG_VERSION_KEY,
+        UpdateExpression='ADD version :one',
+        ExpressionAttributeValues={':one': 1},
+        ReturnValues='UPDATED_NEW'
+    )
+    return str(response['Attributes']['version'])
+
+
+class CatalogCache:
+    def __init__(self, loader, index, ttl_seconds=300, max_items=5000, description_chars=500, version_probe=None,
+                 clock=time.monotonic):
+        """Keep `index` synced with the catalog streamed by `loader` for up to `ttl_seconds`, trimming descriptions above `max_items` courses"""
+        self.loader = loader
+        self.index = index
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self.description_chars = description_chars
+        self.version_probe = version_probe
+        self.clock = clock
+        self.version = None
+        self.loaded_at = None
+        self._probed_version = None
+        self.trimmed = False
+
+    def invalidate(self):
+        """Force a reload on the next request"""
+        self.version = None
+        self.loaded_at = None
+        self._probed_version = None
+
+    def _trim(self, items):
+        """Items with descriptions cut to `description_chars`"""
+        for item in items:
+            description = item.get('description')
+            if isinstance(description, str) and len(description) > self.description_chars:
+                item = dict(item, description=description[:self.description_chars])
+            yield item
+
+    def _probe(self):
+        """Read the version item; a failed probe never blocks a request"""
+        if self.version_probe is None:
+            return None
+        try:
+            return self.version_probe()
+        except Exception as e:
+            logger.warning("⚠️ Catalog version probe failed", error=str(e))
+            return None
+
+    def get(self):
+        """Return (version, refreshed) once the index reflects a fresh enough catalog"""
+        probed_version = self._probe()
+
+        if self.loaded_at is not None:
+            expired = self.clock() - self.loaded_at >= self.ttl_seconds
+            changed = probed_version is not None and probed_version != self._probed_version
+            if not expired and not changed:
+                return self.version, False
+            logger.info("♻️ Reloading catalog", reason='version changed' if changed else 'TTL expired')
+
+        # Items stream from the scan straight into the index
+        fingerprint = CatalogFingerprint()
+        items = fingerprint.track(self.loader())
+        changed, removed = self.index.sync(self._trim(items) if self.trimmed else items)
+        if changed or removed:
+            logger.info("🗂️ Index updated", reindexed=changed, removed=removed)
+
+        version = fingerprint.hexdigest()
+        if probed_version is not None:
+            version = f"{probed_version}-{version}"
+
+        oversized = fingerprint.count > self.max_items
+        if oversized and not self.trimmed:
+            # The prompt and the response only use the start of a description, so that is all a large catalog keeps;
+            # later loads trim while streaming, so the courses indexed in full are re-indexed only this once
+            self.index.sync(self._trim(self.index.items()))
+            logger.warning("⚠️ Catalog above max_items; keeping trimmed descriptions",
+                           items=fingerprint.count, max_items=self.max_items, description_chars=self.description_chars)
+        elif self.trimmed and not oversized:
+            logger.info("🗂️ Catalog back under max_items; full descriptions are kept from the next load",
+                        items=fingerprint.count, max_items=self.max_items)
+        self.trimmed = oversized
+
+        self.version = version
+        self.loaded_at = self.clock()
+        self._probed_version = probed_version
+        return version, True
+
+
+def stream_handler(event, context):
+    """Bump the catalog version when the Class table stream reports changes"""
+    records = event.get('Records', [])
+    if not records:
+        return {'bumped': False}
+
+    dynamodb = boto3.resource('dynamodb', region_name=os.environ.get('AWS_REGION', 'us-west-2'))
+    state_table = dynamodb.Table(os.environ['CATALOG_STATE_TABLE'])
+    version = bump_catalog_version(state_table)
+    logger.info("🔖 Catalog version bumped", version=version, records=len(records))
+    return {'bumped': True, 'version': version}
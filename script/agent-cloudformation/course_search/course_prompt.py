@@ -0,0 +1,132 @@
+"""
+Course selection prompts
+Candidates are listed as one table row each, with a short numeric id and a trimmed, de-duplicated
+description, and fitted to an input token budget; the ids the model returns are mapped back to candidates
+"""
+
+import re
+import unicodedata
+
+from prompt_budget import ASCII_CHARS_PER_TOKEN, estimate_tokens, truncate_to_tokens
+
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+INSTRUCTIONS = """Select up to 3 courses that best match the user's question from the table above, and return only their ids as a JSON array.
+Example: {"selected": [1, 3, 5]}
+
+If no suitable courses are found, return an empty array: {"selected": []}
+
+Return only JSON without any other explanation."""
+
+VERBOSE_INSTRUCTIONS = """Select up to 3 courses that best match the user's question from the above list, and return only the course numbers as a JSON array.
+Example: {"selected": [1, 3, 5]}
+
+If no suitable courses are found, return an empty array: {"selected": []}
+
+Return only JSON without any other explanation."""
+
+
+class CoursePrompt:
+    def __init__(self, text, positions, dropped=0, description_tokens=None):
+        """Prompt text plus the candidate position (0-based) behind each id the model can answer with"""
+        self.text = text
+        self.positions = positions
+        self.dropped = dropped
+        self.description_tokens = description_tokens
+
+    @property
+    def tokens(self):
+        return estimate_tokens(self.text)
+
+    def resolve(self, selected):
+        """1-based candidate numbers for the ids the model chose; unknown and repeated ids are dropped"""
+        numbers = []
+        for short_id in selected:
+            position = self.positions.get(short_id)
+            if position is not None and position + 1 not in numbers:
+                numbers.append(position + 1)
+        return numbers
+
+
+def _key(text):
+    return ' '.join(unicodedata.normalize('NFKC', str(text or '')).lower().split())
+
+
+def _cell(text):
+    # Row and column separators cannot appear inside a cell
+    return ' '.join(str(text or '').replace('|', '/').split())
+
+
+def compact_description(course, max_tokens=None):
+    """Description without whitespace runs, a repeated title or repeated sentences"""
+    description = str(course.get('description') or '')
+    if max_tokens is not None:
+        # Only the start can make it into the prompt; leave room for a title and repeats to be removed
+        description = description[:2 * ASCII_CHARS_PER_TOKEN * max_tokens + len(str(course.get('name') or ''))]
+    description = _cell(description)
+    title = _cell(course.get('name'))
+    if title and _key(description).startswith(_key(title)):
+        description = description[len(title):].lstrip(' :-.,')
+    sentences = []
+    seen = set()
+    for sentence in SENTENCE_PATTERN.split(description):
+        if sentence and _key(sentence) not in seen:
+            seen.add(_key(sentence))
+            sentences.append(sentence)
+    return ' '.join(sentences)
+
+
+def verbose_prompt(query, candidates):
+    """Original prompt: every candidate as a "Course N" block with its full description"""
+    courses_text = "\n\n".join([
+        f"Course {i+1}:\nTitle: {c.get('name', '')}\nDescription: {c.get('description', '')}\nDifficulty: {c.get('difficulty', 'intermediate')}"
+        for i, c in enumerate(candidates)
+    ])
+    text = f"""User question: {query}
+
+Here is the list of available AWS courses:
+
+{courses_text}
+
+{VERBOSE_INSTRUCTIONS}"""
+    return CoursePrompt(text, {number: number - 1 for number in range(1, len(candidates) + 1)})
+
+
+def compact_prompt(query, candidates, budget, description_tokens=40, query_tokens=200):
+    """Candidates as `id|title|level|description` rows, shortened until the prompt fits `budget` tokens"""
+    # Catalogs can hold the same course twice (re-uploads); the model only needs one row for it
+    rows = []
+    seen = set()
+    for position, course in enumerate(candidates):
+        key = _key(course.get('name'))
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append((position, _cell(course.get('name')), _cell(course.get('difficulty') or 'intermediate'),
+                     compact_description(course, description_tokens)))
+
+    head = f"User question: {truncate_to_tokens(_cell(query), query_tokens)}\n\nAWS courses (id|title|level|description):\n"
+    fixed = estimate_tokens(head) + estimate_tokens(INSTRUCTIONS) + 1
+
+    def render(count, allowance):
+        lines = []
+        for short_id, (_, title, level, description) in enumerate(rows[:count], 1):
+            lines.append(f"{short_id}|{title}|{level}|{truncate_to_tokens(description, allowance)}")
+        return lines
+
+    # Shorter descriptions first, then fewer candidates (the lowest ranked go first)
+    count = len(rows)
+    allowance = description_tokens
+    lines = render(count, allowance)
+    while fixed + estimate_tokens('\n'.join(lines)) > budget:
+        if allowance > 0:
+            allowance = allowance // 2 if allowance > 8 else 0
+        elif count > 1:
+            count -= 1
+        else:
+            raise ValueError(f"Prompt budget of {budget} tokens cannot hold a single course")
+        lines = render(count, allowance)
+
+    text = head + '\n'.join(lines) + '\n\n' + INSTRUCTIONS
+    positions = {short_id: rows[short_id - 1][0] for short_id in range(1, count + 1)}
+    return CoursePrompt(text, positions, dropped=len(candidates) - count, description_tokens=allowance)
@@ -0,0 +1,219 @@
+"""
+Fast-path query router
+Recognizes queries that only name AWS services and a difficulty level ("EKS beginner", "Lambda 고급")
+with a Korean/English lexicon built from the catalog, and answers them from the index without Bedrock
+"""
+
+import re
+import unicodedata
+
+from ranking import STOPWORDS, TOKEN_PATTERN
+
+# Canonical service -> English and Korean spellings; only services some course mentions are kept
+SERVICE_ALIASES = {
+    'eks': ['eks', 'elastic kubernetes service', 'kubernetes', 'k8s', '쿠버네티스'],
+    'ecs': ['ecs', 'elastic container service'],
+    'lambda': ['lambda', '람다'],
+    'sagemaker': ['sagemaker', 'sage maker', '세이지메이커'],
+    'bedrock': ['bedrock', '베드락', '베드록'],
+    'dynamodb': ['dynamodb', 'dynamo db', '다이나모db', '다이나모디비'],
+    's3': ['s3'],
+    'cloudfront': ['cloudfront', '클라우드프론트'],
+    'cloudwatch': ['cloudwatch', '클라우드워치'],
+    'step functions': ['step functions', 'stepfunctions', '스텝펑션', '스텝 펑션'],
+    'appsync': ['appsync', '앱싱크'],
+    'amplify': ['amplify', '앰플리파이'],
+    'codepipeline': ['codepipeline', 'code pipeline', '코드파이프라인'],
+    'vpc lattice': ['vpc lattice', 'lattice'],
+    'vpc': ['vpc'],
+    'aurora': ['aurora', '오로라'],
+    'proton': ['proton'],
+    'dms': ['dms', 'database migration service'],
+    'sct': ['sct', 'schema conversion tool']
+}
+
+DIFFICULTY_ALIASES = {
+    'beginner': ['beginner', 'beginners', 'basic', 'basics', 'intro', 'introduction', 'introductory',
+                 'getting started', 'fundamentals', '입문', '기초', '초급', '초보', '처음'],
+    'intermediate': ['intermediate', '중급'],
+    'advanced': ['advanced', 'expert', 'deep dive', 'deepdive', '고급', '심화', '상급']
+}
+
+# Words that carry no search intent beyond the service and level
+FILLER_WORDS = {
+    'please', 'show', 'find', 'give', 'some', 'any', 'level', 'lecture', 'lectures', 'tutorial', 'tutorials',
+    'learn', 'learning', 'study', 'good', 'best', 'top', 'something', 'what', 'which', 'can', 'you', 'my',
+    '좀', '찾아줘', '찾아주세요', '보여줘', '있어', '있나요', '있을까', '듣고', '싶어', '싶어요', '공부', '배우고',
+    '수업', '과정', '레벨', '난이도', '용', '자', '위한', '추천해', '해줘', '주세요'
+}
+
+# Korean particles that stick to the word before them ("람다를", "EKS 입문용으로")
+PARTICLES = ('으로', '에서', '에게', '부터', '까지', '처럼', '이랑', '하고', '를', '을', '은', '는', '이', '가',
+             '에', '의', '로', '도', '만', '랑', '와', '과', '용')
+
+# Title cues used when a course has no difficulty attribute
+TITLE_LEVEL_CUES = {
+    'beginner': ('introduction', 'introducing', 'getting started', 'overview', 'basics', 'fundamentals', 'workshop', '101'),
+    'advanced': ('deep dive', 'advanced', 'best practices', 'optimization', 'optimizing')
+}
+
+# Catalog service names written as "Amazon X" / "AWS X" with an acronym or CamelCase product name
+CATALOG_SERVICE_PATTERN = re.compile(r'\b(?:Amazon|AWS)\s+([A-Z]{2,}[A-Za-z0-9]*|[A-Z][a-z]+[A-Z][A-Za-z0-9]*)')
+
+LLM_PATH = 'llm'
+FAST_PATH = 'fast_path'
+
+
+def normalize(text):
+    return unicodedata.normalize('NFKC', str(text or '')).lower()
+
+
+def terms(text):
+    return TOKEN_PATTERN.findall(normalize(text))
+
+
+def strip_particles(term, depth=2):
+    """Stems of a Korean term with up to `depth` trailing particles removed ("입문용으로" -> "입문용", "입문")"""
+    stems = []
+    current = [term]
+    for _ in range(depth):
+        current = [word[:-len(particle)] for word in current for particle in PARTICLES
+                   if word.endswith(particle) and len(word) > len(particle)]
+        stems.extend(current)
+    return stems
+
+
+def course_level(course):
+    """Stored difficulty, or one inferred from the title when the course has none"""
+    difficulty = str(course.get('difficulty') or '').lower()
+    if difficulty in DIFFICULTY_ALIASES:
+        return difficulty
+    name = normalize(course.get('name'))
+    for level, cues in TITLE_LEVEL_CUES.items():
+        if any(cue in name for cue in cues):
+            return level
+    return 'intermediate'
+
+
+class QueryLexicon:
+    def __init__(self):
+        """Phrase (tuple of terms) -> ('service' | 'difficulty', canonical value)"""
+        self.phrases = {}
+        self.longest = 1
+        self.service_courses = {}
+
+    def add(self, phrase, kind, value):
+        key = tuple(terms(phrase))
+        if key and key not in self.phrases:
+            self.phrases[key] = (kind, value)
+            self.longest = max(self.longest, len(key))
+
+    @classmethod
+    def build(cls, courses):
+        """Keep the services the catalog actually covers, plus product names found in course titles"""
+        lexicon = cls()
+        aliases = {service: list(spellings) for service, spellings in SERVICE_ALIASES.items()}
+        for course in courses:
+            for name in CATALOG_SERVICE_PATTERN.findall(str(course.get('name', ''))):
+                key = normalize(name)
+                if not any(key in spellings for spellings in aliases.values()):
+                    aliases[key] = [key]
+
+        for course in courses:
+            text = f" {' '.join(terms(course.get('name')))} {' '.join(terms(course.get('description')))} "
+            for service, spellings in aliases.items():
+                if any(f" {' '.join(terms(spelling))} " in text for spelling in spellings):
+                    lexicon.service_courses.setdefault(service, []).append(course)
+
+        for service in lexicon.service_courses:
+            for spelling in aliases[service]:
+                lexicon.add(spelling, 'service', service)
+        for level, spellings in DIFFICULTY_ALIASES.items():
+            for spelling in spellings:
+                lexicon.add(spelling, 'difficulty', level)
+        return lexicon
+
+    def _lookup(self, tokens, start):
+        """Longest phrase starting at `start`; the last term may carry a Korean particle"""
+        for length in range(min(self.longest, len(tokens) - start), 0, -1):
+            phrase = tuple(tokens[start:start + length])
+            if phrase in self.phrases:
+                return self.phrases[phrase], length
+            for stem in strip_particles(phrase[-1]):
+                if phrase[:-1] + (stem,) in self.phrases:
+                    return self.phrases[phrase[:-1] + (stem,)], length
+        return None, 1
+
+    def parse(self, query):
+        """Services, difficulty and leftover terms of a query"""
+        tokens = terms(query)
+        services, difficulties, leftover = [], [], []
+        position = 0
+        while position < len(tokens):
+            match, length = self._lookup(tokens, position)
+            if match:
+                kind, value = match
+                target = services if kind == 'service' else difficulties
+                if value not in target:
+                    target.append(value)
+            else:
+                token = tokens[position]
+                words = [token] + strip_particles(token)
+                if token not in PARTICLES and not any(word in STOPWORDS or word in FILLER_WORDS for word in words):
+                    leftover.append(token)
+            position += length
+        return services, difficulties, leftover
+
+
+class FastPathRouter:
+    def __init__(self, max_courses=3):
+        """Route plain service/difficulty queries to the index; rebuilds its lexicon when the catalog changes"""
+        self.max_courses = max_courses
+        self.catalog_version = None
+        self.lexicon = QueryLexicon()
+
+    def refresh(self, catalog_version, courses):
+        """Rebuild the lexicon for a new catalog version; returns True when it was rebuilt"""
+        if catalog_version == self.catalog_version:
+            return False
+        self.lexicon = QueryLexicon.build(list(courses))
+        self.catalog_version = catalog_version
+        return True
+
+    def route(self, query, index):
+        """{'path', 'reason', 'services', 'difficulty', 'courses'}; courses are only filled on the fast path"""
+        services, difficulties, leftover = self.lexicon.parse(query)
+        decision = {'path': LLM_PATH, 'services': services, 'difficulty': difficulties[0] if difficulties else None,
+                    'courses': []}
+
+        if not services:
+            decision['reason'] = 'no known service'
+            return decision
+        if leftover:
+            decision['reason'] = f"unrecognized terms: {' '.join(leftover[:5])}"
+            return decision
+        if len(difficulties) > 1:
+            decision['reason'] = 'conflicting difficulty levels'
+            return decision
+
+        # Courses covering every named service, in BM25 order for the query
+        matching = None
+        for service in services:
+            ids = {str(course.get('id', '')) for course in self.lexicon.service_courses.get(service, [])}
+            matching = ids if matching is None else matching & ids
+        if not matching:
+            decision['reason'] = 'no course covers all named services'
+            return decision
+
+        ranked = [course for course in index.search(query, limit=len(index)) if str(course.get('id', '')) in matching]
+        ranked_ids = {str(course.get('id', '')) for course in ranked}
+        ranked += [course for course in index.items() if str(course.get('id', '')) in matching - ranked_ids]
+        if decision['difficulty']:
+            # Stable sort: requested level first, BM25 order within each group
+            ranked.sort(key=lambda course: course_level(course) != decision['difficulty'])
+            if course_level(ranked[0]) != decision['difficulty']:
+                decision['reason'] = f"no {decision['difficulty']} course for {', '.join(services)}"
+                return decision
+
+        decision.update(path=FAST_PATH, reason='services and difficulty only', courses=ranked[:self.max_courses])
+        return decision
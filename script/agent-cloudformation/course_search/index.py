@@ -0,0 +1,467 @@
+import json
+import os
+import time
+import boto3
+
+from batch import BatchSearch, parse_queries, result_lines
+from catalog import CatalogCache, iter_active_courses, make_version_probe
+from course_prompt import compact_prompt, verbose_prompt
+from fast_path import FAST_PATH, LLM_PATH, FastPathRouter
+from prompt_budget import input_budget
+from ranking import CourseIndex
+from result_cache import QueryResultCache
+from selection import SelectionParser, parse_selection
+from structured_log import get_logger
+from tracing import StageTimer
+
+REGION = os.environ.get('AWS_REGION', 'us-west-2')
+
+# Number of ranked candidates handed to the model for re-ranking
+CANDIDATE_LIMIT = int(os.environ.get('CANDIDATE_LIMIT', '10'))
+
+# Catalog slice sent to the model when the query shares no terms with any course
+FALLBACK_LIMIT = int(os.environ.get('FALLBACK_LIMIT', '50'))
+
+# Stream the model answer and stop reading as soon as the selection object is complete
+MODEL_STREAMING = os.environ.get('MODEL_STREAMING', 'true').lower() == 'true'
+
+# Answer queries that only name services and a difficulty straight from the index
+FAST_PATH_ENABLED = os.environ.get('FAST_PATH', 'true').lower() == 'true'
+
+# Batch operation: most queries per request, concurrent model calls and model calls per second
+BATCH_MAX_QUERIES = int(os.environ.get('BATCH_MAX_QUERIES', '50'))
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', '4'))
+BATCH_RATE = float(os.environ.get('BATCH_RATE', '5'))
+
+# Time kept free before the Lambda timeout to build and return a partial batch response
+BATCH_DEADLINE_MARGIN_SECONDS = float(os.environ.get('BATCH_DEADLINE_MARGIN_SECONDS', '3'))
+
+MODEL_ID = 'us.amazon.nova-pro-v1:0'
+
+MAX_OUTPUT_TOKENS = 500
+
+# Candidates are sent as compact table rows fitted to this many input tokens ('verbose' restores the full blocks)
+PROMPT_FORMAT = os.environ.get('PROMPT_FORMAT', 'compact').lower()
+PROMPT_TOKEN_BUDGET = input_budget(MODEL_ID, int(os.environ.get('PROMPT_TOKEN_BUDGET', '1500')), MAX_OUTPUT_TOKENS)
+PROMPT_DESCRIPTION_TOKENS = int(os.environ.get('PROMPT_DESCRIPTION_TOKENS', '40'))
+
+# CloudWatch namespace for the per-stage EMF metrics printed by each search
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'CourseSearch')
+
+logger = get_logger('course_search')
+
+# Clients are created once per container and reused by warm invocations
+dynamodb = boto3.resource('dynamodb', region_name=REGION)
+bedrock = boto3.client('bedrock-runtime', region_name=REGION)
+
+# Survives across warm invocations; only changed courses are re-indexed
+course_index = CourseIndex()
+
+catalog_cache = CatalogCache(
+    loader=lambda: iter_active_courses(
+        dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME']),
+        total_segments=int(os.environ.get('SCAN_SEGMENTS', '4'))
+    ),
+    index=course_index,
+    ttl_seconds=int(os.environ.get('CATALOG_TTL_SECONDS', '300')),
+    max_items=int(os.environ.get('CATALOG_MAX_ITEMS', '5000')),
+    description_chars=int(os.environ.get('CATALOG_DESCRIPTION_CHARS', '500')),
+    version_probe=make_version_probe(dynamodb.Table(os.environ['CATALOG_STATE_TABLE'])) if os.environ.get('CATALOG_STATE_TABLE') else None
+)
+
+# Answers to repeated queries skip Bedrock until the catalog version changes
+result_cache = QueryResultCache(
+    max_entries=int(os.environ.get('RESULT_CACHE_SIZE', '256')),
+    ttl_seconds=int(os.environ.get('RESULT_CACHE_TTL_SECONDS', '3600')),
+    shared_table=dynamodb.Table(os.environ['RESULT_CACHE_TABLE']) if os.environ.get('RESULT_CACHE_TABLE') else None
+)
+
+# Lexicon of catalog service names, rebuilt when the catalog version changes
+fast_path_router = FastPathRouter(max_courses=int(os.environ.get('FAST_PATH_MAX_COURSES', '3')))
+
+def lambda_handler(event, context):
+    """
+    Semantic video search using Bedrock
+    """
+
+    log = logger.bind(request_id=getattr(context, 'aws_request_id', None))
+    # Full event and response bodies are only serialized for a sampled share of invocations
+    sampled = log.sample()
+    log.payload("📥 Received event", event, sampled=sampled)
+
+    try:
+        api_path = event.get('apiPath', '')
+        http_method = event.get('httpMethod', '')
+        request_body = event.get('requestBody', {})
+
+        log.info("🔍 Action group request", api_path=api_path, method=http_method)
+
+        if api_path == '/search_classes' and http_method == 'POST':
+            content = request_body.get('content', {})
+            app_json = content.get('application/json', {})
+            properties = app_json.get('properties', [])
+
+            query = ''
+            for prop in properties:
+                if prop.get('name') == 'query':
+                    query = prop.get('value', '')
+                    break
+
+            log.info("🔎 User query", query=query)
+            result = search_with_bedrock(dynamodb, bedrock, query, log=log)
+
+        elif api_path == '/search_classes_batch' and http_method == 'POST':
+            content = request_body.get('content', {})
+            properties = content.get('application/json', {}).get('properties', [])
+            value = next((prop.get('value') for prop in properties if prop.get('name') == 'queries'), '')
+            queries = parse_queries(value)
+
+            log.info("🔎 Batch queries", queries=len(queries))
+            if len(queries) > BATCH_MAX_QUERIES:
+                result = {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': f'At most {BATCH_MAX_QUERIES} queries per request'})
+                }
+            else:
+                result = search_batch_with_bedrock(dynamodb, bedrock, queries, log=log, context=context)
+
+        else:
+            result = {
+                'statusCode': 400,
+                'body': json.dumps({'error': 'Unknown endpoint'})
+            }
+
+        response = {
+            'messageVersion': '1.0',
+            'response': {
+                'actionGroup': event.get('actionGroup', 'ClassSearchActions'),
+                'apiPath': api_path,
+                'httpMethod': http_method,
+                'httpStatusCode': result.get('statusCode', 200),
+                'responseBody': {
+                    'application/json': {
+                        'body': result.get('body', '{}')
+                    }
+                }
+            }
+        }
+
+        log.payload("📤 Return response", response, sampled=sampled)
+        log.info("📤 Response", status=response['response']['httpStatusCode'])
+        return response
+
+    except Exception as e:
+        log.exception("❌ Error occurred", error=str(e))
+
+        return {
+            'messageVersion': '1.0',
+            'response': {
+                'actionGroup': event.get('actionGroup', ''),
+                'apiPath': event.get('apiPath', ''),
+                'httpMethod': event.get('httpMethod', ''),
+                'httpStatusCode': 500,
+                'responseBody': {
+                    'application/json': {
+                        'body': {'error': str(e)}
+                    }
+                }
+            }
+        }
+
+def rank_candidates(query):
+    """Pre-rank the catalog locally so the model only sees a short candidate list"""
+    candidates = course_index.search(query, limit=CANDIDATE_LIMIT)
+    if not candidates:
+        candidates = course_index.items(limit=FALLBACK_LIMIT)
+    return candidates
+
+def build_prompt(query, candidates):
+    """Bedrock Nova Pro prompt listing the candidates; `resolve` maps the ids it answers with back to them"""
+    if PROMPT_FORMAT == 'verbose':
+        return verbose_prompt(query, candidates)
+    return compact_prompt(query, candidates, PROMPT_TOKEN_BUDGET, description_tokens=PROMPT_DESCRIPTION_TOKENS)
+
+def model_request(prompt):
+    """Nova Pro request body for the selection prompt"""
+    return json.dumps({
+        "messages": [
+            {
+                "role": "user",
+                "content": [{"text": prompt}]
+            }
+        ],
+        "inferenceConfig": {
+            "max_new_tokens": MAX_OUTPUT_TOKENS,
+            "temperature": 0.3
+        }
+    })
+
+def invoke_model(bedrock, prompt):
+    """Call Bedrock Nova Pro and return the text of its answer with the token usage"""
+    bedrock_response = bedrock.invoke_model(
+        modelId=MODEL_ID,
+        body=model_request(prompt)
+    )
+
+    response_body = json.loads(bedrock_response['body'].read())
+    return response_body['output']['message']['content'][0]['text'], response_body.get('usage', {})
+
+def stream_selection(bedrock, prompt, clock=time.perf_counter):
+    """Stream the answer from Bedrock Nova Pro, closing the stream once the selection is complete"""
+    start = clock()
+    response = bedrock.invoke_model_with_response_stream(
+        modelId=MODEL_ID,
+        body=model_request(prompt)
+    )
+
+    stream = response['body']
+    parser = SelectionParser()
+    usage = {}
+    first_chunk = None
+    try:
+        for event in stream:
+            if 'chunk' not in event:
+                # Every other event in this stream is a modeled error
+                raise RuntimeError(f"Bedrock stream error: {json.dumps(event, default=str)}")
+            payload = json.loads(event['chunk']['bytes'])
+            usage = payload.get('metadata', {}).get('usage', usage)
+            text = payload.get('contentBlockDelta', {}).get('delta', {}).get('text')
+            if text:
+                if first_chunk is None:
+                    first_chunk = clock() - start
+                if parser.feed(text) is not None:
+                    break
+    finally:
+        if hasattr(stream, 'close'):
+            stream.close()
+
+    return {
+        'selected': parser.finish(),
+        'text': parser.text,
+        'usage': usage,
+        'first_chunk_seconds': first_chunk or 0.0,
+        # Stopped before the model finished talking
+        'early_exit': parser.complete and not usage
+    }
+
+def select_with_model(bedrock, query, candidates):
+    """Have the model pick from the candidates; returns the 1-based candidate numbers it chose"""
+    prompt = build_prompt(query, candidates)
+    if MODEL_STREAMING:
+        return prompt.resolve(stream_selection(bedrock, prompt.text)['selected'])
+    text, _ = invoke_model(bedrock, prompt.text)
+    return prompt.resolve(parse_selection(text))
+
+def build_result(query, candidates, selected_indices):
+    """Build the action group response body for the selected courses"""
+    selected_courses = []
+    for idx in selected_indices:
+        if 0 < idx <= len(candidates):
+            course = candidates[idx - 1]
+            selected_courses.append({
+                'title': str(course.get('name', '')),
+                'description': str(course.get('description', ''))[:150] + '...' if len(str(course.get('description', ''))) > 150 else str(course.get('description', '')),
+                'url': str(course.get('url', '')),
+                'thumbnail': str(course.get('image', '')),
+                'author': str(course.get('author', '')),
+                'difficulty': str(course.get('difficulty', 'intermediate'))
+            })
+
+    message = f"Found {len(selected_courses)} courses related to '{query}'." if selected_courses else f"No courses found related to '{query}'."
+
+    return {
+        'courses_found': len(selected_courses),
+        'courses': selected_courses,
+        'message': message
+    }
+
+def build_traces(query, timer, outcome):
+    """Real stage timings and counts for the `traces` array of the response body"""
+    started = timer.traces()
+    return [
+        {'type': 'preprocessing', 'content': f"🔍 Started searching for '{query}'",
+         'timestamp': started[0]['timestamp'] if started else ''}
+    ] + started + [timer.summary_trace(outcome)]
+
+def search_with_bedrock(dynamodb, bedrock, query, timer=None, log=None):
+    """Understand question with Bedrock Nova Pro and search DynamoDB"""
+
+    timer = timer or StageTimer()
+    log = log or logger
+
+    try:
+        # 1. Make sure the index holds a fresh enough copy of the active courses
+        with timer.stage('catalog_load') as counts:
+            catalog_version, refreshed = catalog_cache.get()
+            counts.update(courses=len(course_index), reloaded=refreshed)
+        total_courses = len(course_index)
+        log.info("📊 Catalog ready", courses=total_courses, version=catalog_version, reloaded=refreshed)
+
+        if not total_courses:
+            return {
+                'statusCode': 200,
+                'body': json.dumps({
+                    'courses_found': 0,
+                    'courses': [],
+                    'message': 'No courses registered.'
+                }, ensure_ascii=False)
+            }
+
+        with timer.stage('result_cache') as counts:
+            cached_body = result_cache.get(query, catalog_version)
+            counts['hits'] = int(cached_body is not None)
+        log.info("🧮 Result cache", stats=result_cache.stats)
+        if cached_body is not None:
+            log.info("✅ Search served from result cache")
+            # The cached body carries the timings of the request that filled it
+            result_data = json.loads(cached_body)
+            result_data['traces'] = build_traces(query, timer, '✅ Served from result cache')
+            return {
+                'statusCode': 200,
+                'body': json.dumps(result_data, ensure_ascii=False)
+            }
+
+        # 2. Plain service/difficulty queries skip the model
+        if FAST_PATH_ENABLED:
+            with timer.stage('routing') as counts:
+                rebuilt = fast_path_router.refresh(catalog_version, course_index.items())
+                route = fast_path_router.route(query, course_index)
+                counts.update(fast_path=int(route['path'] == FAST_PATH), services=len(route['services']),
+                              lexicon_rebuilt=int(rebuilt))
+            log.info("🧭 Query routed", path=route['path'], reason=route['reason'],
+                     services=route['services'], difficulty=route['difficulty'])
+            if route['path'] == FAST_PATH:
+                with timer.stage('response_build') as counts:
+                    result_data = build_result(query, route['courses'], range(1, len(route['courses']) + 1))
+                    result_data['route'] = FAST_PATH
+                    counts['courses'] = result_data['courses_found']
+                log.info("✅ Search completed", courses_found=result_data['courses_found'], path=FAST_PATH)
+                result_data['traces'] = build_traces(
+                    query, timer, f"⚡ Answered from the index ({', '.join(route['services'])}"
+                    + (f", {route['difficulty']}" if route['difficulty'] else '') + ")"
+                )
+                result_body = json.dumps(result_data, ensure_ascii=False)
+                result_cache.put(query, catalog_version, result_body)
+                return {
+                    'statusCode': 200,
+                    'body': result_body
+                }
+
+        # 3. Pre-rank the catalog locally
+        with timer.stage('ranking') as counts:
+            candidates = rank_candidates(query)
+            counts.update(candidates=len(candidates), courses=total_courses)
+        log.info("🎯 Candidates ranked", candidates=len(candidates), courses=total_courses)
+
+        # 4. Bedrock Nova Pro prompt
+        with timer.stage('prompt_build') as counts:
+            prompt = build_prompt(query, candidates)
+            counts.update(chars=len(prompt.text), estimated_tokens=prompt.tokens, candidates_dropped=prompt.dropped)
+
+        # 5. Call Bedrock Nova Pro
+        if MODEL_STREAMING:
+            # Parsing happens while chunks arrive, so it is part of the model call
+            with timer.stage('model_call') as counts:
+                streamed = stream_selection(bedrock, prompt.text)
+                selected_indices = prompt.resolve(streamed['selected'])
+                counts.update(
+                    input_tokens=streamed['usage'].get('inputTokens', 0),
+                    output_tokens=streamed['usage'].get('outputTokens', 0),
+                    first_chunk_ms=round(1000 * streamed['first_chunk_seconds'], 3),
+                    early_exit=int(streamed['early_exit']),
+                    selected=len(selected_indices)
+                )
+            log.debug("🤖 Bedrock response", text=streamed['text'])
+        else:
+            with timer.stage('model_call') as counts:
+                bedrock_text, usage = invoke_model(bedrock, prompt.text)
+                counts.update(input_tokens=usage.get('inputTokens', 0), output_tokens=usage.get('outputTokens', 0))
+            log.debug("🤖 Bedrock response", text=bedrock_text)
+
+            # 6. Extract JSON
+            with timer.stage('parse') as counts:
+                selected_indices = prompt.resolve(parse_selection(bedrock_text))
+                counts['selected'] = len(selected_indices)
+
+        # 7. Build selected course information
+        with timer.stage('response_build') as counts:
+            result_data = build_result(query, candidates, selected_indices)
+            result_data['route'] = LLM_PATH
+            counts['courses'] = result_data['courses_found']
+
+        log.info("✅ Search completed", courses_found=result_data['courses_found'], path=LLM_PATH)
+        result_data['traces'] = build_traces(
+            query, timer, f"✅ Completed selection of {result_data['courses_found']} of {len(candidates)} candidates"
+        )
+        result_body = json.dumps(result_data, ensure_ascii=False)
+        result_cache.put(query, catalog_version, result_body)
+
+        return {
+            'statusCode': 200,
+            'body': result_body
+        }
+
+    except Exception as e:
+        log.exception("❌ Search Error", error=str(e))
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Search error: {str(e)}'})
+        }
+
+    finally:
+        timer.emit_metrics(
+            METRICS_NAMESPACE,
+            dimensions={'FunctionName': os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'local')}
+        )
+
+def run_batch(bedrock, queries, log=None, concurrency=BATCH_CONCURRENCY, rate=BATCH_RATE, seconds_left=None):
+    """Load the catalog once and yield (entries, result) for each distinct query as it completes"""
+    log = log or logger
+    catalog_version, refreshed = catalog_cache.get()
+    log.info("📊 Catalog ready", courses=len(course_index), version=catalog_version, reloaded=refreshed)
+    search = BatchSearch(
+        course_index,
+        select=lambda query, candidates: select_with_model(bedrock, query, candidates),
+        router=fast_path_router if FAST_PATH_ENABLED else None,
+        cache=result_cache,
+        catalog_version=catalog_version,
+        candidate_limit=CANDIDATE_LIMIT,
+        fallback_limit=FALLBACK_LIMIT,
+        concurrency=concurrency,
+        rate=rate,
+        log=log
+    )
+    return search, search.run(queries, build_result, seconds_left=seconds_left,
+                              reserve_seconds=BATCH_DEADLINE_MARGIN_SECONDS)
+
+def search_batch_with_bedrock(dynamodb, bedrock, queries, log=None, context=None):
+    """Search many queries in one request; results carry each query's id and route
+
+    Queries that cannot be answered before the Lambda timeout are listed in `unanswered` with `truncated` set
+    """
+    log = log or logger
+    seconds_left = None
+    if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+        seconds_left = lambda: context.get_remaining_time_in_millis() / 1000
+    try:
+        search, results = run_batch(bedrock, queries, log=log, seconds_left=seconds_left)
+        lines = [json.loads(line) for entries, result in results for line in result_lines(entries, result)]
+        order = {entry['id']: position for position, entry in enumerate(queries)}
+        lines.sort(key=lambda line: order.get(line['id'], len(order)))
+        log.info("✅ Batch completed", **search.stats)
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'queries_received': len(queries),
+                'unique_queries': search.stats['unique'],
+                'results': lines,
+                'truncated': bool(search.unanswered),
+                'unanswered': [{'id': entry['id'], 'query': entry['query']} for entry in search.unanswered]
+            }, ensure_ascii=False)
+        }
+    except Exception as e:
+        log.exception("❌ Batch search error", error=str(e))
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': f'Batch search error: {str(e)}'})
+        }
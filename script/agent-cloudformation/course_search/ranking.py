@@ -0,0 +1,179 @@
+"""
+Course ranking index
+BM25 retrieval over course name, description and difficulty, kept in the warm container
+"""
+
+import heapq
+import itertools
+import math
+import re
+from collections import Counter, defaultdict
+
+TOKEN_PATTERN = re.compile(r'[0-9a-z]+|[가-힣]+')
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'about', 'for', 'how', 'i', 'in', 'is', 'me', 'of', 'on',
+    'or', 'the', 'to', 'with', 'want', 'course', 'courses', 'class', 'classes',
+    'recommend', 'video', 'videos', 'aws', 'amazon',
+    '강의', '강좌', '추천', '추천해줘', '추천해주세요', '알려줘', '관련', '관련된'
+}
+
+# Title terms weigh more than description terms
+NAME_BOOST = 2
+
+
+def tokenize(text):
+    """Split text into lowercase search terms"""
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(str(text).lower()) if t not in STOPWORDS]
+
+
+class CourseIndex:
+    def __init__(self, k1=1.5, b=0.75):
+        """Initialize an empty BM25 index"""
+        self.k1 = k1
+        self.b = b
+        self.docs = {}
+        self._signatures = {}
+        self._term_freqs = {}
+        self._lengths = {}
+        self._postings = defaultdict(dict)
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    @staticmethod
+    def _signature(item):
+        """Fields that affect ranking; a change here forces re-indexing"""
+        return (
+            str(item.get('name', '')),
+            str(item.get('description', '')),
+            str(item.get('difficulty', ''))
+        )
+
+    def _analyze(self, item):
+        """Build the weighted term frequencies of a course"""
+        name, description, difficulty = self._signature(item)
+        freqs = Counter()
+        for term in tokenize(name):
+            freqs[term] += NAME_BOOST
+        freqs.update(tokenize(description))
+        freqs.update(tokenize(difficulty))
+        return freqs
+
+    def upsert(self, item):
+        """Add or replace a single course"""
+        doc_id = str(item.get('id', ''))
+        signature = self._signature(item)
+
+        if self._signatures.get(doc_id) == signature:
+            self.docs[doc_id] = item
+            return False
+
+        self.remove(doc_id)
+        freqs = self._analyze(item)
+        for term, tf in freqs.items():
+            self._postings[term][doc_id] = tf
+
+        self.docs[doc_id] = item
+        self._signatures[doc_id] = signature
+        self._term_freqs[doc_id] = freqs
+        self._lengths[doc_id] = sum(freqs.values())
+        self._total_length += self._lengths[doc_id]
+        return True
+
+    def remove(self, doc_id):
+        """Drop a course from the index"""
+        freqs = self._term_freqs.pop(doc_id, None)
+        self.docs.pop(doc_id, None)
+        self._signatures.pop(doc_id, None)
+        if freqs is None:
+            return False
+
+        for term in freqs:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id, 0)
+        return True
+
+    def sync(self, items):
+        """Bring the index in line with the given catalog, re-indexing only changed courses"""
+        seen = set()
+        changed = 0
+        for item in items:
+            doc_id = str(item.get('id', ''))
+            seen.add(doc_id)
+            if self.upsert(item):
+                changed += 1
+
+        stale = [doc_id for doc_id in self.docs if doc_id not in seen]
+        for doc_id in stale:
+            self.remove(doc_id)
+
+        return changed, len(stale)
+
+    def items(self, limit=None):
+        """Indexed courses in catalog order"""
+        return list(itertools.islice(self.docs.values(), limit))
+
+    def search(self, query, limit=10):
+        """Return up to `limit` courses ranked by BM25 score"""
+        terms = set(tokenize(query))
+        if not terms or not self.docs:
+            return []
+
+        doc_count = len(self.docs)
+        avg_length = self._total_length / doc_count if doc_count else 0.0
+        scores = defaultdict(float)
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length) if avg_length else self.k1
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda pair: pair[1])
+        return [self.docs[doc_id] for doc_id, _ in ranked]
+
+    def search_many(self, queries, limit=10):
+        """Rank several queries in one pass: each distinct term's postings are read and weighted once for all queries"""
+        query_terms = [set(tokenize(query)) for query in queries]
+        if not self.docs:
+            return [[] for _ in queries]
+
+        by_term = defaultdict(list)
+        for position, terms in enumerate(query_terms):
+            for term in terms:
+                by_term[term].append(position)
+
+        doc_count = len(self.docs)
+        avg_length = self._total_length / doc_count if doc_count else 0.0
+        scores = [defaultdict(float) for _ in queries]
+
+        for term, positions in by_term.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            weights = []
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length) if avg_length else self.k1
+                weights.append((doc_id, idf * tf * (self.k1 + 1) / (tf + norm)))
+            for position in positions:
+                query_scores = scores[position]
+                for doc_id, weight in weights:
+                    query_scores[doc_id] += weight
+
+        results = []
+        for query_scores in scores:
+            ranked = heapq.nlargest(limit, query_scores.items(), key=lambda pair: pair[1])
+            results.append([self.docs[doc_id] for doc_id, _ in ranked])
+        return results
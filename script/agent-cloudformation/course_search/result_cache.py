@@ -0,0 +1,116 @@
+"""
+Search result cache
+In-process LRU with an optional DynamoDB-backed shared tier, keyed on the normalized query and catalog version
+"""
+
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+from structured_log import get_logger
+
+logger = get_logger('course_search.result_cache')
+
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_query(query):
+    """Fold case, width and punctuation so trivially different phrasings share a cache entry"""
+    text = unicodedata.normalize('NFKC', str(query or '')).lower()
+    text = PUNCTUATION_PATTERN.sub(' ', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def cache_key(query, catalog_version):
+    normalized = normalize_query(query)
+    return hashlib.sha256(f"{catalog_version}|{normalized}".encode('utf-8')).hexdigest()
+
+
+class QueryResultCache:
+    def __init__(self, max_entries=256, ttl_seconds=3600, shared_table=None, clock=time.time):
+        """Cache search response bodies; `shared_table` adds a tier shared by all containers"""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared_table = shared_table
+        self.clock = clock
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Hit/miss counters since the container started"""
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.shared_hits) / lookups, 3) if lookups else 0.0,
+            'entries': len(self._entries)
+        }
+
+    def get(self, query, catalog_version):
+        """Return the cached body for this query and catalog version, or None"""
+        key = cache_key(query, catalog_version)
+        now = self.clock()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            body, expires_at = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            del self._entries[key]
+
+        body = self._get_shared(key, now)
+        if body is not None:
+            self._store(key, body, now + self.ttl_seconds)
+            self.shared_hits += 1
+            return body
+
+        self.misses += 1
+        return None
+
+    def put(self, query, catalog_version, body):
+        """Remember a response body in both tiers"""
+        key = cache_key(query, catalog_version)
+        expires_at = self.clock() + self.ttl_seconds
+        self._store(key, body, expires_at)
+        self._put_shared(key, body, expires_at)
+
+    def _store(self, key, body, expires_at):
+        self._entries[key] = (body, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_shared(self, key, now):
+        """Read the shared tier; failures fall back to a miss"""
+        if self.shared_table is None:
+            return None
+        try:
+            response = self.shared_table.get_item(Key={'id': key})
+        except Exception as e:
+            logger.warning("⚠️ Shared result cache read failed", error=str(e))
+            return None
+
+        item = response.get('Item')
+        # DynamoDB TTL deletes lazily, so expired items can still be returned
+        if not item or int(item.get('expiresAt', 0)) <= now:
+            return None
+        return item.get('body')
+
+    def _put_shared(self, key, body, expires_at):
+        if self.shared_table is None:
+            return
+        try:
+            self.shared_table.put_item(Item={'id': key, 'body': body, 'expiresAt': int(expires_at)})
+        except Exception as e:
+            logger.warning("⚠️ Shared result cache write failed", error=str(e))
@@ -0,0 +1,87 @@
+"""
+Incremental, tolerant parsing of the model's course selection
+Finds the first complete {"selected": [...]} object in streamed text, ignoring prose or code fences around it
+"""
+
+import json
+import re
+
+# Last resort when no well-formed object arrives, e.g. a trailing comma or a missing closing brace
+SELECTED_PATTERN = re.compile(r'"?selected"?\s*:\s*\[([^\[\]]*)\]')
+NUMBER_PATTERN = re.compile(r'-?\d+')
+
+
+class SelectionParser:
+    def __init__(self):
+        """Accumulate text chunks until a complete selection object has been seen"""
+        self.text = ''
+        self.selected = None
+        self._scan_from = 0
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def complete(self):
+        return self.selected is not None
+
+    def feed(self, chunk):
+        """Add a chunk; returns the selection as soon as it is complete, otherwise None"""
+        if self.complete:
+            return self.selected
+        self.text += chunk
+
+        # Track brace depth outside of strings so only balanced objects are handed to json
+        for position in range(self._scan_from, len(self.text)):
+            char = self.text[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                if self._depth:
+                    self._in_string = True
+            elif char == '{':
+                if not self._depth:
+                    self._start = position
+                self._depth += 1
+            elif char == '}' and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    self.selected = _selection(self.text[self._start:position + 1])
+                    if self.complete:
+                        self._scan_from = position + 1
+                        return self.selected
+        self._scan_from = len(self.text)
+        return None
+
+    def finish(self):
+        """Selection once the stream has ended, recovering from malformed output where possible"""
+        if self.complete:
+            return self.selected
+        match = SELECTED_PATTERN.search(self.text)
+        if match:
+            self.selected = [int(n) for n in NUMBER_PATTERN.findall(match.group(1))]
+            return self.selected
+        raise ValueError(f"No course selection found in model output: {self.text[:200]!r}")
+
+
+def _selection(candidate):
+    try:
+        value = json.loads(candidate)
+    except ValueError:
+        return None
+    if isinstance(value, dict) and isinstance(value.get('selected'), list):
+        return [int(n) for n in value['selected'] if isinstance(n, (int, float)) or str(n).lstrip('-').isdigit()]
+    return None
+
+
+def parse_selection(text):
+    """Selected course numbers from a complete model answer"""
+    parser = SelectionParser()
+    parser.feed(text)
+    return parser.finish()
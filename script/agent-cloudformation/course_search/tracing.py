@@ -0,0 +1,106 @@
+"""
+Per-stage timing for course search requests
+Stages become the `traces` of the action group response and CloudWatch Embedded Metric Format lines on stdout
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Time the agent instruction allows for a whole answer; each trace reports its share
+AGENT_BUDGET_MS = 20000
+
+
+class StageTimer:
+    def __init__(self, clock=time.perf_counter, wall_clock=time.time):
+        """Record how long each named stage of a request takes, plus item/token counts per stage"""
+        self.clock = clock
+        self.started_at = wall_clock()
+        self._origin = clock()
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name, **counts):
+        """Time the enclosed block as stage `name`; counts can be added to the yielded record"""
+        start = self.clock()
+        record = {'name': name, 'offset': start - self._origin, 'seconds': 0.0, 'counts': dict(counts)}
+        try:
+            yield record['counts']
+        finally:
+            record['seconds'] = self.clock() - start
+            self.stages.append(record)
+
+    def elapsed(self):
+        return self.clock() - self._origin
+
+    def durations(self):
+        """Seconds spent per stage name"""
+        totals = {}
+        for record in self.stages:
+            totals[record['name']] = totals.get(record['name'], 0.0) + record['seconds']
+        return totals
+
+    def traces(self):
+        """Stage records in the action group `traces` shape, oldest first"""
+        traces = []
+        for record in self.stages:
+            duration_ms = 1000 * record['seconds']
+            details = ', '.join(f"{k}={v}" for k, v in record['counts'].items())
+            moment = datetime.fromtimestamp(self.started_at + record['offset'], tz=timezone.utc)
+            traces.append({
+                'type': 'stage',
+                'stage': record['name'],
+                'content': f"⏱️ {record['name']}: {duration_ms:.1f}ms" + (f" ({details})" if details else ''),
+                'timestamp': moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+                'durationMs': round(duration_ms, 3),
+                'counts': record['counts']
+            })
+        return traces
+
+    def summary_trace(self, content):
+        """Closing trace with the total time and its share of the agent budget"""
+        total_ms = 1000 * self.elapsed()
+        moment = datetime.fromtimestamp(self.started_at + self.elapsed(), tz=timezone.utc)
+        return {
+            'type': 'observation',
+            'content': f"{content} in {total_ms:.0f}ms ({100 * total_ms / AGENT_BUDGET_MS:.1f}% of the {AGENT_BUDGET_MS // 1000}s budget)",
+            'timestamp': moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'durationMs': round(total_ms, 3)
+        }
+
+    def emit_metrics(self, namespace, dimensions=None, properties=None):
+        """Print one EMF line: <stage>Latency in milliseconds and every numeric count per stage"""
+        dimensions = dimensions or {}
+        values = {'TotalLatency': round(1000 * self.elapsed(), 3)}
+        units = {'TotalLatency': 'Milliseconds'}
+        for name, seconds in self.durations().items():
+            metric = f"{_camel(name)}Latency"
+            values[metric] = round(1000 * seconds, 3)
+            units[metric] = 'Milliseconds'
+        for record in self.stages:
+            for key, value in record['counts'].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metric = f"{_camel(record['name'])}{_camel(key)}"
+                    values[metric] = value
+                    units[metric] = 'Count'
+
+        document = {
+            '_aws': {
+                'Timestamp': int(1000 * self.started_at),
+                'CloudWatchMetrics': [{
+                    'Namespace': namespace,
+                    'Dimensions': [sorted(dimensions)],
+                    'Metrics': [{'Name': name, 'Unit': unit} for name, unit in units.items()]
+                }]
+            }
+        }
+        document.update(properties or {})
+        document.update(dimensions)
+        document.update(values)
+        print(json.dumps(document, ensure_ascii=False, default=str))
+        return document
+
+
+def _camel(name):
+    return ''.join(part.capitalize() for part in name.split('_'))
@@ -5,204 +5,95 @@ Deploys a Bedrock Agent with Action Group and Lambda function using CloudFormati
 """
 
 import boto3
-import json
 import time
 import argparse
 import sys
 import os
-from botocore.exceptions import ClientError, NoCredentialsError
 
-class BedrockAgentDeployer:
-    def __init__(self, region='us-west-2', profile=None):
-        """Initialize the deployer with AWS session"""
-        try:
-            if profile:
-                session = boto3.Session(profile_name=profile)
-            else:
-                session = boto3.Session()
-            
-            self.cf_client = session.client('cloudformation', region_name=region)
-            self.bedrock_client = session.client('bedrock-agent', region_name=region)
-            self.region = region
-            
-            # Test credentials
-            sts = session.client('sts')
-            identity = sts.get_caller_identity()
-            print(f"✅ Connected to AWS Account: {identity['Account']}")
-            print(f"✅ Region: {region}")
-            
-        except NoCredentialsError:
-            print("❌ AWS credentials not found. Please configure your credentials.")
-            sys.exit(1)
-        except Exception as e:
-            print(f"❌ Error initializing AWS session: {e}")
-            sys.exit(1)
+COMMON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common')
+sys.path.insert(0, COMMON_DIR)
 
-    def deploy_stack(self, stack_name, template_file, parameters=None):
-        """Deploy CloudFormation stack"""
-        try:
-            # Read template file
-            with open(template_file, 'r') as f:
-                template_body = f.read()
-            
-            # Prepare parameters
-            cf_parameters = []
-            if parameters:
-                for key, value in parameters.items():
-                    cf_parameters.append({
-                        'ParameterKey': key,
-                        'ParameterValue': value
-                    })
-            
-            print(f"🚀 Deploying stack: {stack_name}")
-            
-            # Check if stack exists
-            try:
-                self.cf_client.describe_stacks(StackName=stack_name)
-                print(f"📝 Stack {stack_name} exists, updating...")
-                
-                response = self.cf_client.update_stack(
-                    StackName=stack_name,
-                    TemplateBody=template_body,
-                    Parameters=cf_parameters,
-                    Capabilities=['CAPABILITY_NAMED_IAM']
-                )
-                operation = 'UPDATE'
-                
-            except ClientError as e:
-                if 'does not exist' in str(e):
-                    print(f"📝 Creating new stack: {stack_name}")
-                    
-                    response = self.cf_client.create_stack(
-                        StackName=stack_name,
-                        TemplateBody=template_body,
-                        Parameters=cf_parameters,
-                        Capabilities=['CAPABILITY_NAMED_IAM']
-                    )
-                    operation = 'CREATE'
-                else:
-                    raise e
-            
-            # Wait for completion
-            self._wait_for_stack_completion(stack_name, operation)
-            
-            # Get outputs
-            outputs = self._get_stack_outputs(stack_name)
-            return outputs
-            
-        except Exception as e:
-            print(f"❌ Error deploying stack: {e}")
-            return None
+from agent_readiness import READY, AgentPrepared, publish_timings, wait_all
+from stack_deployer import CloudFormationDeployer
 
-    def _wait_for_stack_completion(self, stack_name, operation):
-        """Wait for CloudFormation stack operation to complete"""
-        if operation == 'CREATE':
-            waiter = self.cf_client.get_waiter('stack_create_complete')
-            success_status = 'CREATE_COMPLETE'
-            failure_statuses = ['CREATE_FAILED', 'ROLLBACK_COMPLETE']
-        else:
-            waiter = self.cf_client.get_waiter('stack_update_complete')
-            success_status = 'UPDATE_COMPLETE'
-            failure_statuses = ['UPDATE_FAILED', 'UPDATE_ROLLBACK_COMPLETE']
-        
-        print(f"⏳ Waiting for stack {operation.lower()} to complete...")
-        
-        try:
-            waiter.wait(
-                StackName=stack_name,
-                WaiterConfig={
-                    'Delay': 30,
-                    'MaxAttempts': 60
-                }
-            )
-            print(f"✅ Stack {operation.lower()} completed successfully!")
-            
-        except Exception as e:
-            # Check final status
-            response = self.cf_client.describe_stacks(StackName=stack_name)
-            status = response['Stacks'][0]['StackStatus']
-            
-            if status in failure_statuses:
-                print(f"❌ Stack {operation.lower()} failed with status: {status}")
-                self._print_stack_events(stack_name)
-            else:
-                print(f"✅ Stack operation completed with status: {status}")
+class BedrockAgentDeployer(CloudFormationDeployer):
+    logger_name = 'deploy-agent'
+    capabilities = ['CAPABILITY_NAMED_IAM']
+    prepare_timeout = 600
+    readiness_metrics = True
 
-    def _get_stack_outputs(self, stack_name):
-        """Get CloudFormation stack outputs"""
-        try:
-            response = self.cf_client.describe_stacks(StackName=stack_name)
-            outputs = {}
-            
-            if 'Outputs' in response['Stacks'][0]:
-                for output in response['Stacks'][0]['Outputs']:
-                    outputs[output['OutputKey']] = output['OutputValue']
-            
-            return outputs
-            
-        except Exception as e:
-            print(f"❌ Error getting stack outputs: {e}")
-            return {}
+    def _create_clients(self, session):
+        """Bedrock Agent and S3 clients"""
+        self.bedrock_client = session.client('bedrock-agent', region_name=self.region)
+        self.s3_client = session.client('s3', region_name=self.region)
+        self.cloudwatch_client = session.client('cloudwatch', region_name=self.region)
 
-    def _print_stack_events(self, stack_name, limit=10):
-        """Print recent stack events for debugging"""
-        try:
-            response = self.cf_client.describe_stack_events(StackName=stack_name)
-            events = response['StackEvents'][:limit]
-            
-            print(f"\n📋 Recent stack events for {stack_name}:")
-            for event in events:
-                timestamp = event['Timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-                resource = event.get('LogicalResourceId', 'N/A')
-                status = event.get('ResourceStatus', 'N/A')
-                reason = event.get('ResourceStatusReason', 'N/A')
-                
-                print(f"  {timestamp} | {resource} | {status} | {reason}")
-                
-        except Exception as e:
-            print(f"❌ Error getting stack events: {e}")
+    def before_deploy(self, stack):
+        """Package and upload the course search Lambda for a manifest stack"""
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        code_bucket, code_key = self.package_lambda(
+            os.path.join(script_dir, 'course_search'),
+            bucket_name=stack['options'].get('artifact_bucket'),
+            extra_files=[os.path.join(COMMON_DIR, 'structured_log.py'), os.path.join(COMMON_DIR, 'prompt_budget.py')]
+        )
+        if not code_key:
+            raise RuntimeError('Lambda packaging failed')
+        return {'LambdaCodeBucket': code_bucket, 'LambdaCodeKey': code_key}
+
+    def after_deploy(self, stack, outputs):
+        """Prepare the agent as soon as its stack is done, then save .env.agent"""
+        if 'AgentId' not in outputs:
+            return True
+        if self.follow_up_done(stack['name']):
+            # Same deployment hash as the last successful preparation
+            self.log.info(f"✅ Agent {outputs['AgentId']} already prepared for this deployment, skipping")
+            agent_prepared = True
+        else:
+            agent_prepared = self.prepare_agent(outputs['AgentId'])
+            if agent_prepared:
+                self.mark_follow_up_done(stack['name'])
+        if 'AgentAliasId' in outputs:
+            self.save_env_file(outputs['AgentId'], outputs['AgentAliasId'])
+            if agent_prepared and stack['options'].get('test'):
+                self.test_agent(outputs['AgentId'], outputs['AgentAliasId'])
+        return agent_prepared
 
     def prepare_agent(self, agent_id):
-        """Prepare the Bedrock Agent (required after creation/update)"""
+        """Prepare the Bedrock Agent (required after creation/update) and wait for it"""
         try:
-            print(f"🔧 Preparing Bedrock Agent: {agent_id}")
+            self.log.info(f"🔧 Preparing Bedrock Agent: {agent_id}")
             
             response = self.bedrock_client.prepare_agent(agentId=agent_id)
             
-            # Wait for preparation to complete
-            print("⏳ Waiting for agent preparation to complete...")
+            # The DRAFT alias has no routing configuration, so PrepareAgent does not move it and only
+            # the agent itself is waited for
+            self.log.info("⏳ Waiting for agent preparation to complete...")
+            agent_check = AgentPrepared(self.bedrock_client, agent_id, initial_status=response.get('agentStatus'))
+            results = wait_all([agent_check], timeout=self.prepare_timeout, log=self.log)
             
-            max_attempts = 30
-            for attempt in range(max_attempts):
+            if self.readiness_metrics:
                 try:
-                    agent_response = self.bedrock_client.get_agent(agentId=agent_id)
-                    status = agent_response['agent']['agentStatus']
-                    
-                    if status == 'PREPARED':
-                        print("✅ Agent preparation completed!")
-                        return True
-                    elif status in ['FAILED', 'NOT_PREPARED']:
-                        print(f"❌ Agent preparation failed with status: {status}")
-                        return False
-                    
-                    print(f"⏳ Agent status: {status} (attempt {attempt + 1}/{max_attempts})")
-                    time.sleep(10)
-                    
+                    publish_timings(self.cloudwatch_client, agent_check.model_id, results)
                 except Exception as e:
-                    print(f"⚠️ Error checking agent status: {e}")
-                    time.sleep(10)
+                    self.log.warning(f"⚠️ Could not publish readiness metrics: {e}")
             
-            print("❌ Agent preparation timed out")
-            return False
+            not_ready = [metric for metric, (outcome, _, _) in results.items() if outcome != READY]
+            if not_ready:
+                self.log.error(f"❌ Agent preparation failed: {', '.join(not_ready)} not ready")
+                return False
+            
+            timings = ', '.join(f"{metric} {seconds:.0f}s" for metric, (_, _, seconds) in results.items())
+            self.log.info(f"✅ Agent preparation completed! ({timings}, model {agent_check.model_id})")
+            return True
             
         except Exception as e:
-            print(f"❌ Error preparing agent: {e}")
+            self.log.error(f"❌ Error preparing agent: {e}")
             return False
 
     def test_agent(self, agent_id, alias_id):
         """Test the deployed agent with a sample query"""
         try:
-            print(f"🧪 Testing agent {agent_id} with alias {alias_id}")
+            self.log.info(f"🧪 Testing agent {agent_id} with alias {alias_id}")
             
             bedrock_runtime = boto3.client('bedrock-agent-runtime', region_name=self.region)
             
@@ -220,16 +111,17 @@ class BedrockAgentDeployer:
                     if 'chunk' in chunk and 'bytes' in chunk['chunk']:
                         result_text += chunk['chunk']['bytes'].decode('utf-8')
             
+            self.log.payload("📝 Full agent response", result_text, level='DEBUG')
             if result_text:
-                print("✅ Agent test successful!")
-                print(f"📝 Response preview: {result_text[:200]}...")
+                self.log.info("✅ Agent test successful!")
+                self.log.info(f"📝 Response preview: {result_text[:200]}...")
                 return True
             else:
-                print("⚠️ Agent responded but no content received")
+                self.log.warning("⚠️ Agent responded but no content received")
                 return False
                 
         except Exception as e:
-            print(f"❌ Error testing agent: {e}")
+            self.log.error(f"❌ Error testing agent: {e}")
             return False
 
     def save_env_file(self, agent_id, alias_id, env_file='.env.agent'):
@@ -247,10 +139,10 @@ BEDROCK_AGENT_REGION={self.region}
             with open(env_path, 'w') as f:
                 f.write(env_content)
             
-            print(f"✅ Agent configuration saved to {env_path}")
+            self.log.info(f"✅ Agent configuration saved to {env_path}")
             return True
         except Exception as e:
-            print(f"❌ Error saving env file: {e}")
+            self.log.error(f"❌ Error saving env file: {e}")
             return False
 
 def main():
@@ -267,19 +159,81 @@ def main():
                        help='DynamoDB table name for course data')
     parser.add_argument('--model-id', default='us.anthropic.claude-3-7-sonnet-20250219-v1:0',
                        help='Foundation model ID')
+    parser.add_argument('--artifact-bucket',
+                       help='S3 bucket for the Lambda package (default: bedrock-agent-artifacts-<account>-<region>)')
+    parser.add_argument('--candidate-limit', type=int, default=10,
+                       help='Number of pre-ranked courses sent to the model')
+    parser.add_argument('--catalog-ttl', type=int, default=300,
+                       help='Seconds a warm Lambda container may reuse the cached catalog')
+    parser.add_argument('--class-stream-arn', default='',
+                       help='DynamoDB Stream ARN of the Class table for immediate cache invalidation')
+    parser.add_argument('--result-cache-ttl', type=int, default=3600,
+                       help='Seconds a cached search result stays valid')
+    parser.add_argument('--shared-result-cache', action='store_true',
+                       help='Share cached search results across Lambda containers through DynamoDB')
+    parser.add_argument('--no-model-streaming', action='store_true',
+                       help='Wait for the full InvokeModel body instead of streaming the course selection')
+    parser.add_argument('--no-fast-path', action='store_true',
+                       help='Send every query to the model, even ones that only name a service and difficulty')
+    parser.add_argument('--prompt-token-budget', type=int, default=1500,
+                       help='Estimated input tokens allowed per course selection prompt')
+    parser.add_argument('--batch-concurrency', type=int, default=4,
+                       help='Concurrent model re-ranking calls within one /search_classes_batch call')
+    parser.add_argument('--batch-rate', type=float, default=5.0,
+                       help='Model re-ranking calls per second within one batch (0 for no limit)')
+    parser.add_argument('--lambda-log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level of the course search Lambda')
+    parser.add_argument('--log-sample-rate', type=float, default=0.01,
+                       help='Share of Lambda invocations whose full event and response are logged')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level (default: LOG_LEVEL or INFO; DEBUG also logs full API payloads)')
+    parser.add_argument('--preview', action='store_true',
+                       help='Create and print the change set without executing it')
+    parser.add_argument('--force', action='store_true',
+                       help='Redeploy even when the template and parameter hash is unchanged')
+    parser.add_argument('--prepare-timeout', type=int, default=600,
+                       help='Seconds to wait for agent preparation')
+    parser.add_argument('--no-readiness-metrics', action='store_true',
+                       help='Do not publish preparation timings to CloudWatch')
     parser.add_argument('--test', action='store_true',
                        help='Test the agent after deployment')
     
     args = parser.parse_args()
     
     # Initialize deployer
-    deployer = BedrockAgentDeployer(region=args.region, profile=args.profile)
+    deployer = BedrockAgentDeployer(region=args.region, profile=args.profile, log_level=args.log_level)
+    deployer.preview = args.preview
+    deployer.force = args.force
+    deployer.prepare_timeout = args.prepare_timeout
+    deployer.readiness_metrics = not args.no_readiness_metrics
+    
+    # Package the course search Lambda
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    stack = {'name': args.stack_name, 'options': {'artifact_bucket': args.artifact_bucket, 'test': args.test}}
+    try:
+        code_parameters = deployer.before_deploy(stack)
+    except Exception:
+        print("❌ Lambda packaging failed")
+        sys.exit(1)
     
     # Deployment parameters
     parameters = {
         'AgentName': args.agent_name,
         'ModelId': args.model_id,
-        'DynamoDBTableName': args.dynamodb_table
+        'DynamoDBTableName': args.dynamodb_table,
+        'CandidateLimit': str(args.candidate_limit),
+        'CatalogTtlSeconds': str(args.catalog_ttl),
+        'ClassTableStreamArn': args.class_stream_arn,
+        'ResultCacheTtlSeconds': str(args.result_cache_ttl),
+        'EnableSharedResultCache': 'true' if args.shared_result_cache else 'false',
+        'StreamModelResponse': 'false' if args.no_model_streaming else 'true',
+        'EnableFastPath': 'false' if args.no_fast_path else 'true',
+        'PromptTokenBudget': str(args.prompt_token_budget),
+        'BatchConcurrency': str(args.batch_concurrency),
+        'BatchModelRate': str(args.batch_rate),
+        'LogLevel': args.lambda_log_level,
+        'LogSampleRate': str(args.log_sample_rate),
+        **code_parameters
     }
     
     print(f"🎯 Deployment Configuration:")
@@ -293,10 +247,14 @@ def main():
     # Deploy stack
     outputs = deployer.deploy_stack(
         stack_name=args.stack_name,
-        template_file='bedrock-agent.yaml',
+        template_file=os.path.join(script_dir, 'bedrock-agent.yaml'),
         parameters=parameters
     )
     
+    if args.preview:
+        print("\n🔍 Change set created for review; nothing was executed")
+        return
+    
     if not outputs:
         print("❌ Deployment failed")
         sys.exit(1)
@@ -306,17 +264,10 @@ def main():
     for key, value in outputs.items():
         print(f"   {key}: {value}")
     
-    # Prepare agent
-    if 'AgentId' in outputs:
-        agent_prepared = deployer.prepare_agent(outputs['AgentId'])
-        
-        # Save .env.agent file
-        if 'AgentAliasId' in outputs:
-            deployer.save_env_file(outputs['AgentId'], outputs['AgentAliasId'])
-        
-        if agent_prepared and args.test and 'AgentAliasId' in outputs:
-            # Test agent
-            deployer.test_agent(outputs['AgentId'], outputs['AgentAliasId'])
+    # Prepare agent, save .env.agent file and optionally test it
+    if not deployer.after_deploy(stack, outputs):
+        print("❌ Agent did not become ready; see the messages above")
+        sys.exit(1)
     
     print(f"\n✅ Bedrock Agent is ready to use!")
     print(f"   Agent ID: {outputs.get('AgentId', 'N/A')}")
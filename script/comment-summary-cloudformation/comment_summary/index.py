@@ -0,0 +1,77 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import boto3
+
+from rolling_summary import BedrockSummaryModel, RollingSummarizer, SummaryStore, new_comments_from_stream
+from structured_log import get_logger
+
+REGION = os.environ.get('AWS_REGION', 'us-west-2')
+
+MODEL_ID = os.environ.get('MODEL_ID', 'us.amazon.nova-pro-v1:0')
+
+# Classes folded at the same time
+FOLD_CONCURRENCY = int(os.environ.get('FOLD_CONCURRENCY', '4'))
+
+# No new class is started with less time than this left before the Lambda timeout
+FOLD_TIME_RESERVE_SECONDS = float(os.environ.get('FOLD_TIME_RESERVE_SECONDS', '30'))
+
+logger = get_logger('comment_summary')
+
+# Clients are created once per container and reused by warm invocations
+dynamodb = boto3.resource('dynamodb', region_name=REGION)
+bedrock = boto3.client('bedrock-runtime', region_name=REGION)
+
+summarizer = RollingSummarizer(
+    store=SummaryStore(dynamodb.Table(os.environ['SUMMARY_TABLE_NAME'])),
+    model=BedrockSummaryModel(bedrock, MODEL_ID),
+    max_batch_chars=int(os.environ.get('MAX_BATCH_CHARS', '12000'))
+)
+
+
+def stream_handler(event, context):
+    """
+    Fold comments added to the Comment table into each class's stored summary
+    """
+
+    log = logger.bind(request_id=getattr(context, 'aws_request_id', None))
+    records = event.get('Records', [])
+    by_class = new_comments_from_stream(records)
+    log.info("📥 Comment stream batch", records=len(records), classes=len(by_class))
+
+    # A failed class is retried from its first record; classes already folded skip their comments by id
+    failures = []
+    pending = deque(by_class.items())
+    with ThreadPoolExecutor(max_workers=max(1, FOLD_CONCURRENCY)) as executor:
+        futures = {}
+        while pending or futures:
+            while pending and len(futures) < FOLD_CONCURRENCY and _has_time(context):
+                class_id, comments = pending.popleft()
+                futures[executor.submit(summarizer.fold, class_id, comments)] = (class_id, comments)
+            if not futures:
+                break
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                class_id, comments = futures.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    log.error("❌ Error updating summary", class_id=class_id, error=str(e))
+                    failures.append(comments[0]['sequenceNumber'])
+
+    if pending:
+        # Out of time: report the classes never started instead of letting a timeout replay the whole batch
+        log.warning("⏱️ Deferring classes to the next invocation", classes=len(pending))
+        failures.extend(comments[0]['sequenceNumber'] for _, comments in pending)
+
+    if failures:
+        # Partial batch response: Lambda retries from the earliest failed record
+        return {'batchItemFailures': [{'itemIdentifier': min(failures, key=int)}]}
+    return {'batchItemFailures': []}
+
+
+def _has_time(context):
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return True
+    return context.get_remaining_time_in_millis() / 1000 > FOLD_TIME_RESERVE_SECONDS
@@ -0,0 +1,202 @@
+"""
+Rolling comment summary
+Keeps one stored summary and score per class and folds newly added comments into it,
+so each comment is sent to the model once instead of on every view
+"""
+
+import re
+import threading
+import time
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from structured_log import get_logger
+
+logger = get_logger('comment_summary')
+
+SYSTEM_PROMPT = 'You are a helpful AI assistant that summarizes comments.'
+
+# Comment ids remembered per class so a redelivered stream record is not folded twice
+RECENT_ID_LIMIT = 200
+
+SCORE_PATTERN = re.compile(r'Overall Score\s*:\s*\[?\s*(\d+(?:\.\d+)?)\s*/\s*5')
+SECTION_PATTERN = re.compile(r'(?:📚\s*)?Summary:\s*(?P<summary>.*?)\s*(?:⭐️?\s*)?Overall Score.*?'
+                             r'(?:💫\s*)?Key Reason:\s*(?P<reason>.*)', re.DOTALL)
+
+
+def create_summary_prompt(comments_text):
+    """Same structured format the class page has always shown"""
+    return f"""📊 Summarize the following comments in a structured format:
+
+    {comments_text}
+
+    Format your response as follows:
+
+    📚 Summary:
+    [Provide a concise summary of the overall sentiment and main points]
+
+    ⭐️ Overall Score : [_/5]
+
+    💫 Key Reason:
+    [Main reason for the score]"""
+
+
+def create_fold_prompt(current, comments_text, new_count):
+    """Merge a batch of new comments into the stored summary, weighted by how many comments each side covers"""
+    return f"""📊 Update an existing summary of {current['commentCount']} comments with {new_count} new comments.
+
+    Current summary:
+    {current['summary']}
+
+    Current overall score: {current.get('score')}/5
+    Current key reason: {current.get('reason', '')}
+
+    New comments:
+    {comments_text}
+
+    Keep what the current summary says unless the new comments change it; weigh each side by the number of
+    comments it covers. Format your response as follows:
+
+    📚 Summary:
+    [Provide a concise summary of the overall sentiment and main points]
+
+    ⭐️ Overall Score : [_/5]
+
+    💫 Key Reason:
+    [Main reason for the score]"""
+
+
+def parse_summary(text):
+    """Split a model answer into summary, score and reason; the full text is kept for display"""
+    match = SECTION_PATTERN.search(text or '')
+    score = SCORE_PATTERN.search(text or '')
+    return {
+        'summary': match.group('summary').strip() if match else (text or '').strip(),
+        'score': score.group(1) if score else None,
+        'reason': match.group('reason').strip() if match else '',
+        'text': (text or '').strip()
+    }
+
+
+def comment_batches(comments, max_chars):
+    """Group comment texts so each model call stays under `max_chars` of comment text"""
+    batch, size = [], 0
+    for comment in comments:
+        if batch and size + len(comment['content']) > max_chars:
+            yield batch
+            batch, size = [], 0
+        batch.append(comment)
+        size += len(comment['content']) + 1
+    if batch:
+        yield batch
+
+
+def new_comments_from_stream(records):
+    """INSERT records of the Comment table grouped by classId, in stream order"""
+    by_class = {}
+    for record in records:
+        if record.get('eventName') != 'INSERT':
+            continue
+        image = record.get('dynamodb', {}).get('NewImage', {})
+        class_id = image.get('classId', {}).get('S')
+        content = image.get('content', {}).get('S')
+        if not class_id or not content:
+            continue
+        by_class.setdefault(class_id, []).append({
+            'id': image.get('id', {}).get('S'),
+            'content': content,
+            'createdAt': image.get('createdAt', {}).get('S'),
+            'sequenceNumber': record.get('dynamodb', {}).get('SequenceNumber')
+        })
+    return by_class
+
+
+class BedrockSummaryModel:
+    def __init__(self, client, model_id, max_tokens=1000):
+        """Converse with a Bedrock model using the comment summary system prompt"""
+        self.client = client
+        self.model_id = model_id
+        self.max_tokens = max_tokens
+
+    def complete(self, prompt):
+        response = self.client.converse(
+            modelId=self.model_id,
+            system=[{'text': SYSTEM_PROMPT}],
+            messages=[{'role': 'user', 'content': [{'text': prompt}]}],
+            inferenceConfig={'maxTokens': self.max_tokens}
+        )
+        return response['output']['message']['content'][0]['text']
+
+
+class SummaryStore:
+    def __init__(self, table):
+        """CommentSummary items keyed by classId with an optimistic-locking version"""
+        self.table = table
+
+    def get(self, class_id):
+        return self.table.get_item(Key={'classId': class_id}, ConsistentRead=True).get('Item')
+
+    def save(self, item, expected_version):
+        """Write the item unless another worker saved a newer version first; returns False on conflict"""
+        condition = Attr('version').not_exists() if expected_version is None else Attr('version').eq(expected_version)
+        try:
+            self.table.put_item(Item=item, ConditionExpression=condition)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+
+class RollingSummarizer:
+    def __init__(self, store, model, max_batch_chars=12000, max_conflicts=5, clock=time.time):
+        """Fold new comments into each class's stored summary"""
+        self.store = store
+        self.model = model
+        self.max_batch_chars = max_batch_chars
+        self.max_conflicts = max_conflicts
+        self.clock = clock
+        self.model_calls = 0
+        self._lock = threading.Lock()
+
+    def fold(self, class_id, comments):
+        """Fold the comments not yet seen into the class summary; returns the saved item (or the current one if nothing was new)"""
+        for _ in range(self.max_conflicts):
+            current = self.store.get(class_id)
+            seen = set((current or {}).get('recentCommentIds') or [])
+            fresh = [c for c in comments if c['id'] not in seen]
+            if not fresh:
+                return current
+
+            state = dict(current) if current else None
+            for batch in comment_batches(fresh, self.max_batch_chars):
+                comments_text = '\n'.join(c['content'] for c in batch)
+                if state is None:
+                    prompt = create_summary_prompt(comments_text)
+                else:
+                    prompt = create_fold_prompt(state, comments_text, len(batch))
+                with self._lock:
+                    self.model_calls += 1
+                parsed = parse_summary(self.model.complete(prompt))
+                state = {
+                    'classId': class_id,
+                    'summary': parsed['summary'],
+                    'score': Decimal(parsed['score']) if parsed['score'] else (state or {}).get('score'),
+                    'reason': parsed['reason'],
+                    'text': parsed['text'],
+                    'commentCount': int((state or {}).get('commentCount', 0)) + len(batch)
+                }
+
+            expected_version = current.get('version') if current else None
+            recent = list((current or {}).get('recentCommentIds') or []) + [c['id'] for c in fresh if c['id']]
+            state['recentCommentIds'] = recent[-RECENT_ID_LIMIT:]
+            state['version'] = int(expected_version or 0) + 1
+            state['updatedAt'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.clock()))
+            if self.store.save(state, expected_version):
+                logger.info("🧾 Summary updated", class_id=class_id, folded=len(fresh),
+                            comments=state['commentCount'], score=state['score'])
+                return state
+            logger.info("🔁 Summary changed concurrently, folding again", class_id=class_id)
+        raise RuntimeError(f"Summary for class {class_id} kept changing; giving up after {self.max_conflicts} attempts")
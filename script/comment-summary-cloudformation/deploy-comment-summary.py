@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Comment Summary Deployment Script
+Deploys the comment summary table and its DynamoDB Stream worker using CloudFormation
+"""
+
+import argparse
+import sys
+import os
+
+COMMON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common')
+sys.path.insert(0, COMMON_DIR)
+
+from stack_deployer import CloudFormationDeployer
+
+class CommentSummaryDeployer(CloudFormationDeployer):
+    logger_name = 'deploy-comment-summary'
+    capabilities = ['CAPABILITY_IAM']
+
+    def _create_clients(self, session):
+        """S3 client for the Lambda package"""
+        self.s3_client = session.client('s3', region_name=self.region)
+
+    def before_deploy(self, stack):
+        """Package and upload the comment summary worker for a manifest stack"""
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        code_bucket, code_key = self.package_lambda(
+            os.path.join(script_dir, 'comment_summary'),
+            bucket_name=stack['options'].get('artifact_bucket'),
+            prefix='comment-summary',
+            extra_files=[os.path.join(COMMON_DIR, 'structured_log.py')]
+        )
+        if not code_key:
+            raise RuntimeError('Lambda packaging failed')
+        return {'LambdaCodeBucket': code_bucket, 'LambdaCodeKey': code_key}
+
+def main():
+    parser = argparse.ArgumentParser(description='Deploy the comment summary worker with CloudFormation')
+    parser.add_argument('--stack-name', default='comment-summary-worker',
+                       help='CloudFormation stack name')
+    parser.add_argument('--comment-stream-arn', required=True,
+                       help='DynamoDB Stream ARN of the Comment table')
+    parser.add_argument('--region', default='us-west-2',
+                       help='AWS region')
+    parser.add_argument('--profile',
+                       help='AWS profile name')
+    parser.add_argument('--model-id', default='us.amazon.nova-pro-v1:0',
+                       help='Foundation model ID used to summarize comments')
+    parser.add_argument('--artifact-bucket',
+                       help='S3 bucket for the Lambda package (default: bedrock-agent-artifacts-<account>-<region>)')
+    parser.add_argument('--batching-window', type=int, default=30,
+                       help='Seconds the stream gathers new comments before invoking the worker')
+    parser.add_argument('--batch-size', type=int, default=100,
+                       help='Most stream records per worker invocation')
+    parser.add_argument('--fold-concurrency', type=int, default=4,
+                       help='Classes folded in parallel within one invocation')
+    parser.add_argument('--lambda-log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level of the worker Lambda')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level (default: LOG_LEVEL or INFO; DEBUG also logs full API payloads)')
+    parser.add_argument('--preview', action='store_true',
+                       help='Create and print the change set without executing it')
+    parser.add_argument('--force', action='store_true',
+                       help='Redeploy even when the template and parameter hash is unchanged')
+
+    args = parser.parse_args()
+
+    # Initialize deployer
+    deployer = CommentSummaryDeployer(region=args.region, profile=args.profile, log_level=args.log_level)
+    deployer.preview = args.preview
+    deployer.force = args.force
+
+    # Package the worker Lambda
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    stack = {'name': args.stack_name, 'options': {'artifact_bucket': args.artifact_bucket}}
+    try:
+        code_parameters = deployer.before_deploy(stack)
+    except Exception:
+        print("❌ Lambda packaging failed")
+        sys.exit(1)
+
+    # Deployment parameters
+    parameters = {
+        'CommentTableStreamArn': args.comment_stream_arn,
+        'ModelId': args.model_id,
+        'BatchingWindowSeconds': str(args.batching_window),
+        'BatchSize': str(args.batch_size),
+        'FoldConcurrency': str(args.fold_concurrency),
+        'LogLevel': args.lambda_log_level,
+        **code_parameters
+    }
+
+    print(f"🎯 Deployment Configuration:")
+    print(f"   Stack Name: {args.stack_name}")
+    print(f"   Comment Stream: {args.comment_stream_arn}")
+    print(f"   Region: {args.region}")
+    print(f"   Model ID: {args.model_id}")
+    print()
+
+    # Deploy stack
+    outputs = deployer.deploy_stack(
+        stack_name=args.stack_name,
+        template_file=os.path.join(script_dir, 'comment-summary.yaml'),
+        parameters=parameters
+    )
+
+    if args.preview:
+        print("\n🔍 Change set created for review; nothing was executed")
+        return
+
+    if not outputs:
+        print("❌ Deployment failed")
+        sys.exit(1)
+
+    print(f"\n🎉 Deployment completed successfully!")
+    print(f"📋 Stack Outputs:")
+    for key, value in outputs.items():
+        print(f"   {key}: {value}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Comment Summary Replay
+Replays script/init/Comment.json through the comment summary worker as DynamoDB Stream batches,
+against an in-memory summary table and a deterministic fake model, and checks that every comment
+is folded exactly once even when batches are redelivered or two workers race on the same class
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from decimal import Decimal
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, 'comment_summary'))
+sys.path.insert(0, os.path.join(os.path.dirname(SCRIPT_DIR), 'common'))
+
+from rolling_summary import RollingSummarizer, create_summary_prompt, new_comments_from_stream
+
+FIXTURE_PATH = os.path.join(os.path.dirname(SCRIPT_DIR), 'init', 'Comment.json')
+
+POSITIVE_WORDS = ('helpful', 'amazing', 'great', 'clear', 'excellent', 'love', 'useful', 'best', 'thanks', 'good')
+NEGATIVE_WORDS = ('confusing', 'boring', 'bad', 'slow', 'hard', 'unclear', 'poor', 'outdated', 'difficult', 'not')
+
+
+class FakeSummaryModel:
+    def __init__(self):
+        """Scores comments by counting sentiment words; the answer keeps the real prompt format"""
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def complete(self, prompt):
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        text = prompt.lower()
+        positive = sum(text.count(word) for word in POSITIVE_WORDS)
+        negative = sum(text.count(word) for word in NEGATIVE_WORDS)
+        score = round(1 + 4 * positive / (positive + negative), 1) if positive + negative else 3.0
+        return (f"📚 Summary:\nViewers mention {positive} positive and {negative} negative points.\n\n"
+                f"⭐️ Overall Score : [{score}/5]\n\n"
+                f"💫 Key Reason:\n{'Mostly positive feedback' if score >= 3 else 'Mostly critical feedback'}")
+
+
+class MemorySummaryStore:
+    def __init__(self, conflicts=()):
+        """Dict-backed SummaryStore; each class in `conflicts` loses its first save to a simulated concurrent writer"""
+        self.items = {}
+        self.pending_conflicts = set(conflicts)
+        self.conflicts = 0
+        self.reads = 0
+
+    def get(self, class_id):
+        self.reads += 1
+        item = self.items.get(class_id)
+        return json.loads(json.dumps(item, default=str), parse_float=Decimal) if item else None
+
+    def save(self, item, expected_version):
+        current = self.items.get(item['classId'])
+        if item['classId'] in self.pending_conflicts:
+            self.pending_conflicts.discard(item['classId'])
+            self.conflicts += 1
+            return False
+        if (current.get('version') if current else None) != expected_version:
+            self.conflicts += 1
+            return False
+        self.items[item['classId']] = item
+        return True
+
+
+def load_stream_records(path):
+    """Comment.json PutRequests as INSERT stream records"""
+    with open(path, 'r', encoding='utf-8') as f:
+        requests = json.load(f)['Comment']
+    records = []
+    for number, request in enumerate(requests, 1):
+        records.append({
+            'eventName': 'INSERT',
+            'dynamodb': {'NewImage': request['PutRequest']['Item'], 'SequenceNumber': str(number)}
+        })
+    return records
+
+
+def replay(records, batch_size, redeliver_rate, views_per_comment, seed):
+    """Feed the records in stream batches; returns (store, model, summarizer, stats)"""
+    rng = random.Random(seed)
+    model = FakeSummaryModel()
+    first_class = new_comments_from_stream(records[:1])
+    store = MemorySummaryStore(conflicts=first_class.keys())
+    summarizer = RollingSummarizer(store, model, max_batch_chars=2000)
+
+    batches = [records[start:start + batch_size] for start in range(0, len(records), batch_size)]
+    deliveries = 0
+    for batch in batches:
+        # Lambda retries a batch after a timeout or partial failure
+        for _ in range(2 if rng.random() < redeliver_rate else 1):
+            deliveries += 1
+            for class_id, comments in new_comments_from_stream(batch).items():
+                summarizer.fold(class_id, comments)
+
+    # What summarizing on every view costs: each view sends all of that class's comments so far
+    by_class = new_comments_from_stream(records)
+    baseline_calls = 0
+    baseline_chars = 0
+    for comments in by_class.values():
+        for count in range(1, len(comments) + 1):
+            prompt = create_summary_prompt('\n'.join(c['content'] for c in comments[:count]))
+            baseline_calls += views_per_comment
+            baseline_chars += views_per_comment * len(prompt)
+
+    stats = {
+        'batches': len(batches),
+        'deliveries': deliveries,
+        'baseline_calls': baseline_calls,
+        'baseline_chars': baseline_chars
+    }
+    return store, model, summarizer, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay the Comment fixture through the comment summary worker with a fake model')
+    parser.add_argument('--fixture', default=FIXTURE_PATH,
+                       help='Comment data in DynamoDB JSON (default: script/init/Comment.json)')
+    parser.add_argument('--batch-size', type=int, default=25,
+                       help='Stream records per worker invocation')
+    parser.add_argument('--redeliver-rate', type=float, default=0.3,
+                       help='Share of batches delivered twice')
+    parser.add_argument('--views-per-comment', type=int, default=1,
+                       help='Summary views between new comments, for the on-demand baseline')
+    parser.add_argument('--seed', type=int, default=7,
+                       help='Random seed for redeliveries')
+
+    args = parser.parse_args()
+
+    records = load_stream_records(args.fixture)
+    expected = {class_id: len(comments) for class_id, comments in new_comments_from_stream(records).items()}
+    print(f"🚀 Replaying {len(records)} comments for {len(expected)} classes in batches of {args.batch_size}")
+
+    store, model, summarizer, stats = replay(records, args.batch_size, args.redeliver_rate,
+                                             args.views_per_comment, args.seed)
+
+    problems = []
+    for class_id, count in sorted(expected.items(), key=lambda entry: int(entry[0]) if entry[0].isdigit() else entry[0]):
+        item = store.items.get(class_id)
+        if not item:
+            problems.append(f"class {class_id}: no summary stored")
+            continue
+        if int(item['commentCount']) != count:
+            problems.append(f"class {class_id}: {item['commentCount']} comments folded, expected {count}")
+        if item.get('score') is None:
+            problems.append(f"class {class_id}: no score parsed")
+    if store.pending_conflicts:
+        problems.append(f"simulated conflicts never hit: {sorted(store.pending_conflicts)}")
+
+    print(f"\n📊 Results:")
+    print(f"   Deliveries     {stats['deliveries']} ({stats['deliveries'] - stats['batches']} redelivered batches)")
+    print(f"   Model calls    {model.calls} (on-demand baseline {stats['baseline_calls']})")
+    print(f"   Prompt chars   {model.prompt_chars} (on-demand baseline {stats['baseline_chars']})")
+    print(f"   Conflicts      {store.conflicts} retried")
+    sample_id = sorted(store.items)[0] if store.items else None
+    if sample_id:
+        sample = store.items[sample_id]
+        print(f"   Class {sample_id}     score {sample['score']}/5 over {sample['commentCount']} comments, version {sample['version']}")
+
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print("\n✅ Every comment was folded exactly once")
+
+
+if __name__ == '__main__':
+    main()
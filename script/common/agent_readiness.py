@@ -0,0 +1,102 @@
+"""
+Agent Readiness
+Waits for a Bedrock Agent to finish preparing, polling with jittered adaptive backoff,
+and publishes how long it took per model
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from stack_progress import AdaptivePoller
+from structured_log import get_logger
+
+READY = 'READY'
+WAITING = 'WAITING'
+FAILED = 'FAILED'
+TIMED_OUT = 'TIMED_OUT'
+
+METRICS_NAMESPACE = 'CourseSearch/Deploy'
+
+
+class AgentPrepared:
+    """agentStatus after PrepareAgent; NOT_PREPARED only counts as failure once preparation has started"""
+    metric = 'AgentPrepare'
+    transitional = {'CREATING', 'UPDATING', 'PREPARING', 'VERSIONING'}
+    terminal_failures = {'FAILED', 'DELETING'}
+
+    def __init__(self, client, agent_id, initial_status=None, grace_seconds=30):
+        self.client = client
+        self.agent_id = agent_id
+        self.name = f"agent {agent_id}"
+        # The prepare call usually answers PREPARING; get_agent may still report the old status for a moment
+        self.started = initial_status == 'PREPARING'
+        self.grace_seconds = grace_seconds
+        self.model_id = None
+
+    def describe(self):
+        agent = self.client.get_agent(agentId=self.agent_id)['agent']
+        self.model_id = agent.get('foundationModel')
+        return agent['agentStatus'], agent.get('failureReasons') or []
+
+    def evaluate(self, status, elapsed):
+        if status == 'PREPARED':
+            return READY
+        if status in self.transitional:
+            self.started = self.started or status == 'PREPARING'
+            return WAITING
+        if status == 'NOT_PREPARED' and not self.started and elapsed < self.grace_seconds:
+            return WAITING
+        if status == 'NOT_PREPARED' or status in self.terminal_failures:
+            return FAILED
+        return WAITING
+
+
+def wait_ready(check, timeout=600, poller=None, log=None, clock=time.monotonic, sleep=time.sleep):
+    """Poll one check until it is ready, failed or timed out; returns (outcome, last status, seconds)"""
+    poller = poller or AdaptivePoller(initial=2.0, active=3.0, maximum=20.0, jitter=0.2)
+    log = log or get_logger('agent-readiness')
+    started_at = clock()
+    last_status = None
+    while True:
+        elapsed = clock() - started_at
+        changed = False
+        try:
+            status, reasons = check.describe()
+        except Exception as e:
+            log.warning(f"⚠️ Error checking {check.name}: {e}")
+            outcome = WAITING
+        else:
+            outcome = check.evaluate(status, elapsed)
+            changed = status != last_status
+            last_status = status
+            if changed:
+                log.info(f"⏳ {check.name}: {status} (+{elapsed:.0f}s)")
+            if outcome == FAILED:
+                log.error(f"❌ {check.name} failed with status: {status}")
+                for reason in reasons:
+                    log.error(f"  {reason}")
+
+        if outcome != WAITING:
+            return outcome, last_status, clock() - started_at
+        if elapsed >= timeout:
+            log.error(f"❌ {check.name} not ready after {timeout}s (status: {last_status})")
+            return TIMED_OUT, last_status, elapsed
+        sleep(poller.next_delay(changed))
+
+
+def wait_all(checks, timeout=600, log=None, **options):
+    """Wait for every check at once; returns {check.metric: (outcome, status, seconds)}"""
+    with ThreadPoolExecutor(max_workers=max(1, len(checks))) as executor:
+        futures = {check.metric: executor.submit(wait_ready, check, timeout, None, log, **options) for check in checks}
+        return {metric: future.result() for metric, future in futures.items()}
+
+
+def publish_timings(cloudwatch, model_id, results, namespace=METRICS_NAMESPACE):
+    """Send readiness durations and failures to CloudWatch with a ModelId dimension"""
+    dimensions = [{'Name': 'ModelId', 'Value': model_id or 'unknown'}]
+    metric_data = []
+    for metric, (outcome, status, seconds) in results.items():
+        metric_data.append({'MetricName': f"{metric}Seconds", 'Dimensions': dimensions, 'Value': seconds, 'Unit': 'Seconds'})
+        metric_data.append({'MetricName': f"{metric}Failures", 'Dimensions': dimensions,
+                            'Value': 0 if outcome == READY else 1, 'Unit': 'Count'})
+    cloudwatch.put_metric_data(Namespace=namespace, MetricData=metric_data)
@@ -0,0 +1,214 @@
+"""
+Multi-Stack Deployment Orchestrator
+Deploys the stacks of a manifest in dependency order, launching independent stacks together
+and watching every in-flight stack from a single polling loop
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from stack_progress import SUCCESS_STATUSES
+from structured_log import get_logger
+
+# "${stack-name.OutputKey}" in a parameter value is replaced with that stack's output
+OUTPUT_REFERENCE = re.compile(r'\$\{([^.}]+)\.([^}]+)\}')
+
+
+def load_manifest(path, only=None):
+    """Read and validate a deployment manifest; `only` limits it to those stacks and their dependencies"""
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    stacks = {}
+    for entry in manifest['stacks']:
+        name = entry['name']
+        if name in stacks:
+            raise ValueError(f"Duplicate stack in manifest: {name}")
+        stacks[name] = {
+            'name': name,
+            'type': entry['type'],
+            'template': os.path.join(base_dir, entry['template']),
+            'parameters': {k: str(v) for k, v in entry.get('parameters', {}).items()},
+            'depends_on': list(entry.get('depends_on', [])),
+            'options': dict(entry.get('options', {}))
+        }
+
+    for stack in stacks.values():
+        for dependency in stack['depends_on'] + [ref[0] for ref in _references(stack)]:
+            if dependency not in stacks:
+                raise ValueError(f"Stack {stack['name']} depends on unknown stack {dependency}")
+            if dependency not in stack['depends_on']:
+                stack['depends_on'].append(dependency)
+
+    if only:
+        selected = set()
+        queue = list(only)
+        while queue:
+            name = queue.pop()
+            if name not in stacks:
+                raise ValueError(f"Unknown stack: {name}")
+            if name not in selected:
+                selected.add(name)
+                queue.extend(stacks[name]['depends_on'])
+        stacks = {name: stack for name, stack in stacks.items() if name in selected}
+
+    deployment_waves(stacks.values())
+    return manifest, list(stacks.values())
+
+
+def deployment_waves(stacks):
+    """Group stacks into waves that can deploy together; raises on dependency cycles"""
+    remaining = {stack['name']: set(stack['depends_on']) for stack in stacks}
+    waves = []
+    while remaining:
+        wave = sorted(name for name, deps in remaining.items() if not deps)
+        if not wave:
+            raise ValueError(f"Dependency cycle between stacks: {', '.join(sorted(remaining))}")
+        waves.append(wave)
+        for name in wave:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(wave)
+    return waves
+
+
+def _references(stack):
+    return [match for value in stack['parameters'].values() for match in OUTPUT_REFERENCE.findall(value)]
+
+
+def resolve_parameters(parameters, outputs):
+    """Substitute ${stack.OutputKey} references with outputs of completed stacks"""
+    def substitute(match):
+        stack_name, key = match.groups()
+        if key not in outputs.get(stack_name, {}):
+            raise KeyError(f"Stack {stack_name} has no output {key}")
+        return outputs[stack_name][key]
+
+    return {k: OUTPUT_REFERENCE.sub(substitute, v) for k, v in parameters.items()}
+
+
+class DeploymentOrchestrator:
+    def __init__(self, deployers, idle_interval=0.5, max_workers=4, clock=time.monotonic, sleep=time.sleep):
+        """`deployers` maps a manifest stack type to the deployer instance that handles it"""
+        self.deployers = deployers
+        self.idle_interval = idle_interval
+        self.max_workers = max_workers
+        self.clock = clock
+        self.sleep = sleep
+        self.log = get_logger('deploy-orchestrator')
+
+    def _start(self, stack, outputs):
+        """Worker thread: compute parameters and issue create/update without waiting"""
+        deployer = self.deployers[stack['type']]
+        parameters = resolve_parameters(stack['parameters'], outputs)
+        parameters.update(deployer.before_deploy(stack))
+        return deployer.start_stack_operation(stack['name'], stack['template'], parameters)
+
+    def _complete(self, executor, stack, outputs, finishing):
+        """Record outputs so dependents can start, and run the deployer's follow-up (e.g. agent preparation) in a worker"""
+        deployer = self.deployers[stack['type']]
+        outputs[stack['name']] = deployer._get_stack_outputs(stack['name'])
+        finishing[executor.submit(deployer.after_deploy, stack, outputs[stack['name']])] = stack
+
+    def run(self, stacks):
+        """Deploy all stacks; returns {name: result} with status, seconds and outputs"""
+        pending = {stack['name']: stack for stack in stacks}
+        results = {}
+        outputs = {}
+        starting = {}
+        in_flight = {}
+        finishing = {}
+        started_at = {}
+        run_start = self.clock()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or starting or in_flight or finishing:
+                progressed = False
+
+                # Launch every stack whose dependencies have completed
+                for name, stack in list(pending.items()):
+                    blocked = [d for d in stack['depends_on'] if results.get(d, {}).get('status') in ('FAILED', 'SKIPPED')]
+                    if blocked:
+                        del pending[name]
+                        results[name] = {'status': 'SKIPPED', 'seconds': 0.0, 'reason': f"dependency failed: {', '.join(blocked)}"}
+                        self.log.warning(f"⏭️ Skipping {name}: dependency failed ({', '.join(blocked)})")
+                        progressed = True
+                    elif all(d in outputs for d in stack['depends_on']):
+                        del pending[name]
+                        started_at[name] = self.clock()
+                        starting[executor.submit(self._start, stack, dict(outputs))] = stack
+                        progressed = True
+
+                for future in [f for f in starting if f.done()]:
+                    stack = starting.pop(future)
+                    progressed = True
+                    try:
+                        operation = future.result()
+                    except Exception as e:
+                        self._fail(results, started_at, stack['name'], f"{e}")
+                        continue
+                    if operation == 'PREVIEW':
+                        # Dependents preview against the outputs the stack has today
+                        deployer = self.deployers[stack['type']]
+                        outputs[stack['name']] = deployer._get_stack_outputs(stack['name']) if deployer.stack_exists(stack['name']) else {}
+                        results[stack['name']] = {'status': 'PREVIEWED', 'seconds': self.clock() - started_at[stack['name']]}
+                    elif operation:
+                        in_flight[stack['name']] = (stack, self.deployers[stack['type']].watch(stack['name']))
+                    else:
+                        self._complete(executor, stack, outputs, finishing)
+
+                # One polling pass covers every stack that is due; each backs off on its own schedule
+                for name, (stack, progress) in list(in_flight.items()):
+                    if progress.next_poll_at > self.clock():
+                        continue
+                    try:
+                        status = progress.poll()
+                    except Exception as e:
+                        self.log.warning(f"⚠️ Error checking {name}: {e}")
+                        progress.next_poll_at = self.clock() + progress.poller.maximum
+                        continue
+                    if status is None:
+                        continue
+                    del in_flight[name]
+                    progressed = True
+                    if status in SUCCESS_STATUSES:
+                        self.log.info(f"✅ {name}: {status} after {self.clock() - started_at[name]:.0f}s")
+                        self._complete(executor, stack, outputs, finishing)
+                    else:
+                        progress.report_failures()
+                        self._fail(results, started_at, name, status)
+
+                for future in [f for f in finishing if f.done()]:
+                    stack = finishing.pop(future)
+                    progressed = True
+                    try:
+                        follow_up_ok = future.result()
+                    except Exception as e:
+                        self.log.error(f"❌ Follow-up for {stack['name']} failed: {e}")
+                        follow_up_ok = False
+                    results[stack['name']] = {
+                        'status': 'COMPLETE' if follow_up_ok else 'FOLLOW_UP_FAILED',
+                        'seconds': self.clock() - started_at[stack['name']],
+                        'outputs': outputs[stack['name']]
+                    }
+
+                if not progressed and (pending or starting or in_flight or finishing):
+                    delay = self.idle_interval if (starting or finishing) or not in_flight else float('inf')
+                    if in_flight:
+                        delay = min(delay, min(progress.next_poll_at for _, progress in in_flight.values()) - self.clock())
+                    self.sleep(max(0.0, delay))
+
+        total = self.clock() - run_start
+        serial = sum(result['seconds'] for result in results.values())
+        self.log.info(f"\n🎉 {len(results)} stacks processed in {total:.0f}s (sequential would be about {serial:.0f}s)")
+        for name, result in results.items():
+            self.log.info(f"   {name}: {result['status']} ({result['seconds']:.0f}s)")
+        return results
+
+    def _fail(self, results, started_at, name, reason):
+        results[name] = {'status': 'FAILED', 'seconds': self.clock() - started_at.get(name, self.clock()), 'reason': reason}
+        self.log.error(f"❌ {name} failed: {reason}")
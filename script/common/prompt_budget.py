@@ -0,0 +1,63 @@
+"""
+Prompt token budgets
+Cheap token estimates and per-model input limits for code that builds Bedrock prompts,
+so a prompt can be trimmed before it is sent instead of growing with the data behind it
+"""
+
+# Context window in tokens of the models these stacks call
+CONTEXT_WINDOWS = {
+    'us.amazon.nova-pro-v1:0': 300000,
+    'us.amazon.nova-lite-v1:0': 300000,
+    'us.amazon.nova-micro-v1:0': 128000,
+    'anthropic.claude-3-sonnet-20240229-v1:0': 200000,
+    'anthropic.claude-3-haiku-20240307-v1:0': 200000
+}
+
+# Used for model IDs not listed above
+DEFAULT_CONTEXT_WINDOW = 32000
+
+# Tokenizers split English into roughly four characters per token; Hangul and other
+# non-ASCII text is counted as one token per character so the estimate errs high
+ASCII_CHARS_PER_TOKEN = 4
+
+ELLIPSIS = '…'
+
+
+def estimate_tokens(text):
+    """Approximate token count of a prompt fragment"""
+    text = str(text or '')
+    if text.isascii():
+        return -(-len(text) // ASCII_CHARS_PER_TOKEN)
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    ascii_chars = len(text) - non_ascii
+    return -(-ascii_chars // ASCII_CHARS_PER_TOKEN) + non_ascii
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Text cut to about `max_tokens`, at a word boundary when one is close, with an ellipsis"""
+    text = str(text or '')
+    if max_tokens <= 0:
+        return ''
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Leave room for the ellipsis, which counts as one token
+    allowance = (max_tokens - 1) * ASCII_CHARS_PER_TOKEN
+    used = 0
+    end = 0
+    for position, char in enumerate(text):
+        used += 1 if ord(char) <= 127 else ASCII_CHARS_PER_TOKEN
+        if used > allowance:
+            break
+        end = position + 1
+    cut = text[:end]
+    boundary = cut.rfind(' ')
+    if boundary > len(cut) * 0.8:
+        cut = cut[:boundary]
+    return cut.rstrip(' ,.;:-') + ELLIPSIS
+
+
+def input_budget(model_id, budget=None, max_output_tokens=0):
+    """Tokens a prompt for `model_id` may use: `budget` if given, never more than the context window allows"""
+    limit = CONTEXT_WINDOWS.get(model_id, DEFAULT_CONTEXT_WINDOW) - max_output_tokens
+    return min(budget, limit) if budget else limit
@@ -0,0 +1,327 @@
+"""
+CloudFormation Stack Deployer
+Shared create/update/wait/outputs and Lambda packaging logic for the stack deployers
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+import boto3
+from botocore.exceptions import ClientError, NoCredentialsError
+
+from stack_progress import FAILURE_STATUSES, SUCCESS_STATUSES, AdaptivePoller, StackProgress, latest_event_id
+from structured_log import get_logger
+
+# Stack tags recording what was last deployed
+DEPLOYMENT_HASH_TAG = 'DeploymentHash'
+TEMPLATE_HASH_TAG = 'TemplateHash'
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.deploy-state.json')
+
+
+class DeploymentState:
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        """Local record of the last deployment hash per stack and whether its follow-up ran"""
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, key):
+        with self._lock:
+            return dict(self.entries.get(key, {}))
+
+    def update(self, key, **fields):
+        with self._lock:
+            self.entries.setdefault(key, {}).update(fields)
+            if self.path:
+                with open(self.path, 'w') as f:
+                    json.dump(self.entries, f, indent=2, sort_keys=True)
+
+
+class CloudFormationDeployer:
+    # Overridden by each deployer
+    logger_name = 'deploy'
+    capabilities = ['CAPABILITY_IAM']
+    # Longest pause between event polls while a stack is quiet
+    max_poll_interval = 15.0
+
+    def __init__(self, region='us-west-2', profile=None, log_level=None, state_path=DEFAULT_STATE_PATH):
+        """Initialize the deployer with AWS session"""
+        self.log = get_logger(self.logger_name, level=log_level)
+        self.state = DeploymentState(state_path)
+        # Leave change sets unexecuted for review / redeploy even when the hash matches
+        self.preview = False
+        self.force = False
+        self._event_cursors = {}
+        try:
+            if profile:
+                session = boto3.Session(profile_name=profile)
+            else:
+                session = boto3.Session()
+
+            self.session = session
+            self.cf_client = session.client('cloudformation', region_name=region)
+            self.region = region
+            self._create_clients(session)
+
+            # Test credentials
+            sts = session.client('sts')
+            identity = sts.get_caller_identity()
+            self.account_id = identity['Account']
+            self.log.info(f"✅ Connected to AWS Account: {identity['Account']}")
+            self.log.info(f"✅ Region: {region}")
+
+        except NoCredentialsError:
+            self.log.error("❌ AWS credentials not found. Please configure your credentials.")
+            sys.exit(1)
+        except Exception as e:
+            self.log.error(f"❌ Error initializing AWS session: {e}")
+            sys.exit(1)
+
+    def _create_clients(self, session):
+        """Create service clients beyond CloudFormation"""
+
+    def before_deploy(self, stack):
+        """Extra stack parameters computed right before a manifest stack is deployed"""
+        return {}
+
+    def after_deploy(self, stack, outputs):
+        """Follow-up work once a manifest stack has completed; returns False on failure"""
+        return True
+
+    def package_lambda(self, source_dir, bucket_name=None, prefix='course-search', extra_files=()):
+        """Zip a Lambda source directory, plus shared modules at the archive root, and upload it to S3 (needs self.s3_client)"""
+        try:
+            bucket_name = bucket_name or f"bedrock-agent-artifacts-{self.account_id}-{self.region}"
+            
+            # Build the archive in memory with fixed timestamps so unchanged code hashes the same
+            buffer = io.BytesIO()
+            sources = []
+            for root, dirs, files in os.walk(source_dir):
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                for file_name in sorted(files):
+                    if file_name.endswith('.py'):
+                        file_path = os.path.join(root, file_name)
+                        sources.append((file_path, os.path.relpath(file_path, source_dir)))
+            sources.extend((file_path, os.path.basename(file_path)) for file_path in extra_files)
+            
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+                for file_path, arc_name in sources:
+                    info = zipfile.ZipInfo(arc_name, date_time=(1980, 1, 1, 0, 0, 0))
+                    info.external_attr = 0o644 << 16
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with open(file_path, 'rb') as f:
+                        archive.writestr(info, f.read())
+            
+            package = buffer.getvalue()
+            key = f"{prefix}/{hashlib.sha256(package).hexdigest()[:16]}.zip"
+            
+            # Create the artifact bucket on first use
+            try:
+                self.s3_client.head_bucket(Bucket=bucket_name)
+            except ClientError:
+                self.log.info(f"🪣 Creating artifact bucket: {bucket_name}")
+                if self.region == 'us-east-1':
+                    self.s3_client.create_bucket(Bucket=bucket_name)
+                else:
+                    self.s3_client.create_bucket(
+                        Bucket=bucket_name,
+                        CreateBucketConfiguration={'LocationConstraint': self.region}
+                    )
+            
+            # Content-addressed key: skip the upload when this exact package is already there
+            try:
+                self.s3_client.head_object(Bucket=bucket_name, Key=key)
+                self.log.info(f"✅ Lambda package unchanged: s3://{bucket_name}/{key}")
+            except ClientError:
+                self.s3_client.put_object(Bucket=bucket_name, Key=key, Body=package)
+                self.log.info(f"📦 Uploaded Lambda package ({len(package)} bytes): s3://{bucket_name}/{key}")
+            
+            return bucket_name, key
+            
+        except Exception as e:
+            self.log.error(f"❌ Error packaging Lambda code: {e}")
+            return None, None
+
+    def deploy_stack(self, stack_name, template_file, parameters=None):
+        """Deploy CloudFormation stack"""
+        try:
+            operation = self.start_stack_operation(stack_name, template_file, parameters)
+
+            # Wait for completion
+            if operation in ('CREATE', 'UPDATE'):
+                if self._wait_for_stack_completion(stack_name, operation) not in SUCCESS_STATUSES:
+                    return None
+
+            # Get outputs
+            outputs = self._get_stack_outputs(stack_name)
+            return outputs
+
+        except Exception as e:
+            self.log.error(f"❌ Error deploying stack: {e}")
+            return None
+
+    def start_stack_operation(self, stack_name, template_file, parameters=None):
+        """Create and execute a change set without waiting for it to finish
+
+        Returns 'CREATE' or 'UPDATE' while the stack operation runs, None when the stack is already
+        at this template and parameters, or 'PREVIEW' when the change set was left for review.
+        """
+        # Read template file
+        with open(template_file, 'r') as f:
+            template_body = f.read()
+
+        parameters = {k: str(v) for k, v in (parameters or {}).items()}
+        template_hash = hashlib.sha256(template_body.encode('utf-8')).hexdigest()
+        deployment_hash = hashlib.sha256(
+            json.dumps([template_hash, parameters, self.capabilities], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+        self.log.info(f"🚀 Deploying stack: {stack_name}")
+        stack = self._describe_stack(stack_name)
+        tags = {tag['Key']: tag['Value'] for tag in (stack or {}).get('Tags', [])}
+        state_key = f"{self.region}:{stack_name}"
+
+        # Unchanged template and parameters: nothing to write
+        if (stack and not self.force and tags.get(DEPLOYMENT_HASH_TAG) == deployment_hash
+                and stack['StackStatus'] in SUCCESS_STATUSES | {'UPDATE_ROLLBACK_COMPLETE'}):
+            self.log.info(f"✅ Stack {stack_name} is unchanged ({deployment_hash[:12]}), skipping")
+            self.state.update(state_key, hash=deployment_hash)
+            return None
+
+        creating = stack is None or stack['StackStatus'] == 'REVIEW_IN_PROGRESS'
+        change_set = {
+            'StackName': stack_name,
+            'ChangeSetName': f"deploy-{deployment_hash[:12]}-{int(time.time())}",
+            'ChangeSetType': 'CREATE' if creating else 'UPDATE',
+            'Parameters': [{'ParameterKey': k, 'ParameterValue': v} for k, v in parameters.items()],
+            'Capabilities': self.capabilities,
+            'Tags': [
+                {'Key': DEPLOYMENT_HASH_TAG, 'Value': deployment_hash},
+                {'Key': TEMPLATE_HASH_TAG, 'Value': template_hash}
+            ]
+        }
+        # Only send the template body when it differs from what the stack already runs
+        if not creating and tags.get(TEMPLATE_HASH_TAG) == template_hash:
+            change_set['UsePreviousTemplate'] = True
+        else:
+            change_set['TemplateBody'] = template_body
+
+        self.log.info(f"📝 {'Creating' if creating else 'Updating'} stack {stack_name} through change set {change_set['ChangeSetName']}")
+        change_set_id = self.cf_client.create_change_set(**change_set)['Id']
+        description = self._wait_for_change_set(change_set_id)
+
+        if description['Status'] == 'FAILED':
+            reason = description.get('StatusReason', '')
+            if "didn't contain changes" in reason or 'No updates are to be performed' in reason:
+                self.log.info(f"✅ Stack {stack_name} is already up to date")
+                self.cf_client.delete_change_set(ChangeSetName=change_set_id)
+                self.state.update(state_key, hash=deployment_hash)
+                return None
+            raise RuntimeError(f"Change set for {stack_name} failed: {reason}")
+
+        self._print_changes(stack_name, description)
+        if self.preview:
+            self.log.info(f"🔍 Change set left for review: {change_set_id}")
+            return 'PREVIEW'
+
+        # Progress is reported from the events after this one
+        self._event_cursors[stack_name] = latest_event_id(self.cf_client, stack_name)
+        self.cf_client.execute_change_set(ChangeSetName=change_set_id)
+        self.state.update(state_key, hash=deployment_hash, follow_up=None)
+        return change_set['ChangeSetType']
+
+    def _describe_stack(self, stack_name):
+        """Stack description, or None when it does not exist"""
+        try:
+            return self.cf_client.describe_stacks(StackName=stack_name)['Stacks'][0]
+        except ClientError as e:
+            if 'does not exist' in str(e):
+                return None
+            raise
+
+    def stack_exists(self, stack_name):
+        return self._describe_stack(stack_name) is not None
+
+    def _wait_for_change_set(self, change_set_id, delay=2, max_attempts=150):
+        """Poll until the change set has been computed"""
+        for _ in range(max_attempts):
+            description = self.cf_client.describe_change_set(ChangeSetName=change_set_id)
+            if description['Status'] in ('CREATE_COMPLETE', 'FAILED'):
+                return description
+            time.sleep(delay)
+        raise RuntimeError(f"Timed out waiting for change set {change_set_id}")
+
+    def _print_changes(self, stack_name, description):
+        changes = description.get('Changes', [])
+        self.log.info(f"📋 {len(changes)} changes for {stack_name}:")
+        for change in changes:
+            resource = change.get('ResourceChange', {})
+            replacement = resource.get('Replacement')
+            self.log.info(f"  {resource.get('Action', 'N/A'):<8} {resource.get('LogicalResourceId', 'N/A')} "
+                          f"({resource.get('ResourceType', 'N/A')})" + (f" replacement={replacement}" if replacement else ''))
+
+    def follow_up_done(self, stack_name):
+        """True when after_deploy already ran for the stack's current deployment hash"""
+        entry = self.state.get(f"{self.region}:{stack_name}")
+        return bool(entry.get('hash')) and entry.get('follow_up') == entry.get('hash')
+
+    def mark_follow_up_done(self, stack_name):
+        key = f"{self.region}:{stack_name}"
+        self.state.update(key, follow_up=self.state.get(key).get('hash'))
+
+    def stack_status(self, stack_name):
+        """Current StackStatus"""
+        stack = self._describe_stack(stack_name)
+        return stack['StackStatus'] if stack else 'DELETE_COMPLETE'
+
+    def watch(self, stack_name):
+        """Progress tracker for the operation last started on the stack"""
+        return StackProgress(
+            self.cf_client, stack_name,
+            after_event_id=self._event_cursors.get(stack_name),
+            poller=AdaptivePoller(maximum=self.max_poll_interval),
+            log=self.log
+        )
+
+    def _wait_for_stack_completion(self, stack_name, operation):
+        """Stream stack events until the operation reaches a terminal status"""
+        self.log.info(f"⏳ Waiting for stack {operation.lower()} to complete...")
+
+        progress = self.watch(stack_name)
+        status = progress.wait()
+        elapsed = progress.clock() - progress.started_at
+
+        if status in SUCCESS_STATUSES:
+            self.log.info(f"✅ Stack {operation.lower()} completed successfully in {elapsed:.0f}s!")
+        else:
+            self.log.error(f"❌ Stack {operation.lower()} failed with status: {status}")
+            progress.report_failures()
+        return status
+
+    def _get_stack_outputs(self, stack_name):
+        """Get CloudFormation stack outputs"""
+        try:
+            response = self.cf_client.describe_stacks(StackName=stack_name)
+            outputs = {}
+
+            if 'Outputs' in response['Stacks'][0]:
+                for output in response['Stacks'][0]['Outputs']:
+                    outputs[output['OutputKey']] = output['OutputValue']
+
+            return outputs
+
+        except Exception as e:
+            self.log.error(f"❌ Error getting stack outputs: {e}")
+            return {}
@@ -0,0 +1,130 @@
+"""
+Stack Progress
+Tails describe_stack_events from a cursor and reports resource progress as it happens,
+polling quickly while the stack is busy and backing off while it is quiet
+"""
+
+import random
+import time
+
+from structured_log import get_logger
+
+SUCCESS_STATUSES = {'CREATE_COMPLETE', 'UPDATE_COMPLETE', 'IMPORT_COMPLETE'}
+FAILURE_STATUSES = {
+    'CREATE_FAILED', 'ROLLBACK_COMPLETE', 'ROLLBACK_FAILED', 'DELETE_COMPLETE', 'DELETE_FAILED',
+    'UPDATE_FAILED', 'UPDATE_ROLLBACK_COMPLETE', 'UPDATE_ROLLBACK_FAILED', 'IMPORT_ROLLBACK_COMPLETE'
+}
+
+
+class AdaptivePoller:
+    def __init__(self, initial=1.0, active=2.0, maximum=15.0, factor=1.5, jitter=0.0, rng=None):
+        """Delays start at `initial`, grow by `factor` while nothing happens and drop to `active` on new events
+
+        With `jitter`, each delay is shortened by a random share of up to that fraction so
+        concurrent pollers do not hit the API in lockstep.
+        """
+        self.active = active
+        self.maximum = maximum
+        self.factor = factor
+        self.delay = initial
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def next_delay(self, activity):
+        current = self.delay
+        self.delay = min(self.active, self.maximum) if activity else min(self.delay * self.factor, self.maximum)
+        if self.jitter:
+            current *= 1.0 - self.jitter * self.rng.random()
+        return current
+
+
+def latest_event_id(cf_client, stack_name):
+    """Newest event of the stack, used as the cursor before starting an operation"""
+    events = cf_client.describe_stack_events(StackName=stack_name)['StackEvents']
+    return events[0]['EventId'] if events else None
+
+
+class StackProgress:
+    def __init__(self, cf_client, stack_name, after_event_id=None, poller=None, log=None, clock=time.monotonic):
+        """Watch one stack operation; only events newer than `after_event_id` are reported"""
+        self.cf_client = cf_client
+        self.stack_name = stack_name
+        self.last_event_id = after_event_id
+        self.poller = poller or AdaptivePoller()
+        self.log = log or get_logger('stack-progress')
+        self.clock = clock
+        self.started_at = clock()
+        self.next_poll_at = self.started_at
+        self.status = None
+        self.failures = []
+        self.resources_done = set()
+
+    @property
+    def done(self):
+        return self.status is not None
+
+    def poll(self):
+        """Read and report new events; returns the terminal stack status once it appears, else None"""
+        events = self._new_events()
+        for event in events:
+            self._report(event)
+        self.next_poll_at = self.clock() + self.poller.next_delay(bool(events))
+        return self.status
+
+    def wait(self, timeout=3600, sleep=time.sleep):
+        """Poll until the stack reaches a terminal status"""
+        deadline = self.started_at + timeout
+        while not self.done:
+            if self.clock() > deadline:
+                raise TimeoutError(f"Stack {self.stack_name} did not finish within {timeout}s")
+            sleep(max(0.0, self.next_poll_at - self.clock()))
+            self.poll()
+        return self.status
+
+    def _new_events(self):
+        """Events after the cursor, oldest first; pages are only read until the cursor is reached"""
+        new_events = []
+        kwargs = {'StackName': self.stack_name}
+        while True:
+            response = self.cf_client.describe_stack_events(**kwargs)
+            for event in response['StackEvents']:
+                if event['EventId'] == self.last_event_id:
+                    kwargs = None
+                    break
+                new_events.append(event)
+            if kwargs is None or not response.get('NextToken'):
+                break
+            kwargs['NextToken'] = response['NextToken']
+
+        if new_events:
+            self.last_event_id = new_events[0]['EventId']
+        return list(reversed(new_events))
+
+    def _report(self, event):
+        resource = event.get('LogicalResourceId', 'N/A')
+        status = event.get('ResourceStatus', 'N/A')
+        reason = event.get('ResourceStatusReason', '')
+        elapsed = self.clock() - self.started_at
+
+        is_stack = event.get('ResourceType') == 'AWS::CloudFormation::Stack' and resource == self.stack_name
+        if is_stack and (status in SUCCESS_STATUSES or status in FAILURE_STATUSES):
+            self.status = status
+        if not is_stack and status.endswith('_COMPLETE'):
+            self.resources_done.add(resource)
+
+        line = f"  [{self.stack_name} +{elapsed:.0f}s] {resource} {status}" + (f": {reason}" if reason else '')
+        if status.endswith('_FAILED'):
+            self.failures.append(f"{resource}: {reason or status}")
+            self.log.error(f"❌{line}")
+        elif is_stack and status in FAILURE_STATUSES:
+            self.log.error(f"❌{line}")
+        else:
+            self.log.info(f"⏳{line} ({len(self.resources_done)} resources done)")
+
+    def report_failures(self):
+        """Summarize failed resources after the stack ended badly"""
+        if not self.failures:
+            return
+        self.log.error(f"\n📋 Failed resources in {self.stack_name}:")
+        for failure in self.failures:
+            self.log.error(f"  {failure}")
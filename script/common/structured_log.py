@@ -0,0 +1,123 @@
+"""
+Structured Logging
+Leveled logger shared by the Lambda functions and the deployment scripts.
+Full payloads are logged for a sampled share of calls, capped in size,
+and only serialized once a line is actually going to be written
+"""
+
+import copy
+import json
+import os
+import random
+import sys
+import threading
+import traceback
+from datetime import datetime, timezone
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+
+class StructuredLogger:
+    def __init__(self, name, level=None, sample_rate=None, max_payload_bytes=None, fmt=None, stream=None, rng=None):
+        """Configure from arguments, falling back to LOG_LEVEL, LOG_SAMPLE_RATE, LOG_MAX_PAYLOAD_BYTES and LOG_FORMAT"""
+        self.name = name
+        self.level = LEVELS[(level or os.environ.get('LOG_LEVEL', 'INFO')).upper()]
+        self.sample_rate = float(sample_rate if sample_rate is not None else os.environ.get('LOG_SAMPLE_RATE', '0.01'))
+        self.max_payload_bytes = int(max_payload_bytes if max_payload_bytes is not None
+                                     else os.environ.get('LOG_MAX_PAYLOAD_BYTES', '4096'))
+        # JSON lines inside Lambda (queryable with Logs Insights), readable text on a terminal
+        self.fmt = fmt or os.environ.get('LOG_FORMAT') or ('json' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'text')
+        self.stream = stream
+        self.rng = rng or random.random
+        self.context = {}
+        self._lock = threading.Lock()
+
+    def bind(self, **fields):
+        """Logger sharing this configuration that adds `fields` to every line"""
+        child = copy.copy(self)
+        child.context = dict(self.context, **fields)
+        return child
+
+    def enabled(self, level):
+        return LEVELS[level] >= self.level
+
+    def sample(self):
+        """Decide once per request whether its payloads are logged; DEBUG logs all of them"""
+        return self.level <= LEVELS['DEBUG'] or self.rng() < self.sample_rate
+
+    def debug(self, message, **fields):
+        self.log('DEBUG', message, **fields)
+
+    def info(self, message, **fields):
+        self.log('INFO', message, **fields)
+
+    def warning(self, message, **fields):
+        self.log('WARNING', message, **fields)
+
+    def error(self, message, **fields):
+        self.log('ERROR', message, **fields)
+
+    def exception(self, message, **fields):
+        """Error line carrying the current traceback"""
+        if self.enabled('ERROR'):
+            self._write('ERROR', message, dict(fields, traceback=traceback.format_exc()))
+
+    def log(self, level, message, **fields):
+        if self.enabled(level):
+            self._write(level, message, fields)
+
+    def payload(self, message, payload, sampled=None, level='INFO', **fields):
+        """Log a full payload for sampled calls only; `payload` may be a callable producing it"""
+        if not self.enabled(level):
+            return False
+        if sampled is None:
+            sampled = self.sample()
+        if not sampled:
+            return False
+
+        value = payload() if callable(payload) else payload
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+        encoded = text.encode('utf-8')
+        if len(encoded) > self.max_payload_bytes:
+            text = encoded[:self.max_payload_bytes].decode('utf-8', 'ignore')
+            fields = dict(fields, truncated=True, payload_bytes=len(encoded))
+        self._write(level, message, dict(fields, payload=text))
+        return True
+
+    def _write(self, level, message, fields):
+        # Callables are only evaluated here, after the level check
+        fields = {k: v() if callable(v) else v for k, v in dict(self.context, **fields).items()}
+
+        if self.fmt == 'json':
+            record = {
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+                'level': level,
+                'logger': self.name,
+                'message': message
+            }
+            record.update(fields)
+            line = json.dumps(record, ensure_ascii=False, default=str)
+        else:
+            payload = fields.pop('payload', None)
+            trace = fields.pop('traceback', None)
+            line = message + ''.join(f" {k}={v}" for k, v in fields.items())
+            if payload is not None:
+                line += f"\n{payload}"
+            if trace:
+                line += f"\n{trace.rstrip()}"
+
+        stream = self.stream or sys.stdout
+        with self._lock:
+            stream.write(line + '\n')
+            stream.flush()
+
+
+def get_logger(name, **options):
+    """Process-wide logger for `name`, created on first use"""
+    with _loggers_lock:
+        if name not in _loggers:
+            _loggers[name] = StructuredLogger(name, **options)
+        return _loggers[name]
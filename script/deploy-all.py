@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Environment Deployment Script
+Deploys every stack in deploy-manifest.json, running independent stacks concurrently
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, 'common'))
+
+from orchestrator import DeploymentOrchestrator, deployment_waves, load_manifest
+
+# Manifest stack type -> (deploy script, deployer class)
+DEPLOYERS = {
+    'agent': ('agent-cloudformation/deploy-agent.py', 'BedrockAgentDeployer'),
+    'stepfunction': ('stepfunction-cloudformation/deploy-stepfunction.py', 'StepFunctionsDeployer'),
+    'comment-summary': ('comment-summary-cloudformation/deploy-comment-summary.py', 'CommentSummaryDeployer')
+}
+
+
+def load_deployer_class(stack_type):
+    """Import a deployer class from its (hyphenated) deploy script"""
+    path, class_name = DEPLOYERS[stack_type]
+    spec = importlib.util.spec_from_file_location(f"deploy_{stack_type}", os.path.join(SCRIPT_DIR, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, class_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deploy all stacks of the environment with CloudFormation')
+    parser.add_argument('--manifest', default=os.path.join(SCRIPT_DIR, 'deploy-manifest.json'),
+                       help='Deployment manifest (stacks, parameters, dependencies)')
+    parser.add_argument('--only', action='append', default=[],
+                       help='Deploy only this stack and its dependencies (repeatable)')
+    parser.add_argument('--region', default='us-west-2',
+                       help='AWS region')
+    parser.add_argument('--profile',
+                       help='AWS profile name')
+    parser.add_argument('--max-poll-interval', type=float, default=15.0,
+                       help='Longest pause between stack event polls while a stack is quiet')
+    parser.add_argument('--max-workers', type=int, default=4,
+                       help='Concurrent stack launches and follow-up tasks')
+    parser.add_argument('--preview', action='store_true',
+                       help='Create and print change sets without executing them')
+    parser.add_argument('--force', action='store_true',
+                       help='Redeploy stacks even when their template and parameter hash is unchanged')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Print the deployment waves without deploying')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level (default: LOG_LEVEL or INFO)')
+
+    args = parser.parse_args()
+
+    try:
+        manifest, stacks = load_manifest(args.manifest, only=args.only)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Invalid manifest: {e}")
+        sys.exit(1)
+
+    region = manifest.get('region', args.region)
+    print(f"🎯 Deployment Plan ({region}):")
+    for number, wave in enumerate(deployment_waves(stacks), 1):
+        print(f"   Wave {number}: {', '.join(wave)}")
+    print()
+
+    if args.dry_run:
+        return
+
+    deployers = {}
+    for stack_type in sorted({stack['type'] for stack in stacks}):
+        if stack_type not in DEPLOYERS:
+            print(f"❌ Unknown stack type: {stack_type}")
+            sys.exit(1)
+        deployer_class = load_deployer_class(stack_type)
+        deployers[stack_type] = deployer_class(region=region, profile=args.profile, log_level=args.log_level)
+        deployers[stack_type].preview = args.preview
+        deployers[stack_type].force = args.force
+        deployers[stack_type].max_poll_interval = args.max_poll_interval
+
+    orchestrator = DeploymentOrchestrator(deployers, max_workers=args.max_workers)
+    results = orchestrator.run(stacks)
+
+    if any(result['status'] not in ('COMPLETE', 'PREVIEWED') for result in results.values()):
+        print("❌ Deployment finished with failures")
+        sys.exit(1)
+
+    print(f"\n✅ All stacks deployed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+Emits Course/Class/Comment/Channel items in the DynamoDB JSON shape of script/init/*.json,
+with a Zipfian number of comments per class, streamed to files or straight into the seed loader
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+COURSE_NAMES = ['Container', 'Modernization', 'AI/ML', 'DevOps', 'Serverless', 'Data', 'Security', 'Networking']
+SERVICES = ['Amazon EKS', 'Amazon ECS', 'AWS Lambda', 'Amazon DynamoDB', 'Amazon SageMaker', 'Amazon Bedrock',
+            'Amazon S3', 'Amazon CloudFront', 'AWS Step Functions', 'AWS AppSync', 'AWS Amplify',
+            'AWS CodePipeline', 'Amazon VPC Lattice', 'Amazon Aurora', 'Amazon Transcribe', 'AWS Fargate']
+TOPICS = ['Getting Started', 'Deep Dive', 'Best Practices', 'Cost Optimization', 'Security', 'Observability',
+          'Migration', 'Serverless Patterns', 'Workshop', 'CI/CD', 'Scaling', 'Troubleshooting']
+DIFFICULTIES = ['beginner', 'intermediate', 'advanced']
+WORDS = ('build deploy scale monitor secure migrate automate optimize container cluster function pipeline '
+         'model data stream event query index cache network storage workload service application team '
+         'production cost latency throughput resilient managed').split()
+COMMENTS = [
+    'This video was extremely helpful! Learned a lot about this topic.',
+    'Great explanation, but the demo part went a bit too fast.',
+    'Clear and concise. Would love a follow-up on advanced use cases.',
+    'The audio quality could be better, content was good though.',
+    'Exactly what I needed for my project, thanks!',
+    'A bit too basic for me, expected more depth.',
+    '설명이 정말 명확해서 이해하기 쉬웠습니다.',
+    '실습 예제가 더 있었으면 좋겠어요.'
+]
+
+START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _s(value):
+    return {'S': str(value)}
+
+
+def _n(value):
+    return {'N': str(value)}
+
+
+def _timestamp(rng, spread_days=365):
+    moment = START_TIME + timedelta(seconds=rng.randrange(spread_days * 86400))
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _put(item):
+    return {'PutRequest': {'Item': item}}
+
+
+def generate_courses(count):
+    for number in range(1, count + 1):
+        name = COURSE_NAMES[(number - 1) % len(COURSE_NAMES)]
+        yield _put({'id': _s(number), 'name': _s(name), 'createdAt': _s('replace_time'),
+                    'updatedAt': _s('replace_time')})
+
+
+def generate_channels(count, rng):
+    for number in range(1, count + 1):
+        yield _put({'id': _s(uuid.UUID(int=rng.getrandbits(128))), 'icon': _s('icon'),
+                    'name': _s(f"channel-{number}"), 'createdAt': _s('replace_time'),
+                    'updatedAt': _s('replace_time')})
+
+
+def generate_classes(count, course_count, rng, transcript_words=300, hidden_ratio=0.05):
+    for number in range(1, count + 1):
+        service = rng.choice(SERVICES)
+        created = _timestamp(rng)
+        yield _put({
+            'id': _s(number),
+            'courseId': _s(rng.randint(1, course_count)),
+            'name': _s(f"{service}: {rng.choice(TOPICS)} ({number})"),
+            'url': _s(f"https://example.cloudfront.net/videos/{number}.mp4"),
+            'author': _s(f"Instructor {rng.randint(1, 500)}"),
+            'class_flag': _n(10 if rng.random() < hidden_ratio else 0),
+            'description': _s(f"{service} session covering how to {' '.join(rng.choices(WORDS, k=30))}."),
+            'difficulty': _s(rng.choice(DIFFICULTIES)),
+            'image': _s(f"https://example.cloudfront.net/images/{number}.png"),
+            'transcript': _s(' '.join(rng.choices(WORDS, k=transcript_words))),
+            'createdAt': _s(created),
+            'updatedAt': _s(created)
+        })
+
+
+class ZipfSampler:
+    def __init__(self, size, exponent, rng):
+        """Sample ranks 1..size with probability proportional to 1/rank^exponent"""
+        self.rng = rng
+        self._cumulative = list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, size + 1)))
+        # Shuffle which class ids are popular so skew is not tied to id order
+        self._ids = list(range(1, size + 1))
+        rng.shuffle(self._ids)
+
+    def sample(self):
+        point = self.rng.random() * self._cumulative[-1]
+        return self._ids[bisect.bisect_left(self._cumulative, point)]
+
+
+def generate_comments(count, class_count, rng, skew=1.1):
+    sampler = ZipfSampler(class_count, skew, rng)
+    for _ in range(count):
+        created = _timestamp(rng)
+        yield _put({
+            'id': _s(uuid.UUID(int=rng.getrandbits(128))),
+            'classId': _s(sampler.sample()),
+            'content': _s(rng.choice(COMMENTS)),
+            'commentVersion': _s('v1.0'),
+            'createdAt': _s(created),
+            'updatedAt': _s(created)
+        })
+
+
+def generate_tables(args):
+    """Generators keyed by logical table name, deterministic for a given seed"""
+    def seeded(offset):
+        return random.Random(args.seed * 1000 + offset)
+
+    return {
+        'Course': lambda: generate_courses(args.courses),
+        'Class': lambda: generate_classes(args.classes, args.courses, seeded(1), args.transcript_words),
+        'Comment': lambda: generate_comments(args.comments, args.classes, seeded(2), args.skew),
+        'Channel': lambda: generate_channels(args.channels, seeded(3))
+    }
+
+
+def write_seed_file(path, logical_name, requests):
+    """Write put requests as {"<Name>": [...]} one item at a time"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n    "%s": [\n' % logical_name)
+        for request in requests:
+            if count:
+                f.write(',\n')
+            f.write('        ')
+            f.write(json.dumps(request, ensure_ascii=False))
+            count += 1
+        f.write('\n    ]\n}\n')
+    return count
+
+
+def batched(requests, batch_size=25):
+    """Number put requests into batches like load_seed_data.iter_batches"""
+    iterator = iter(requests)
+    for number in itertools.count():
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield number, batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic seed data for the Class/Comment schema')
+    parser.add_argument('--tables', default='Course,Class,Comment',
+                       help='Comma-separated tables to generate (Course, Class, Comment, Channel)')
+    parser.add_argument('--courses', type=int, default=8,
+                       help='Number of Course items')
+    parser.add_argument('--classes', type=int, default=10000,
+                       help='Number of Class items')
+    parser.add_argument('--comments', type=int, default=1000000,
+                       help='Number of Comment items')
+    parser.add_argument('--channels', type=int, default=10,
+                       help='Number of Channel items')
+    parser.add_argument('--skew', type=float, default=1.1,
+                       help='Zipf exponent for comments per classId (0 = uniform)')
+    parser.add_argument('--transcript-words', type=int, default=300,
+                       help='Words per generated class transcript')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Random seed; the same seed always produces the same data')
+    parser.add_argument('--output-dir', default=os.path.join(SCRIPT_DIR, 'generated'),
+                       help='Directory for <Name>.json files')
+    parser.add_argument('--load', action='store_true',
+                       help='Stream items straight into DynamoDB with the seed loader instead of writing files')
+    parser.add_argument('--table-map', action='append', default=[],
+                       help='Target table for --load, e.g. Class=Class-abc123-dev (repeatable)')
+    parser.add_argument('--endpoint-url',
+                       help='DynamoDB endpoint for --load, e.g. http://localhost:8000')
+    parser.add_argument('--region',
+                       help='AWS region for --load')
+    parser.add_argument('--workers', type=int, default=8,
+                       help='Concurrent BatchWriteItem calls for --load')
+    parser.add_argument('--timestamp',
+                       help='Value for replace_time placeholders with --load (default: now, UTC)')
+
+    args = parser.parse_args()
+    logical_names = [name.strip() for name in args.tables.split(',') if name.strip()]
+    generators = generate_tables(args)
+
+    print(f"🎯 Generating {', '.join(logical_names)} "
+          f"(classes={args.classes}, comments={args.comments}, skew={args.skew}, seed={args.seed})")
+
+    if not args.load:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for name in logical_names:
+            path = os.path.join(args.output_dir, f"{name}.json")
+            count = write_seed_file(path, name, generators[name]())
+            print(f"✅ {name}: {count} items -> {path}")
+        return
+
+    from load_seed_data import TIME_PLACEHOLDER, Checkpoint, SeedDataLoader, substitute
+
+    loader = SeedDataLoader(region=args.region, endpoint_url=args.endpoint_url, max_workers=args.workers)
+    table_names = dict(entry.split('=', 1) for entry in args.table_map)
+    missing = [name for name in logical_names if name not in table_names]
+    if missing:
+        table_names.update(loader.discover_table_names(missing))
+
+    # Data is deterministic per seed, so batch numbers stay valid across resumed runs
+    checkpoint = Checkpoint(os.path.join(SCRIPT_DIR, '.generate-checkpoint.json'))
+    # Files keep the placeholder for load_seed_data.py; items loaded directly need a real AWSDateTime
+    replacements = {TIME_PLACEHOLDER: args.timestamp or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}
+    start = time.perf_counter()
+    for name in logical_names:
+        source_name = f"generated-{name}-seed{args.seed}-{args.classes}-{args.comments}"
+        requests = (substitute(request, replacements) for request in generators[name]())
+        submitted, skipped = loader.load_batches(source_name, table_names[name], batched(requests), checkpoint)
+        print(f"✅ {name}: {submitted} batches written, {skipped} already done")
+
+    elapsed = time.perf_counter() - start
+    rate = loader.items_written / elapsed if elapsed else 0.0
+    print(f"\n📊 Total: {loader.items_written} items in {elapsed:.2f}s, {rate:.0f} items/sec, "
+          f"{loader.retries} retried batches")
+    checkpoint.clear()
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, SCRIPT_DIR)
+    main()
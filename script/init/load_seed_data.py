@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Seed Data Loader
+Streams script/init/*.json into DynamoDB with concurrent BatchWriteItem calls,
+retries unprocessed items and checkpoints progress so an interrupted load can resume
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, NoCredentialsError
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# BatchWriteItem accepts at most 25 put requests
+BATCH_SIZE = 25
+
+RETRYABLE_ERRORS = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'InternalServerError',
+    'ServiceUnavailable'
+}
+
+TIME_PLACEHOLDER = 'replace_time'
+
+
+def iter_json_array(path, chunk_size=64 * 1024):
+    """Yield (key, element) for each element of the top-level arrays in a {"Key": [...]} file, without loading it whole"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        eof = False
+        state = 'object'
+        key = None
+
+        def fill():
+            nonlocal buffer, position, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def skip_whitespace():
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in ' \t\r\n,:':
+                    position += 1
+                if position < len(buffer) or eof:
+                    return
+                fill()
+
+        fill()
+        while True:
+            skip_whitespace()
+            if position >= len(buffer):
+                return
+            char = buffer[position]
+
+            if state == 'object':
+                if char == '{':
+                    position += 1
+                    state = 'key'
+                    continue
+                raise ValueError(f"{path}: expected a JSON object at the top level")
+
+            if state == 'key':
+                if char == '}':
+                    return
+                while True:
+                    try:
+                        key, end = decoder.raw_decode(buffer, position)
+                        break
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        fill()
+                position = end
+                skip_whitespace()
+                if buffer[position] != '[':
+                    raise ValueError(f"{path}: expected an array for key {key}")
+                position += 1
+                state = 'array'
+                continue
+
+            if state == 'array':
+                if char == ']':
+                    position += 1
+                    state = 'key'
+                    continue
+                while True:
+                    try:
+                        element, end = decoder.raw_decode(buffer, position)
+                        break
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        fill()
+                position = end
+                yield key, element
+
+
+def substitute(value, replacements):
+    """Replace placeholder strings inside a DynamoDB JSON item"""
+    if isinstance(value, dict):
+        return {k: substitute(v, replacements) for k, v in value.items()}
+    if isinstance(value, list):
+        return [substitute(v, replacements) for v in value]
+    if isinstance(value, str):
+        return replacements.get(value, value)
+    return value
+
+
+def iter_batches(path, batch_size=BATCH_SIZE, replacements=None):
+    """Group the put requests of a seed file into numbered batches"""
+    batch = []
+    number = 0
+    for _, request in iter_json_array(path):
+        batch.append(substitute(request, replacements or {}))
+        if len(batch) == batch_size:
+            yield number, batch
+            number += 1
+            batch = []
+    if batch:
+        yield number, batch
+
+
+class Checkpoint:
+    def __init__(self, path):
+        """Completed batch numbers per seed file and target table, persisted as JSON"""
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {}
+        self._dirty = 0
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                self._state = json.load(f)
+
+    @staticmethod
+    def _key(source, table_name):
+        return f"{source}:{table_name}"
+
+    def completed(self, source, table_name):
+        """Set of batch numbers already written"""
+        entry = self._state.get(self._key(source, table_name), {})
+        done = set(entry.get('batches', []))
+        done.update(range(entry.get('watermark', 0)))
+        return done
+
+    def mark(self, source, table_name, number):
+        with self._lock:
+            entry = self._state.setdefault(self._key(source, table_name), {'watermark': 0, 'batches': []})
+            batches = set(entry['batches'])
+            batches.add(number)
+            # Fold contiguous batches into the watermark so the file stays small
+            while entry['watermark'] in batches:
+                batches.remove(entry['watermark'])
+                entry['watermark'] += 1
+            entry['batches'] = sorted(batches)
+            self._dirty += 1
+            if self._dirty >= 20:
+                self._save_locked()
+
+    def save(self):
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self._state, f)
+        os.replace(temp_path, self.path)
+        self._dirty = 0
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SeedDataLoader:
+    def __init__(self, region=None, profile=None, endpoint_url=None, max_workers=8, max_retries=8,
+                 base_delay=0.05, max_delay=5.0, client=None):
+        """Initialize the loader with a DynamoDB client"""
+        if client is None:
+            try:
+                session = boto3.Session(profile_name=profile) if profile else boto3.Session()
+                client = session.client(
+                    'dynamodb',
+                    region_name=region or session.region_name or 'us-west-2',
+                    endpoint_url=endpoint_url,
+                    config=Config(max_pool_connections=max(10, max_workers * 2), retries={'max_attempts': 2})
+                )
+            except NoCredentialsError:
+                print("❌ AWS credentials not found. Please configure your credentials.")
+                sys.exit(1)
+
+        self.client = client
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self.items_written = 0
+        self.retries = 0
+        self.batch_latencies = []
+
+    def discover_table_names(self, logical_names):
+        """Map Course/Class/Comment/Channel to the Amplify table names (<Name>-<apiId>-<env>)"""
+        table_names = []
+        paginator = self.client.get_paginator('list_tables')
+        for page in paginator.paginate():
+            table_names.extend(page['TableNames'])
+
+        class_table = next((t for t in table_names if t.startswith('Class-')), None)
+        if class_table is None:
+            raise RuntimeError("No Class-<apiId>-<env> table found; pass --table-map explicitly")
+
+        _, api_id, environment = class_table.split('-', 2)
+        print(f"🔍 Found Amplify tables: apiId={api_id}, environment={environment}")
+        return {name: f"{name}-{api_id}-{environment}" for name in logical_names}
+
+    def _backoff(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def write_batch(self, table_name, requests):
+        """Write one batch, retrying throttled calls and unprocessed items until nothing is left"""
+        pending = {table_name: requests}
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.batch_write_item(RequestItems=pending)
+                unprocessed = response.get('UnprocessedItems') or {}
+            except ClientError as e:
+                if e.response['Error']['Code'] not in RETRYABLE_ERRORS:
+                    raise
+                unprocessed = pending
+
+            left = sum(len(items) for items in unprocessed.values())
+            with self._lock:
+                self.items_written += sum(len(items) for items in pending.values()) - left
+                if left:
+                    self.retries += 1
+            if not left:
+                with self._lock:
+                    self.batch_latencies.append(time.perf_counter() - start)
+                return
+            pending = unprocessed
+            time.sleep(self._backoff(attempt))
+
+        raise RuntimeError(f"{left} items still unprocessed for {table_name} after {self.max_retries} retries")
+
+    def load_file(self, source, table_name, checkpoint, replacements):
+        """Stream one seed file into a table through the worker pool"""
+        return self.load_batches(
+            os.path.basename(source), table_name, iter_batches(source, replacements=replacements), checkpoint
+        )
+
+    def load_batches(self, source_name, table_name, batches, checkpoint):
+        """Write numbered batches of put requests through the worker pool, skipping checkpointed ones"""
+        done = checkpoint.completed(source_name, table_name)
+        skipped = 0
+        submitted = 0
+        in_flight = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for number, batch in batches:
+                if number in done:
+                    skipped += 1
+                    continue
+
+                # Bound queued work so the source is never fully materialized
+                while len(in_flight) >= self.max_workers * 2:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        future.result()
+
+                future = executor.submit(self.write_batch, table_name, batch)
+                future.add_done_callback(
+                    lambda f, n=number: None if f.exception() else checkpoint.mark(source_name, table_name, n)
+                )
+                in_flight.add(future)
+                submitted += 1
+
+            for future in in_flight:
+                future.result()
+
+        checkpoint.save()
+        return submitted, skipped
+
+    def load(self, sources, table_names, checkpoint, replacements):
+        """Load every seed file and print a throughput report"""
+        start = time.perf_counter()
+        report = []
+
+        for logical_name, source in sources:
+            table_name = table_names[logical_name]
+            print(f"🚀 Loading {os.path.basename(source)} into {table_name}")
+            written_before = self.items_written
+            file_start = time.perf_counter()
+
+            submitted, skipped = self.load_file(source, table_name, checkpoint, replacements)
+
+            elapsed = time.perf_counter() - file_start
+            written = self.items_written - written_before
+            report.append((table_name, written, submitted, skipped, elapsed))
+            print(f"✅ {table_name}: {written} items in {submitted} batches "
+                  f"({skipped} batches already done) in {elapsed:.2f}s")
+
+        total_elapsed = time.perf_counter() - start
+        print(f"\n📊 Throughput report:")
+        for table_name, written, submitted, skipped, elapsed in report:
+            rate = written / elapsed if elapsed else 0.0
+            print(f"   {table_name}: {written} items, {rate:.0f} items/sec")
+        rate = self.items_written / total_elapsed if total_elapsed else 0.0
+        print(f"   Total: {self.items_written} items in {total_elapsed:.2f}s, {rate:.0f} items/sec, "
+              f"{self.retries} retried batches")
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load seed data into the Amplify DynamoDB tables')
+    parser.add_argument('--tables', default='Course,Class,Comment',
+                       help='Comma-separated seed files to load (Course, Class, Comment, Channel)')
+    parser.add_argument('--table-map', action='append', default=[],
+                       help='Explicit target table, e.g. Class=Class-abc123-dev (repeatable)')
+    parser.add_argument('--data-dir', default=SCRIPT_DIR,
+                       help='Directory containing <Name>.json seed files')
+    parser.add_argument('--region',
+                       help='AWS region (defaults to the configured region)')
+    parser.add_argument('--profile',
+                       help='AWS profile name')
+    parser.add_argument('--endpoint-url',
+                       help='DynamoDB endpoint, e.g. http://localhost:8000 for DynamoDB Local')
+    parser.add_argument('--workers', type=int, default=8,
+                       help='Concurrent BatchWriteItem calls')
+    parser.add_argument('--max-retries', type=int, default=8,
+                       help='Retries per batch for throttling and unprocessed items')
+    parser.add_argument('--checkpoint', default=os.path.join(SCRIPT_DIR, '.import-checkpoint.json'),
+                       help='Checkpoint file used to resume an interrupted load')
+    parser.add_argument('--restart', action='store_true',
+                       help='Ignore and remove an existing checkpoint')
+    parser.add_argument('--timestamp',
+                       help='Value for replace_time placeholders (default: now, UTC)')
+
+    args = parser.parse_args()
+
+    logical_names = [name.strip() for name in args.tables.split(',') if name.strip()]
+    loader = SeedDataLoader(
+        region=args.region,
+        profile=args.profile,
+        endpoint_url=args.endpoint_url,
+        max_workers=args.workers,
+        max_retries=args.max_retries
+    )
+
+    table_names = dict(entry.split('=', 1) for entry in args.table_map)
+    missing = [name for name in logical_names if name not in table_names]
+    if missing:
+        table_names.update({k: v for k, v in loader.discover_table_names(missing).items() if k in missing})
+
+    checkpoint = Checkpoint(args.checkpoint)
+    if args.restart:
+        checkpoint.clear()
+        checkpoint = Checkpoint(args.checkpoint)
+
+    replacements = {TIME_PLACEHOLDER: args.timestamp or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}
+    sources = [(name, os.path.join(args.data_dir, f"{name}.json")) for name in logical_names]
+
+    print(f"🎯 Load Configuration:")
+    for name in logical_names:
+        print(f"   {name}.json -> {table_names[name]}")
+    print(f"   Workers: {args.workers}")
+    print()
+
+    try:
+        loader.load(sources, table_names, checkpoint, replacements)
+    except KeyboardInterrupt:
+        checkpoint.save()
+        print("\n⚠️ Interrupted; rerun the same command to resume from the checkpoint")
+        sys.exit(130)
+    except Exception as e:
+        checkpoint.save()
+        print(f"❌ Load failed: {e}")
+        print("   Rerun the same command to resume from the checkpoint")
+        sys.exit(1)
+
+    checkpoint.clear()
+    print(f"\n✅ Seed data loaded")
+
+
+if __name__ == '__main__':
+    main()
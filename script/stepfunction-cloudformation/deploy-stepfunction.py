@@ -4,171 +4,35 @@ Step Functions Deployment Script
 Deploys a Step Functions State Machine using CloudFormation
 """
 
-import boto3
 import json
-import time
 import argparse
 import sys
 import os
-from botocore.exceptions import ClientError, NoCredentialsError
 
-class StepFunctionsDeployer:
-    def __init__(self, region='us-west-2', profile=None):
-        """Initialize the deployer with AWS session"""
-        try:
-            if profile:
-                session = boto3.Session(profile_name=profile)
-            else:
-                session = boto3.Session()
-            
-            self.cf_client = session.client('cloudformation', region_name=region)
-            self.sfn_client = session.client('stepfunctions', region_name=region)
-            self.region = region
-            
-            # Test credentials
-            sts = session.client('sts')
-            identity = sts.get_caller_identity()
-            print(f"✅ Connected to AWS Account: {identity['Account']}")
-            print(f"✅ Region: {region}")
-            
-        except NoCredentialsError:
-            print("❌ AWS credentials not found. Please configure your credentials.")
-            sys.exit(1)
-        except Exception as e:
-            print(f"❌ Error initializing AWS session: {e}")
-            sys.exit(1)
+COMMON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common')
+sys.path.insert(0, COMMON_DIR)
 
-    def deploy_stack(self, stack_name, template_file, parameters=None):
-        """Deploy CloudFormation stack"""
-        try:
-            # Read template file
-            with open(template_file, 'r') as f:
-                template_body = f.read()
-            
-            # Prepare parameters
-            cf_parameters = []
-            if parameters:
-                for key, value in parameters.items():
-                    cf_parameters.append({
-                        'ParameterKey': key,
-                        'ParameterValue': value
-                    })
-            
-            print(f"🚀 Deploying stack: {stack_name}")
-            
-            # Check if stack exists
-            try:
-                self.cf_client.describe_stacks(StackName=stack_name)
-                print(f"📝 Stack {stack_name} exists, updating...")
-                
-                response = self.cf_client.update_stack(
-                    StackName=stack_name,
-                    TemplateBody=template_body,
-                    Parameters=cf_parameters,
-                    Capabilities=['CAPABILITY_IAM']
-                )
-                operation = 'UPDATE'
-                
-            except ClientError as e:
-                if 'does not exist' in str(e):
-                    print(f"📝 Creating new stack: {stack_name}")
-                    
-                    response = self.cf_client.create_stack(
-                        StackName=stack_name,
-                        TemplateBody=template_body,
-                        Parameters=cf_parameters,
-                        Capabilities=['CAPABILITY_IAM']
-                    )
-                    operation = 'CREATE'
-                elif 'No updates are to be performed' in str(e):
-                    print("✅ Stack is already up to date")
-                    return self._get_stack_outputs(stack_name)
-                else:
-                    raise e
-            
-            # Wait for completion
-            self._wait_for_stack_completion(stack_name, operation)
-            
-            # Get outputs
-            outputs = self._get_stack_outputs(stack_name)
-            return outputs
-            
-        except Exception as e:
-            print(f"❌ Error deploying stack: {e}")
-            return None
+from stack_deployer import CloudFormationDeployer
 
-    def _wait_for_stack_completion(self, stack_name, operation):
-        """Wait for CloudFormation stack operation to complete"""
-        if operation == 'CREATE':
-            waiter = self.cf_client.get_waiter('stack_create_complete')
-            success_status = 'CREATE_COMPLETE'
-            failure_statuses = ['CREATE_FAILED', 'ROLLBACK_COMPLETE']
-        else:
-            waiter = self.cf_client.get_waiter('stack_update_complete')
-            success_status = 'UPDATE_COMPLETE'
-            failure_statuses = ['UPDATE_FAILED', 'UPDATE_ROLLBACK_COMPLETE']
-        
-        print(f"⏳ Waiting for stack {operation.lower()} to complete...")
-        
-        try:
-            waiter.wait(
-                StackName=stack_name,
-                WaiterConfig={
-                    'Delay': 10,
-                    'MaxAttempts': 60
-                }
-            )
-            print(f"✅ Stack {operation.lower()} completed successfully!")
-            
-        except Exception as e:
-            # Check final status
-            response = self.cf_client.describe_stacks(StackName=stack_name)
-            status = response['Stacks'][0]['StackStatus']
-            
-            if status in failure_statuses:
-                print(f"❌ Stack {operation.lower()} failed with status: {status}")
-                self._print_stack_events(stack_name)
-            else:
-                print(f"✅ Stack operation completed with status: {status}")
+class StepFunctionsDeployer(CloudFormationDeployer):
+    logger_name = 'deploy-stepfunction'
+    capabilities = ['CAPABILITY_IAM']
 
-    def _get_stack_outputs(self, stack_name):
-        """Get CloudFormation stack outputs"""
-        try:
-            response = self.cf_client.describe_stacks(StackName=stack_name)
-            outputs = {}
-            
-            if 'Outputs' in response['Stacks'][0]:
-                for output in response['Stacks'][0]['Outputs']:
-                    outputs[output['OutputKey']] = output['OutputValue']
-            
-            return outputs
-            
-        except Exception as e:
-            print(f"❌ Error getting stack outputs: {e}")
-            return {}
+    def _create_clients(self, session):
+        """Step Functions client"""
+        self.sfn_client = session.client('stepfunctions', region_name=self.region)
 
-    def _print_stack_events(self, stack_name, limit=10):
-        """Print recent stack events for debugging"""
-        try:
-            response = self.cf_client.describe_stack_events(StackName=stack_name)
-            events = response['StackEvents'][:limit]
-            
-            print(f"\n📋 Recent stack events for {stack_name}:")
-            for event in events:
-                timestamp = event['Timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-                resource = event.get('LogicalResourceId', 'N/A')
-                status = event.get('ResourceStatus', 'N/A')
-                reason = event.get('ResourceStatusReason', 'N/A')
-                
-                print(f"  {timestamp} | {resource} | {status} | {reason}")
-                
-        except Exception as e:
-            print(f"❌ Error getting stack events: {e}")
+    def after_deploy(self, stack, outputs):
+        """Save .env.stepfunction once a manifest stack is done"""
+        if 'StateMachineArn' in outputs and 'StateMachineName' in outputs:
+            return self.save_env_file(outputs['StateMachineArn'], outputs['StateMachineName'])
+        return True
 
     def test_state_machine(self, state_machine_arn, test_input):
         """Test the deployed state machine"""
         try:
-            print(f"🧪 Testing state machine: {state_machine_arn}")
+            self.log.info(f"🧪 Testing state machine: {state_machine_arn}")
+            self.log.payload("📝 Execution input", test_input, level='DEBUG')
             
             response = self.sfn_client.start_execution(
                 stateMachineArn=state_machine_arn,
@@ -176,12 +40,12 @@ class StepFunctionsDeployer:
             )
             
             execution_arn = response['executionArn']
-            print(f"✅ Execution started: {execution_arn}")
+            self.log.info(f"✅ Execution started: {execution_arn}")
             
             return execution_arn
             
         except Exception as e:
-            print(f"❌ Error testing state machine: {e}")
+            self.log.error(f"❌ Error testing state machine: {e}")
             return None
 
     def save_env_file(self, state_machine_arn, state_machine_name, env_file='.env.stepfunction'):
@@ -199,10 +63,10 @@ STEPFUNCTION_REGION={self.region}
             with open(env_path, 'w') as f:
                 f.write(env_content)
             
-            print(f"✅ State machine configuration saved to {env_path}")
+            self.log.info(f"✅ State machine configuration saved to {env_path}")
             return True
         except Exception as e:
-            print(f"❌ Error saving env file: {e}")
+            self.log.error(f"❌ Error saving env file: {e}")
             return False
 
 def main():
@@ -215,13 +79,21 @@ def main():
                        help='AWS region')
     parser.add_argument('--profile', 
                        help='AWS profile name')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level (default: LOG_LEVEL or INFO; DEBUG also logs full API payloads)')
+    parser.add_argument('--preview', action='store_true',
+                       help='Create and print the change set without executing it')
+    parser.add_argument('--force', action='store_true',
+                       help='Redeploy even when the template and parameter hash is unchanged')
     parser.add_argument('--test', action='store_true',
                        help='Test the state machine after deployment')
     
     args = parser.parse_args()
     
     # Initialize deployer
-    deployer = StepFunctionsDeployer(region=args.region, profile=args.profile)
+    deployer = StepFunctionsDeployer(region=args.region, profile=args.profile, log_level=args.log_level)
+    deployer.preview = args.preview
+    deployer.force = args.force
     
     # Deployment parameters
     parameters = {
@@ -237,10 +109,14 @@ def main():
     # Deploy stack
     outputs = deployer.deploy_stack(
         stack_name=args.stack_name,
-        template_file='stepfunction.yaml',
+        template_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stepfunction.yaml'),
         parameters=parameters
     )
     
+    if args.preview:
+        print("\n🔍 Change set created for review; nothing was executed")
+        return
+    
     if not outputs:
         print("❌ Deployment failed")
         sys.exit(1)
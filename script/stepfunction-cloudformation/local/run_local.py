@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Step Functions Local Check
+Creates the video understanding state machine from stepfunction.yaml in Step Functions Local
+and runs the mocked test cases in MockConfigFile.json, reporting outcome and state transitions
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+
+import boto3
+import yaml
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(os.path.dirname(SCRIPT_DIR), 'stepfunction.yaml')
+MOCK_CONFIG_PATH = os.path.join(SCRIPT_DIR, 'MockConfigFile.json')
+STATE_MACHINE_NAME = 'VideoUnderstanding'
+
+# Expected end status per test case
+EXPECTED = {
+    'CallbackCompleted': 'SUCCEEDED',
+    'CallbackFailed': 'FAILED',
+    'CallbackLostFallbackPoll': 'SUCCEEDED',
+    'CallbackRegistrationFailedFallbackPoll': 'SUCCEEDED',
+    'LongTranscriptMapReduce': 'SUCCEEDED',
+    'OversizedTranscriptMapReduce': 'SUCCEEDED',
+    'MultiLanguageFanOut': 'SUCCEEDED',
+    'DuplicateUploadCacheHit': 'SUCCEEDED',
+    'RerunAfterSummaryFailure': 'SUCCEEDED'
+}
+
+# Execution input changes per test case
+INPUT_OVERRIDES = {
+    'MultiLanguageFanOut': {'Languages': ['english', 'korean', 'ja-JP']}
+}
+
+# Step Functions limits an execution's state and variables to 256 KiB
+STATE_LIMIT_BYTES = 256 * 1024
+
+LECTURE_SENTENCE = ('In this part of the lecture we build a container image, push it to Amazon ECR, '
+                    'deploy it to an Amazon EKS cluster and watch the service metrics in CloudWatch. ')
+
+
+class TemplateLoader(yaml.SafeLoader):
+    """Reads CloudFormation YAML, ignoring intrinsic function tags"""
+
+
+TemplateLoader.add_multi_constructor('!', lambda loader, suffix, node: None)
+
+
+class MemoryS3:
+    def __init__(self, objects):
+        """Just enough of the S3 client for the inline Lambda code, backed by a dict"""
+        self.objects = dict(objects)
+
+    def get_object(self, Bucket, Key):
+        return {'Body': io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+
+
+def load_template():
+    with open(TEMPLATE_PATH, 'r') as f:
+        return yaml.load(f, Loader=TemplateLoader)
+
+
+def load_definition(substitutions):
+    """State machine definition from the template with DefinitionSubstitutions applied"""
+    definition = load_template()['Resources']['VideoUnderstandingStateMachine']['Properties']['DefinitionString']
+    return re.sub(r'\$\{(\w+)\}', lambda match: str(substitutions[match.group(1)]), definition)
+
+
+def check_transcript_chunks(region, transcript_bytes=300 * 1024, chunk_tokens=6000, overlap_tokens=300):
+    """Run TranscriptChunkFunction on a transcript larger than the state limit; returns (payload bytes, chunk count)"""
+    os.environ.setdefault('AWS_DEFAULT_REGION', region)
+    namespace = {}
+    exec(load_template()['Resources']['TranscriptChunkFunction']['Properties']['Code']['ZipFile'], namespace)
+
+    transcript = (LECTURE_SENTENCE * (transcript_bytes // len(LECTURE_SENTENCE) + 1)).strip()
+    body = json.dumps({'results': {'transcripts': [{'transcript': transcript}], 'items': []}}).encode('utf-8')
+    s3 = namespace['s3'] = MemoryS3({('local-bucket', 'output/lesson_transcription/lesson_transcription'): body})
+    payload = namespace['handler']({
+        'bucket': 'local-bucket',
+        'transcriptionKey': 'lesson_transcription',
+        'chunkTokens': chunk_tokens,
+        'overlapTokens': overlap_tokens
+    }, None)
+
+    size = len(json.dumps(payload).encode('utf-8'))
+    assert size < STATE_LIMIT_BYTES, f"chunk payload of {size} bytes does not fit the state"
+    # Every word must be in some chunk, in order: the non-overlapping parts rebuild the transcript
+    step = int(chunk_tokens * 0.75) - int(overlap_tokens * 0.75)
+    words = []
+    for chunk in payload['chunks']:
+        text = s3.objects[('local-bucket', chunk['key'])].decode('utf-8')
+        words.extend(text.split()[:step] if chunk['index'] < chunk['total'] else text.split())
+    assert words == transcript.split(), 'chunks do not cover the transcript'
+    return size, len(payload['chunks'])
+
+
+def run_case(client, state_machine_arn, test_case, timeout=120):
+    """Run one mocked test case; returns (status, state transitions, states entered)"""
+    execution_arn = client.start_execution(
+        stateMachineArn=f"{state_machine_arn}#{test_case}",
+        name=f"{test_case}-{int(time.time())}",
+        input=json.dumps({
+            'BucketName': 'local-bucket',
+            'VideoKey': 'lesson.mp4',
+            'TranscriptionKey': 'lesson_transcription',
+            'SummarizedTextFileKey': 'lesson_summarize.txt',
+            'Languages': ['english'],
+            **INPUT_OVERRIDES.get(test_case, {})
+        })
+    )['executionArn']
+
+    deadline = time.time() + timeout
+    while True:
+        status = client.describe_execution(executionArn=execution_arn)['status']
+        if status != 'RUNNING' or time.time() > deadline:
+            break
+        time.sleep(0.5)
+
+    events = []
+    for page in client.get_paginator('get_execution_history').paginate(executionArn=execution_arn):
+        events.extend(page['events'])
+    entered = [e['stateEnteredEventDetails']['name'] for e in events if e['type'].endswith('StateEntered')]
+    return status, len(entered), entered
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the state machine test cases in Step Functions Local')
+    parser.add_argument('--endpoint-url', default='http://localhost:8083',
+                       help='Step Functions Local endpoint')
+    parser.add_argument('--region', default='us-east-1',
+                       help='Region the local endpoint answers for')
+
+    args = parser.parse_args()
+
+    size, chunk_count = check_transcript_chunks(args.region)
+    print(f"✅ TranscriptChunkFunction: a 300 KiB transcript becomes {chunk_count} chunk keys in a {size} byte payload")
+
+    client = boto3.client('stepfunctions', endpoint_url=args.endpoint_url, region_name=args.region,
+                          aws_access_key_id='local', aws_secret_access_key='local')
+    definition = load_definition({
+        'TranscriptionCallbackFunctionArn': f"arn:aws:lambda:{args.region}:123456789012:function:TranscriptionCallback",
+        'TranscriptChunkFunctionArn': f"arn:aws:lambda:{args.region}:123456789012:function:TranscriptChunk",
+        'CallbackTimeoutSeconds': 900,
+        # Keep the fallback poll short so the local run finishes quickly
+        'FallbackPollSeconds': 1,
+        'MaxFallbackPollSeconds': 2,
+        'ChunkTokens': 6000,
+        'ChunkOverlapTokens': 300,
+        'SummaryMaxConcurrency': 4,
+        'LocalizationFunctionArn': f"arn:aws:lambda:{args.region}:123456789012:function:Localization",
+        'LocalizationMaxConcurrency': 2,
+        'ResultCacheTable': 'VideoResultCache',
+        'ResultCacheVersion': '1'
+    })
+
+    existing = [m['stateMachineArn'] for m in client.list_state_machines()['stateMachines'] if m['name'] == STATE_MACHINE_NAME]
+    for arn in existing:
+        client.delete_state_machine(stateMachineArn=arn)
+    state_machine_arn = client.create_state_machine(
+        name=STATE_MACHINE_NAME,
+        definition=definition,
+        roleArn='arn:aws:iam::123456789012:role/DummyRole'
+    )['stateMachineArn']
+
+    with open(MOCK_CONFIG_PATH, 'r') as f:
+        test_cases = json.load(f)['StateMachines'][STATE_MACHINE_NAME]['TestCases']
+
+    failed = False
+    for test_case in test_cases:
+        status, transitions, entered = run_case(client, state_machine_arn, test_case)
+        ok = status == EXPECTED.get(test_case)
+        failed = failed or not ok
+        print(f"{'✅' if ok else '❌'} {test_case}: {status} in {transitions} state transitions")
+        print(f"   {' → '.join(entered)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Video Understanding Batch Submitter
+Starts the video understanding state machine for every video under video-origin/ (or a manifest)
+with a cap on concurrent executions, tracks them to completion and records results in a ledger
+so a rerun only processes videos that have not succeeded yet
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, NoCredentialsError
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+sys.path.insert(0, os.path.join(os.path.dirname(SCRIPT_DIR), 'common'))
+
+from structured_log import get_logger
+
+# The state machine reads videos from this prefix and writes results under output/
+VIDEO_PREFIX = 'video-origin/'
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.m4a', '.mp3', '.wav', '.flac', '.ogg', '.webm', '.amr')
+
+RETRYABLE_ERRORS = {'ThrottlingException', 'TooManyRequestsException', 'ServiceUnavailable', 'InternalServerError'}
+TERMINAL_STATUSES = {'SUCCEEDED', 'FAILED', 'TIMED_OUT', 'ABORTED'}
+
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class ExecutionLedger:
+    def __init__(self, path):
+        """Latest execution record per video key, persisted as JSON after every change"""
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                self.entries = json.load(f)
+
+    def get(self, key):
+        with self._lock:
+            return dict(self.entries.get(key, {}))
+
+    def record(self, key, **fields):
+        with self._lock:
+            self.entries.setdefault(key, {}).update(fields)
+            if self.path:
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(self.entries, f, indent=2, sort_keys=True)
+                os.replace(temp_path, self.path)
+
+
+def load_manifest(path):
+    """Video keys (relative to video-origin/) from a JSON list or a text file with one key per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    keys = json.loads(content) if path.endswith('.json') else content.splitlines()
+    return [key.strip()[len(VIDEO_PREFIX):] if key.strip().startswith(VIDEO_PREFIX) else key.strip()
+            for key in keys if key.strip()]
+
+
+def list_videos(s3_client, bucket):
+    """Video keys under video-origin/, relative to the prefix"""
+    keys = []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=VIDEO_PREFIX):
+        for item in page.get('Contents', []):
+            key = item['Key'][len(VIDEO_PREFIX):]
+            if key.lower().endswith(VIDEO_EXTENSIONS):
+                keys.append(key)
+    return keys
+
+
+def execution_input(bucket, key, languages=('english',), skip_cache=False):
+    """Same input the class wizard sends when a single video is uploaded"""
+    base_name = os.path.splitext(os.path.basename(key))[0]
+    payload = {
+        'BucketName': bucket,
+        'VideoKey': key,
+        'TranscriptionKey': f"{base_name}_transcription",
+        'SummarizedTextFileKey': f"{base_name}_summarize.txt",
+        'Languages': list(languages)
+    }
+    if skip_cache:
+        payload['SkipCache'] = True
+    return payload
+
+
+def execution_name(key, attempt):
+    """Deterministic per key and attempt; it doubles as the Transcribe job name, which must be unique"""
+    slug = re.sub(r'[^0-9A-Za-z_-]', '-', os.path.splitext(os.path.basename(key))[0])[:60]
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+    return f"{slug}-{digest}-{attempt}"
+
+
+class BatchSubmitter:
+    def __init__(self, sfn_client, transcribe_client, state_machine_arn, bucket, ledger, concurrency=20,
+                 transcribe_limit=None, max_attempts=2, max_retries=6, base_delay=0.5, max_delay=20.0,
+                 poll_interval=15.0, languages=('english',), skip_cache=False, log=None, clock=time.monotonic, sleep=time.sleep):
+        """Submit executions for a batch of videos, at most `concurrency` running at once"""
+        self.sfn_client = sfn_client
+        self.transcribe_client = transcribe_client
+        self.state_machine_arn = state_machine_arn
+        self.bucket = bucket
+        self.ledger = ledger
+        self.concurrency = concurrency
+        self.transcribe_limit = transcribe_limit
+        self.max_attempts = max_attempts
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.languages = languages
+        self.skip_cache = skip_cache
+        self.log = log or get_logger('submit-batch')
+        self.clock = clock
+        self.sleep = sleep
+        self.throttled_starts = 0
+
+    def _backoff(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def plan(self, keys):
+        """Split keys into (to start, to resume tracking, already done, out of attempts)"""
+        start, resume, done, exhausted = [], [], [], []
+        for key in dict.fromkeys(keys):
+            entry = self.ledger.get(key)
+            status = entry.get('status')
+            if status == 'SUCCEEDED':
+                done.append(key)
+            elif status in ('STARTING', 'RUNNING') and entry.get('execution_arn'):
+                resume.append(key)
+            elif entry.get('attempt', 0) >= self.max_attempts:
+                exhausted.append(key)
+            else:
+                start.append(key)
+        return start, resume, done, exhausted
+
+    def transcribe_slots(self, running):
+        """Transcription jobs that can still start before hitting the account's concurrent job limit"""
+        if not self.transcribe_limit:
+            return None
+        in_progress = set()
+        paginator = self.transcribe_client.get_paginator('list_transcription_jobs')
+        for page in paginator.paginate(Status='IN_PROGRESS'):
+            in_progress.update(job['TranscriptionJobName'] for job in page.get('TranscriptionJobSummaries', []))
+
+        # Executions fingerprint the video and check the cache before StartTranscriptionJob, so one
+        # whose job (named after the execution) has not been seen yet is counted as about to start it
+        pending = 0
+        for key in running:
+            entry = self.ledger.get(key)
+            if entry.get('execution_name') in in_progress:
+                if not entry.get('transcribing'):
+                    self.ledger.record(key, transcribing=True)
+            elif not entry.get('transcribing'):
+                pending += 1
+        return max(0, self.transcribe_limit - len(in_progress) - pending)
+
+    def start(self, key):
+        """Start one execution, retrying throttled calls; returns the execution ARN"""
+        attempt = self.ledger.get(key).get('attempt', 0) + 1
+        name = execution_name(key, attempt)
+        # Recorded before the call so an interrupted run does not reuse the name with a new attempt
+        self.ledger.record(key, status='STARTING', attempt=attempt, execution_name=name,
+                           execution_arn=self.state_machine_arn.replace(':stateMachine:', ':execution:') + f":{name}",
+                           started_at=utc_now(), finished_at=None, error=None, transcribing=False)
+        for retry in range(self.max_retries + 1):
+            try:
+                response = self.sfn_client.start_execution(
+                    stateMachineArn=self.state_machine_arn,
+                    name=name,
+                    input=json.dumps(execution_input(self.bucket, key, self.languages, self.skip_cache))
+                )
+                self.ledger.record(key, status='RUNNING', execution_arn=response['executionArn'])
+                return response['executionArn']
+            except ClientError as e:
+                code = e.response['Error']['Code']
+                if code == 'ExecutionAlreadyExists':
+                    # Started by an earlier run that stopped before recording it
+                    self.ledger.record(key, status='RUNNING')
+                    return self.ledger.get(key)['execution_arn']
+                if code not in RETRYABLE_ERRORS or retry == self.max_retries:
+                    self.ledger.record(key, status='FAILED', finished_at=utc_now(), error=f"{code}: {e}")
+                    raise
+                self.throttled_starts += 1
+                self.sleep(self._backoff(retry))
+
+    def failure_cause(self, execution_arn):
+        """State and cause of the failure from the end of the execution history"""
+        events = self.sfn_client.get_execution_history(
+            executionArn=execution_arn, reverseOrder=True, maxResults=20
+        )['events']
+        state = None
+        for event in events:
+            if event['type'].endswith('StateEntered') and state is None:
+                state = event.get('stateEnteredEventDetails', {}).get('name')
+            for details_key in ('executionFailedEventDetails', 'taskFailedEventDetails', 'executionTimedOutEventDetails'):
+                details = event.get(details_key)
+                if details:
+                    cause = f"{details.get('error', '')}: {details.get('cause', '')}".strip(': ')
+                    return f"{state}: {cause}" if state else cause
+        return state
+
+    def check(self, key):
+        """Describe a running execution; returns its status once terminal, otherwise None"""
+        entry = self.ledger.get(key)
+        try:
+            description = self.sfn_client.describe_execution(executionArn=entry['execution_arn'])
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ExecutionDoesNotExist' or entry.get('status') != 'STARTING':
+                raise
+            # An earlier run stopped before its start call went through
+            self.ledger.record(key, status='NOT_STARTED', attempt=entry['attempt'] - 1)
+            return 'NOT_STARTED'
+        status = description['status']
+        if status not in TERMINAL_STATUSES:
+            return None
+        error = None
+        if status != 'SUCCEEDED':
+            try:
+                error = self.failure_cause(entry['execution_arn'])
+            except ClientError as e:
+                error = f"{description.get('error', '')} {description.get('cause', '')}".strip() or f"{e}"
+        stop_date = description.get('stopDate')
+        self.ledger.record(key, status=status, error=error,
+                           finished_at=stop_date.strftime('%Y-%m-%dT%H:%M:%SZ') if stop_date else utc_now())
+        return status
+
+    def run(self, keys):
+        """Process the batch; returns the final status counts"""
+        queue, running, done, exhausted = self.plan(keys)
+        self.log.info(f"📋 {len(keys)} videos: {len(queue)} to start, {len(running)} still running, "
+                      f"{len(done)} already succeeded, {len(exhausted)} out of attempts")
+        counts = {'SUCCEEDED': len(done), 'SKIPPED': len(exhausted)}
+        started_at = self.clock()
+
+        while queue or running:
+            # Poll everything in flight, then fill the freed slots
+            for key in list(running):
+                try:
+                    status = self.check(key)
+                except ClientError as e:
+                    self.log.warning(f"⚠️ Error checking {key}: {e}")
+                    continue
+                if not status:
+                    continue
+                running.remove(key)
+                entry = self.ledger.get(key)
+                if status == 'SUCCEEDED':
+                    self.log.info(f"✅ {key} succeeded")
+                elif status != 'NOT_STARTED':
+                    self.log.error(f"❌ {key} {status.lower()}: {entry.get('error')}")
+                if status == 'NOT_STARTED' or (status != 'SUCCEEDED' and entry['attempt'] < self.max_attempts):
+                    queue.append(key)
+                else:
+                    counts[status] = counts.get(status, 0) + 1
+
+            slots = self.concurrency - len(running)
+            transcribe_slots = self.transcribe_slots(running) if queue and slots > 0 else None
+            if transcribe_slots is not None and transcribe_slots < slots:
+                if not transcribe_slots:
+                    self.log.info("⏳ Transcribe concurrent job limit reached, waiting")
+                slots = transcribe_slots
+
+            for key in queue[:max(0, slots)]:
+                queue.remove(key)
+                try:
+                    self.start(key)
+                except ClientError as e:
+                    counts['FAILED'] = counts.get('FAILED', 0) + 1
+                    self.log.error(f"❌ Could not start {key}: {e}")
+                    continue
+                running.append(key)
+                self.log.info(f"🚀 Started {key} (attempt {self.ledger.get(key)['attempt']})")
+
+            if running or queue:
+                self.log.info(f"⏳ {len(running)} running, {len(queue)} queued, "
+                              f"{counts['SUCCEEDED']} succeeded ({self.clock() - started_at:.0f}s)")
+                self.sleep(self.poll_interval)
+
+        return counts
+
+
+def load_env(env_file=os.path.join(PROJECT_ROOT, '.env.stepfunction')):
+    """STEPFUNCTION_* values written by deploy-stepfunction.py"""
+    values = {}
+    if os.path.exists(env_file):
+        with open(env_file, 'r') as f:
+            for line in f:
+                key, _, value = line.strip().partition('=')
+                if value:
+                    values[key] = value
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the video understanding state machine over a batch of videos')
+    parser.add_argument('--bucket', required=True,
+                       help='S3 bucket holding video-origin/ (the Amplify storage bucket)')
+    parser.add_argument('--manifest',
+                       help='Video keys relative to video-origin/: JSON list or one key per line (default: list the bucket)')
+    parser.add_argument('--state-machine-arn',
+                       help='State machine ARN (default: STEPFUNCTION_ARN from .env.stepfunction)')
+    parser.add_argument('--region',
+                       help='AWS region (default: STEPFUNCTION_REGION from .env.stepfunction or us-west-2)')
+    parser.add_argument('--profile',
+                       help='AWS profile name')
+    parser.add_argument('--concurrency', type=int, default=20,
+                       help='Maximum executions running at once')
+    parser.add_argument('--transcribe-limit', type=int, default=100,
+                       help="Account's concurrent Transcribe job quota; new executions wait while it is used up (0 disables the check)")
+    parser.add_argument('--max-attempts', type=int, default=2,
+                       help='Executions per video before it is left as failed')
+    parser.add_argument('--poll-interval', type=float, default=15.0,
+                       help='Seconds between status checks of running executions')
+    parser.add_argument('--languages', default='english',
+                       help='Comma-separated subtitle/summary languages, e.g. english,korean')
+    parser.add_argument('--skip-cache', action='store_true',
+                       help='Transcribe and summarize again even if the same video was already processed')
+    parser.add_argument('--ledger', default=os.path.join(SCRIPT_DIR, '.batch-ledger.json'),
+                       help='Results ledger used to skip videos that already succeeded')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Only show which videos would be started')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Log level (default: LOG_LEVEL or INFO)')
+
+    args = parser.parse_args()
+
+    env = load_env()
+    state_machine_arn = args.state_machine_arn or env.get('STEPFUNCTION_ARN')
+    region = args.region or env.get('STEPFUNCTION_REGION', 'us-west-2')
+    if not state_machine_arn:
+        print("❌ State machine ARN is required (deploy the state machine first or pass --state-machine-arn)")
+        sys.exit(1)
+
+    try:
+        session = boto3.Session(profile_name=args.profile) if args.profile else boto3.Session()
+        config = Config(retries={'max_attempts': 2, 'mode': 'standard'})
+        sfn_client = session.client('stepfunctions', region_name=region, config=config)
+        transcribe_client = session.client('transcribe', region_name=region, config=config)
+        s3_client = session.client('s3', region_name=region, config=config)
+    except NoCredentialsError:
+        print("❌ AWS credentials not found. Please configure your credentials.")
+        sys.exit(1)
+
+    keys = load_manifest(args.manifest) if args.manifest else list_videos(s3_client, args.bucket)
+    submitter = BatchSubmitter(
+        sfn_client, transcribe_client, state_machine_arn, args.bucket, ExecutionLedger(args.ledger),
+        concurrency=args.concurrency, transcribe_limit=args.transcribe_limit, max_attempts=args.max_attempts,
+        poll_interval=args.poll_interval, languages=args.languages.split(','),
+        skip_cache=args.skip_cache, log=get_logger('submit-batch', level=args.log_level)
+    )
+
+    if args.dry_run:
+        queue, running, done, exhausted = submitter.plan(keys)
+        print(f"🔍 {len(queue)} to start, {len(running)} to resume, {len(done)} succeeded, {len(exhausted)} out of attempts")
+        for key in queue:
+            print(f"   {key}")
+        return
+
+    try:
+        counts = submitter.run(keys)
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrupted; running executions continue. Rerun the same command to resume tracking them")
+        sys.exit(1)
+
+    print(f"\n🎉 Batch finished: " + ', '.join(f"{status}={count}" for status, count in sorted(counts.items())))
+    print(f"   Throttled starts retried: {submitter.throttled_starts}")
+    print(f"   Ledger: {args.ledger}")
+    if counts.get('FAILED') or counts.get('TIMED_OUT') or counts.get('ABORTED'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -209,12 +209,19 @@ export function CreateClassWizard({
             // Parse output from Step Function
             const output = data.output ? JSON.parse(data.output) : {};
             const baseFileName = uploadedFileName.replace(/\.[^/.]+$/, '');
-            
+
+            // Long transcripts are not part of the execution output; they are read from S3
+            let transcript = output.transcript;
+            if (!transcript && output.transcriptUrl) {
+              const response = await fetch(toCloudFrontUrl(output.transcriptUrl));
+              transcript = response.ok ? await response.text() : '';
+            }
+
             setFormData({
               ...formData,
               name: output.title || 'AI-generated title',
               description: output.description || 'AI-generated description',
-              transcript: output.transcript || 'AI-generated transcript',
+              transcript: transcript || 'AI-generated transcript',
               subtitleUrl: output.subtitle || ''
             });
             setProcessingStatus('completed');